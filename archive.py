@@ -0,0 +1,54 @@
+"""
+Перенос старого распорядка в архив и сжатие файла базы.
+
+Строки scheduled_tasks старше горизонта переносятся в archived_scheduled_tasks
+пакетами транзакций (Database.archive_scheduled_tasks), затем освободившиеся
+страницы возвращаются файлу (база, созданная до включения
+auto_vacuum = INCREMENTAL, - однократным полным VACUUM). С параметром
+--shard архив прошлых лет затем переносится в отдельные файлы по годам
+(planner.2024.db и т.д., Database.shard_scheduled_tasks). Выборки за прошлые
+периоды читают архив и файлы лет автоматически.
+
+Пример:
+    python archive.py --days 90
+    python archive.py --before 2025-01-01 --db planner.db
+    python archive.py --shard
+"""
+import argparse
+import os
+from datetime import datetime, time, timedelta
+from database import Database
+
+def main():
+    parser = argparse.ArgumentParser(description="Архивация старого распорядка")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--days', type=int, default=Database.ARCHIVE_HORIZON_DAYS,
+                        help=f"Архивировать распорядок старше N дней (по умолчанию {Database.ARCHIVE_HORIZON_DAYS})")
+    parser.add_argument('--before', type=datetime.fromisoformat,
+                        help="Архивировать распорядок до даты (ГГГГ-ММ-ДД), вместо --days")
+    parser.add_argument('--batch-size', type=int, default=10000, help="Строк в одной транзакции")
+    parser.add_argument('--shard', action='store_true',
+                        help="Перенести архив прошлых лет в отдельные файлы по годам")
+    args = parser.parse_args()
+    
+    before = args.before or datetime.combine(datetime.now().date(), time()) - timedelta(days=args.days)
+    size = os.path.getsize(args.db)
+    db = Database(args.db)
+    report = lambda count: print(f"\r{count} строк перенесено", end='', flush=True)
+    moved = db.archive_scheduled_tasks(before, args.batch_size, report)
+    print()
+    if args.shard:
+        report = lambda count: print(f"\r{count} строк перенесено в файлы по годам", end='', flush=True)
+        sharded = db.shard_scheduled_tasks(progress=report)
+        print()
+        sharded_before = db.get_sharded_before()
+        print(f"Файлы по годам до {sharded_before.date().isoformat() if sharded_before else '-'}, "
+              f"строк: {sharded}")
+    # База, созданная до перехода на auto_vacuum = INCREMENTAL, сжимается
+    # однократным полным VACUUM; здесь он не задерживает интерфейс
+    db.compact(vacuum=True)
+    print(f"Граница архива: {before.date().isoformat()}, строк: {moved}, "
+          f"размер файла: {size // 1024} КБ -> {os.path.getsize(args.db) // 1024} КБ")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
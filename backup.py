@@ -0,0 +1,163 @@
+"""
+Резервное копирование базы данных без остановки приложения.
+
+Копия снимается API резервного копирования SQLite (sqlite3.Connection.backup)
+порциями по PAGES_PER_STEP страниц через собственное подключение, поэтому
+копирование можно вести в фоновом потоке. На время копирования подключение
+держит транзакцию чтения: в режиме WAL приложение продолжает записывать,
+а копия снимается с одного состояния базы и не начинается заново после
+каждой записи. Копия собирается во временном
+каталоге и переименовывается после завершения, так что в каталоге копий
+не бывает недописанных файлов. Вместе с основным файлом копируются файлы
+распорядка прошлых лет (Database.shard_scheduled_tasks). Хранятся последние
+KEEP_BACKUPS копий.
+
+Пример:
+    python backup.py
+    python backup.py --db planner.db --dir backups --keep 10
+"""
+import argparse
+import os
+import re
+import shutil
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+from typing import Callable, List, Optional
+
+# Страниц за один шаг копирования (1 МБ при странице 4 КБ)
+PAGES_PER_STEP = 256
+# Пауза между шагами, с: дает приложению записывать во время копирования
+STEP_PAUSE = 0.005
+# Сколько последних копий хранить
+KEEP_BACKUPS = 7
+# Имя каталога копии - время ее создания
+BACKUP_NAME_FORMAT = '%Y%m%d-%H%M%S'
+BACKUP_NAME_PATTERN = re.compile(r'^\d{8}-\d{6}$')
+
+class BackupCancelled(Exception):
+    """Копирование прервано (например, при закрытии приложения)."""
+
+def backup_directory(db_path: str) -> str:
+    """Каталог копий по умолчанию: backups рядом с файлом базы."""
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), 'backups')
+
+def shard_files(db_path: str) -> List[str]:
+    """Файлы распорядка прошлых лет базы (planner.2024.db и т.д.)."""
+    directory = os.path.dirname(os.path.abspath(db_path))
+    base, extension = os.path.splitext(os.path.basename(db_path))
+    pattern = re.compile(rf'^{re.escape(base)}\.\d{{4}}{re.escape(extension or ".db")}$')
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if pattern.match(name))
+
+def copy_database(source: str, target: str, pages: int = PAGES_PER_STEP, pause: float = STEP_PAUSE,
+                  progress: Optional[Callable[[int, int], None]] = None):
+    """
+    Согласованная копия одного файла базы, снимаемая порциями страниц.
+
+    Args:
+        source: Файл базы
+        target: Файл копии (перезаписывается только после завершения)
+        pages: Страниц за один шаг
+        pause: Пауза между шагами, с
+        progress: Функция, получающая количество скопированных и всего страниц;
+            исключение в ней прерывает копирование
+    """
+    partial = target + '.part'
+    try:
+        with closing(sqlite3.connect(source, isolation_level=None)) as src, \
+                closing(sqlite3.connect(partial)) as dst:
+            def step(status, remaining, total):
+                if progress:
+                    progress(total - remaining, total)
+                if pause and remaining:
+                    time.sleep(pause)
+            
+            # Транзакция чтения фиксирует состояние базы на все время копирования
+            src.execute('BEGIN')
+            src.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+            src.backup(dst, pages=pages, progress=step)
+            src.execute('COMMIT')
+        os.replace(partial, target)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+
+def list_backups(directory: str) -> List[str]:
+    """Каталоги завершенных копий от старых к новым."""
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if BACKUP_NAME_PATTERN.match(name) and os.path.isdir(os.path.join(directory, name))]
+
+def last_backup_time(directory: str) -> Optional[datetime]:
+    """Время создания последней копии или None, если копий нет."""
+    backups = list_backups(directory)
+    if not backups:
+        return None
+    return datetime.strptime(os.path.basename(backups[-1]), BACKUP_NAME_FORMAT)
+
+def rotate_backups(directory: str, keep: int = KEEP_BACKUPS) -> List[str]:
+    """
+    Удаление старых копий сверх keep.
+
+    Returns:
+        Удаленные каталоги
+    """
+    backups = list_backups(directory)
+    removed = backups[:max(0, len(backups) - keep)]
+    for path in removed:
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+def make_backup(db_path: str, directory: str = None, keep: int = KEEP_BACKUPS,
+                progress: Optional[Callable[[int], None]] = None) -> str:
+    """
+    Резервная копия базы и файлов прошлых лет в новом каталоге копий
+    с удалением старых копий сверх keep.
+
+    Args:
+        db_path: Файл базы
+        directory: Каталог копий, по умолчанию backups рядом с базой
+        keep: Сколько последних копий хранить
+        progress: Функция, получающая процент выполнения; исключение в ней
+            (например, BackupCancelled) прерывает копирование
+
+    Returns:
+        Каталог созданной копии
+    """
+    directory = directory or backup_directory(db_path)
+    target = os.path.join(directory, datetime.now().strftime(BACKUP_NAME_FORMAT))
+    partial = target + '.part'
+    files = [db_path] + shard_files(db_path)
+    os.makedirs(partial, exist_ok=True)
+    try:
+        for number, path in enumerate(files):
+            report = None
+            if progress:
+                report = lambda done, total, number=number: progress(
+                    int(100 * (number + done / max(total, 1)) / len(files)))
+            copy_database(path, os.path.join(partial, os.path.basename(path)), progress=report)
+        os.replace(partial, target)
+    except BaseException:
+        shutil.rmtree(partial, ignore_errors=True)
+        raise
+    rotate_backups(directory, keep)
+    return target
+
+def main():
+    parser = argparse.ArgumentParser(description="Резервная копия базы данных")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--dir', help="Каталог копий, по умолчанию backups рядом с базой")
+    parser.add_argument('--keep', type=int, default=KEEP_BACKUPS,
+                        help=f"Сколько последних копий хранить (по умолчанию {KEEP_BACKUPS})")
+    args = parser.parse_args()
+
+    report = lambda percent: print(f"\r{percent}%", end='', flush=True)
+    target = make_backup(args.db, args.dir, args.keep, report)
+    print()
+    print(f"Копия сохранена: {target}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
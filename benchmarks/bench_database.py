@@ -0,0 +1,379 @@
+"""
+Замеры производительности публичных методов Database.
+
+Для каждого масштаба генерируется синтетическая база (tools/generate_db.py),
+после чего каждый метод вызывается несколько раз. В JSON-отчет записываются
+p50/p95 времени выполнения и среднее количество SQL-запросов на вызов.
+Данные генерируются с фиксированным seed, поэтому отчеты разных коммитов
+можно сравнивать параметром --compare.
+
+Пример:
+    python -m benchmarks.bench_database --scales small,medium -o bench.json
+    python -m benchmarks.bench_database --compare bench.json
+"""
+import argparse
+import inspect
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time as timer
+from collections import deque
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import Database
+from models import SingleTask, DailyTask, ScheduledTask
+from tools.generate_db import generate_database
+
+SCALES = {
+    'small': {'single': 1000, 'daily': 100, 'scheduled': 10000},
+    'medium': {'single': 10000, 'daily': 1000, 'scheduled': 100000},
+    'large': {'single': 100000, 'daily': 5000, 'scheduled': 1000000},
+}
+
+class _CountingCursor:
+    """Курсор, сообщающий QueryCounter о каждом выполненном операторе."""
+    
+    def __init__(self, cursor: sqlite3.Cursor, counter: 'QueryCounter'):
+        self._cursor = cursor
+        self._counter = counter
+    
+    def execute(self, sql: str, parameters=()):
+        self._counter.count += 1
+        self._cursor.execute(sql, parameters)
+        return self
+    
+    def executemany(self, sql: str, seq_of_parameters):
+        def counted():
+            for parameters in seq_of_parameters:
+                self._counter.count += 1
+                yield parameters
+        self._cursor.executemany(sql, counted())
+        return self
+    
+    def executescript(self, script: str):
+        self._counter.count += count_statements(script)
+        self._cursor.executescript(script)
+        return self
+    
+    def __iter__(self):
+        return iter(self._cursor)
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+class _CountingConnection:
+    """Подключение, курсоры которого считают выполненные операторы."""
+    
+    def __init__(self, conn: sqlite3.Connection, counter: 'QueryCounter'):
+        self._conn = conn
+        self._counter = counter
+    
+    def cursor(self) -> _CountingCursor:
+        return _CountingCursor(self._conn.cursor(), self._counter)
+    
+    def execute(self, sql: str, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql: str, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+    
+    def executescript(self, script: str):
+        return self.cursor().executescript(script)
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+def count_statements(script: str) -> int:
+    """Количество операторов в скрипте SQL (как их выполнит executescript)."""
+    count = 0
+    current = ''
+    for part in script.split(';'):
+        current += part + ';'
+        if sqlite3.complete_statement(current):
+            if current.strip(' \t\r\n;'):
+                count += 1
+            current = ''
+    return count
+
+class QueryCounter:
+    """
+    Подсчет SQL-запросов, выполненных подключением Database.
+    Подключение базы и ее курсор заменяются обертками, которые считают
+    вызовы execute, executemany (по строкам) и executescript (по операторам).
+    Считаются и курсоры, которые методы создают сами (iter_*), а операторы
+    триггеров и внутренние запросы SQLite и FTS5 не видны и не учитываются,
+    поэтому повтор одного и того же оператора подряд считается каждый раз.
+    """
+    
+    def __init__(self, db: Database):
+        self.count = 0
+        db.conn = _CountingConnection(db.conn, self)
+        db.cursor = _CountingCursor(db.cursor, self)
+
+class BenchContext:
+    """Идентификаторы существующих записей, из которых берутся аргументы вызовов."""
+    
+    def __init__(self, db: Database, seed: int):
+        self.rng = random.Random(seed)
+        db.cursor.execute("SELECT id FROM tasks WHERE task_type = 'single' ORDER BY id")
+        self.single_ids = [row[0] for row in db.cursor.fetchall()]
+        db.cursor.execute("SELECT id FROM tasks WHERE task_type = 'daily' ORDER BY id")
+        self.daily_ids = [row[0] for row in db.cursor.fetchall()]
+        db.cursor.execute('SELECT id FROM scheduled_tasks ORDER BY id')
+        self.scheduled_ids = [row[0] for row in db.cursor.fetchall()]
+        self.today = datetime.combine(datetime.now().date(), time())
+        self.horizon_days = Database.DAILY_HORIZON_DAYS
+    
+    def task_id(self) -> int:
+        """Случайная задача (единоразовая или ежедневная)."""
+        pools = [pool for pool in (self.single_ids, self.daily_ids) if pool]
+        return self.rng.choice(self.rng.choice(pools))
+    
+    def daily_id(self) -> int:
+        """Случайная ежедневная задача."""
+        return self.rng.choice(self.daily_ids)
+    
+    def scheduled_id(self) -> int:
+        """Случайная запись распорядка."""
+        return self.rng.choice(self.scheduled_ids)
+    
+    def pop_task_id(self) -> int:
+        """Задача, которая больше не будет использоваться (для удаления)."""
+        pools = [pool for pool in (self.single_ids, self.daily_ids) if len(pool) > 1]
+        pool = self.rng.choice(pools)
+        return pool.pop(self.rng.randrange(len(pool)))
+    
+    def date(self) -> datetime:
+        """Случайная дата в пределах месяца от сегодняшнего дня."""
+        return self.today + timedelta(days=self.rng.randint(-30, 30))
+    
+    def next_horizon(self) -> int:
+        """Горизонт распорядка на день дальше предыдущего: каждый вызов продлевает все задачи."""
+        self.horizon_days += 1
+        return self.horizon_days
+    
+    def start_time(self) -> time:
+        """Случайное время начала с шагом 15 минут."""
+        return time(self.rng.randint(6, 22), self.rng.choice((0, 15, 30, 45)))
+
+# Аргументы вызова для каждого публичного метода Database.
+# Функция получает базу и контекст и возвращает кортеж аргументов; подготовка
+# аргументов (в том числе чтение из БД) в замер не входит.
+CASES: Dict[str, Callable[[Database, BenchContext], tuple]] = {
+    'add_single_task': lambda db, ctx: (
+        SingleTask(title="bench single", duration_minutes=30, description="bench",
+                   scheduled_time=ctx.start_time(), execution_date=ctx.date()),),
+    'add_daily_task': lambda db, ctx: (
+        DailyTask(title="bench daily", duration_minutes=30, weekdays=[0, 2, 4],
+                  scheduled_time=ctx.start_time()),),
+    'add_scheduled_task': lambda db, ctx: (
+        ScheduledTask(task_id=ctx.daily_id(), date=ctx.date(), start_time=ctx.start_time(),
+                      title="bench", duration_minutes=30),),
+    'schedule_daily_task': lambda db, ctx: (ctx.daily_id(), ctx.start_time()),
+    'materialize_daily_tasks': lambda db, ctx: (ctx.next_horizon(),),
+    'get_all_tasks': lambda db, ctx: (),
+    'get_unscheduled_tasks': lambda db, ctx: (),
+    'iter_tasks': lambda db, ctx: (),
+    'iter_scheduled_tasks': lambda db, ctx: (ctx.date(), ctx.date() + timedelta(days=7)),
+    'get_data_version': lambda db, ctx: (),
+    'get_archived_before': lambda db, ctx: (),
+    'get_sharded_before': lambda db, ctx: (),
+    'shard_path': lambda db, ctx: (ctx.date().year,),
+    'get_daily_schedules': lambda db, ctx: (ctx.date(), ctx.date() + timedelta(days=30)),
+    'get_agenda_days': lambda db, ctx: (ctx.date(), ctx.date() + timedelta(days=14)),
+    'get_scheduled_date_range': lambda db, ctx: (),
+    'get_daily_summary': lambda db, ctx: (ctx.date() - timedelta(days=365), ctx.date()),
+    'get_task': lambda db, ctx: (ctx.task_id(),),
+    'get_daily_tasks_for_date': lambda db, ctx: (ctx.date(),),
+    'search_tasks': lambda db, ctx: (ctx.rng.choice(("план", "отч", "встреча звонок", "й")),),
+    'get_scheduled_tasks_for_date': lambda db, ctx: (ctx.date(),),
+    'mark_task_completed': lambda db, ctx: (ctx.task_id(), ctx.rng.random() < 0.5),
+    'mark_scheduled_task_completed': lambda db, ctx: (ctx.scheduled_id(), ctx.rng.random() < 0.5),
+    'remove_scheduled_task': lambda db, ctx: (ctx.scheduled_ids.pop(),),
+    'remove_task': lambda db, ctx: (ctx.pop_task_id(),),
+    'is_task_scheduled': lambda db, ctx: (ctx.task_id(),),
+    'remove_all_scheduled_instances': lambda db, ctx: (ctx.pop_task_id(),),
+    'update_scheduled_task_time': lambda db, ctx: (ctx.daily_id(), ctx.start_time()),
+    'move_scheduled_task': lambda db, ctx: (ctx.task_id(), ctx.date(), ctx.date() + timedelta(days=1),
+                                            ctx.start_time()),
+    'is_daily_task': lambda db, ctx: (ctx.task_id(),),
+    'update_task': lambda db, ctx: (
+        replace(db.get_task(ctx.daily_id()), title="bench updated", scheduled_time=ctx.start_time()),),
+}
+
+# Методы, изменяющие данные, выполняются после читающих, чтобы не влиять на их замеры
+MUTATING = {
+    'add_single_task', 'add_daily_task', 'add_scheduled_task', 'mark_task_completed',
+    'mark_scheduled_task_completed', 'remove_scheduled_task', 'remove_task',
+    'remove_all_scheduled_instances', 'update_scheduled_task_time', 'update_task',
+    'schedule_daily_task', 'materialize_daily_tasks', 'move_scheduled_task',
+}
+
+# Служебные методы без собственной нагрузки и обслуживание базы (архивация,
+# перенос по годам, сжатие), для которых нет сценария замера
+UTILITY_METHODS = {'batch', 'archive_scheduled_tasks', 'shard_scheduled_tasks', 'compact', 'close'}
+
+def public_methods() -> List[str]:
+    """Публичные методы Database."""
+    return [name for name, _ in inspect.getmembers(Database, inspect.isfunction)
+            if not name.startswith('_')]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Перцентиль по методу ближайшего ранга."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def consume(result):
+    """Полный обход результата-генератора, чтобы замер включал чтение всех строк."""
+    if isinstance(result, Iterator):
+        deque(result, maxlen=0)
+
+def bench_method(db: Database, ctx: BenchContext, counter: QueryCounter, name: str,
+                 repeat: int, budget: float) -> dict:
+    """
+    Замер одного метода.
+    
+    Args:
+        db: База данных
+        ctx: Контекст с идентификаторами записей
+        counter: Счетчик запросов
+        name: Имя метода
+        repeat: Максимальное количество вызовов
+        budget: Лимит времени на метод в секундах (не менее 5 вызовов)
+    
+    Returns:
+        Статистика вызовов
+    """
+    method = getattr(db, name)
+    durations = []
+    queries = 0
+    started = timer.perf_counter()
+    
+    if name not in MUTATING:
+        consume(method(*CASES[name](db, ctx)))  # прогрев кэша страниц
+    
+    for run in range(repeat):
+        args = CASES[name](db, ctx)
+        counter.count = 0
+        begin = timer.perf_counter()
+        consume(method(*args))
+        durations.append((timer.perf_counter() - begin) * 1000)
+        queries += counter.count
+        if run >= 4 and timer.perf_counter() - started > budget:
+            break
+    
+    return {
+        'runs': len(durations),
+        'p50_ms': round(percentile(durations, 0.50), 3),
+        'p95_ms': round(percentile(durations, 0.95), 3),
+        'mean_ms': round(sum(durations) / len(durations), 3),
+        'queries': round(queries / len(durations), 2),
+    }
+
+def run_scale(name: str, params: dict, workdir: str, seed: int, repeat: int,
+              budget: float, only: Optional[List[str]]) -> dict:
+    """Генерация базы заданного масштаба и замер всех методов."""
+    path = os.path.join(workdir, f"bench_{name}.db")
+    started = timer.perf_counter()
+    counts = generate_database(path, params['single'], params['daily'], params['scheduled'], seed)
+    print(f"[{name}] база создана за {timer.perf_counter() - started:.1f} с: {counts}")
+    
+    db = Database(path)
+    ctx = BenchContext(db, seed)
+    counter = QueryCounter(db)
+    
+    names = [method for method in CASES if method not in MUTATING]
+    names += [method for method in CASES if method in MUTATING]
+    if only:
+        names = [method for method in names if method in only]
+    
+    methods = {}
+    for method in names:
+        methods[method] = bench_method(db, ctx, counter, method, repeat, budget)
+        stats = methods[method]
+        print(f"[{name}] {method:<32} p50 {stats['p50_ms']:>10.3f} мс  "
+              f"p95 {stats['p95_ms']:>10.3f} мс  запросов {stats['queries']:>8}")
+    
+    db.conn.close()
+    os.remove(path)
+    return {'params': params, 'counts': counts, 'methods': methods}
+
+def git_commit() -> Optional[str]:
+    """Текущий коммит репозитория (если доступен git)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current: dict, baseline_path: str):
+    """Вывод изменения p50 относительно предыдущего отчета."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    print(f"\nСравнение с {baseline_path} (коммит {baseline['meta'].get('commit')}):")
+    for scale, result in current['scales'].items():
+        old_methods = baseline['scales'].get(scale, {}).get('methods', {})
+        for method, stats in result['methods'].items():
+            old = old_methods.get(method)
+            if not old or not old['p50_ms']:
+                continue
+            ratio = stats['p50_ms'] / old['p50_ms']
+            print(f"[{scale}] {method:<32} {old['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} мс "
+                  f"(x{ratio:.2f}), запросов {old['queries']} -> {stats['queries']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры производительности Database")
+    parser.add_argument('--scales', default='small,medium',
+                        help=f"Масштабы через запятую: {', '.join(SCALES)}")
+    parser.add_argument('--methods', help="Замерять только перечисленные методы (через запятую)")
+    parser.add_argument('--repeat', type=int, default=20, help="Максимум вызовов на метод")
+    parser.add_argument('--budget', type=float, default=3.0, help="Лимит времени на метод, с")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора данных")
+    parser.add_argument('-o', '--output', default='bench_database.json', help="Файл отчета")
+    parser.add_argument('--compare', help="Отчет предыдущего запуска для сравнения")
+    args = parser.parse_args()
+    
+    uncovered = sorted(set(public_methods()) - set(CASES) - UTILITY_METHODS)
+    if uncovered:
+        print(f"Нет сценария замера для методов: {', '.join(uncovered)}")
+    
+    only = args.methods.split(',') if args.methods else None
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'uncovered': uncovered,
+        'scales': {},
+    }
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales.split(','):
+            report['scales'][scale] = run_scale(scale, SCALES[scale], workdir, args.seed,
+                                                args.repeat, args.budget, only)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nОтчет сохранен в {args.output}")
+    
+    if args.compare:
+        compare(report, args.compare)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,216 @@
+"""
+Нагрузочный тест локального HTTP/JSON API (server.py).
+
+Генерирует синтетическую базу (tools/generate_db.py), запускает сервер
+отдельным процессом и открывает несколько соединений keep-alive, каждое из
+которых отправляет запросы один за другим заданное время. Запросы - смесь
+чтения (распорядок дня, задача, итоги за месяц) и записи (отметка
+выполнения, добавление в распорядок) в пропорции --write-ratio. Выводятся
+запросы в секунду и p50/p95/p99 задержки по видам запросов.
+
+Пример:
+    python -m benchmarks.bench_server --scale small --connections 32 --duration 10
+    python -m benchmarks.bench_server --url 127.0.0.1:8765 --write-ratio 0
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time as timer
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.bench_database import SCALES, percentile
+from tools.generate_db import generate_database
+
+class Client:
+    """Соединение keep-alive с сервером; запросы отправляются по одному."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, payload=None) -> Tuple[int, object]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'content-length':
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+
+class Workload:
+    """Случайные запросы к существующим задачам и датам около сегодняшнего дня."""
+
+    def __init__(self, task_ids: List[int], write_ratio: float, seed: int):
+        self.task_ids = task_ids
+        self.write_ratio = write_ratio
+        self.rng = random.Random(seed)
+        self.today = date.today()
+
+    def _date(self) -> str:
+        return (self.today + timedelta(days=self.rng.randint(-30, 30))).isoformat()
+
+    def next(self) -> Tuple[str, str, str, Optional[dict]]:
+        """Следующий запрос: (вид, метод, путь, тело)."""
+        rng = self.rng
+        if rng.random() < self.write_ratio:
+            task_id = rng.choice(self.task_ids)
+            if rng.random() < 0.5:
+                return ('complete', 'POST', f'/tasks/{task_id}/complete',
+                        {'completed': rng.random() < 0.5})
+            return ('schedule_add', 'POST', '/schedule',
+                    {'task_id': task_id, 'date': self._date(),
+                     'start_time': f"{rng.randint(6, 22):02d}:{rng.choice((0, 15, 30, 45)):02d}"})
+        kind = rng.choices(('schedule_day', 'task', 'summary'), weights=(6, 3, 1))[0]
+        if kind == 'schedule_day':
+            return kind, 'GET', f'/schedule?date={self._date()}', None
+        if kind == 'task':
+            return kind, 'GET', f'/tasks/{rng.choice(self.task_ids)}', None
+        start = self.today - timedelta(days=rng.randint(0, 60))
+        return kind, 'GET', f'/summary?start={start.isoformat()}&end={(start + timedelta(days=29)).isoformat()}', None
+
+async def run_connection(host: str, port: int, workload: Workload, deadline: float,
+                         latencies: Dict[str, List[float]], errors: Dict[str, int]):
+    client = Client(host, port)
+    try:
+        while timer.perf_counter() < deadline:
+            kind, method, path, payload = workload.next()
+            started = timer.perf_counter()
+            status, _ = await client.request(method, path, payload)
+            latencies.setdefault(kind, []).append((timer.perf_counter() - started) * 1000)
+            if status != 200:
+                errors[kind] = errors.get(kind, 0) + 1
+    finally:
+        client.close()
+
+async def run_load(host: str, port: int, task_ids: List[int], connections: int, duration: float,
+                   write_ratio: float, seed: int) -> dict:
+    """Нагрузка из connections соединений в течение duration секунд."""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    started = timer.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        run_connection(host, port, Workload(task_ids, write_ratio, seed + number), deadline,
+                       latencies, errors)
+        for number in range(connections)
+    ))
+    elapsed = timer.perf_counter() - started
+    total = sum(len(values) for values in latencies.values())
+    return {
+        'connections': connections,
+        'duration_s': round(elapsed, 2),
+        'requests': total,
+        'requests_per_second': round(total / elapsed, 1),
+        'errors': errors,
+        'kinds': {
+            kind: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 0.5), 3),
+                'p95_ms': round(percentile(values, 0.95), 3),
+                'p99_ms': round(percentile(values, 0.99), 3),
+            }
+            for kind, values in sorted(latencies.items())
+        },
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for_server(host: str, port: int, timeout: float = 30.0):
+    deadline = timer.perf_counter() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            if timer.perf_counter() > deadline:
+                raise
+            timer.sleep(0.05)
+
+async def fetch_task_ids(host: str, port: int) -> List[int]:
+    client = Client(host, port)
+    try:
+        _, tasks = await client.request('GET', '/tasks')
+    finally:
+        client.close()
+    return [task['id'] for task in tasks]
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест HTTP/JSON API")
+    parser.add_argument('--scale', default='small', help=f"Масштаб базы: {', '.join(SCALES)}")
+    parser.add_argument('--url', help="Адрес уже запущенного сервера host:port (база не создается)")
+    parser.add_argument('--connections', type=int, default=32, help="Одновременных соединений")
+    parser.add_argument('--duration', type=float, default=10.0, help="Длительность нагрузки, с")
+    parser.add_argument('--write-ratio', type=float, default=0.1, help="Доля запросов на запись")
+    parser.add_argument('--workers', type=int, help="Потоков чтения сервера")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора данных и запросов")
+    parser.add_argument('-o', '--output', help="Файл JSON-отчета")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        process = None
+        if args.url:
+            host, _, port = args.url.rpartition(':')
+            port = int(port)
+        else:
+            params = SCALES[args.scale]
+            path = os.path.join(workdir, f"bench_{args.scale}.db")
+            counts = generate_database(path, params['single'], params['daily'], params['scheduled'], args.seed)
+            print(f"[{args.scale}] база создана: {counts}")
+            host, port = '127.0.0.1', free_port()
+            command = [sys.executable, os.path.join(ROOT, 'server.py'), '--db', path, '--port', str(port)]
+            if args.workers:
+                command += ['--workers', str(args.workers)]
+            process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+        try:
+            wait_for_server(host, port)
+            task_ids = asyncio.run(fetch_task_ids(host, port))
+            report = asyncio.run(run_load(host, port, task_ids, args.connections, args.duration,
+                                          args.write_ratio, args.seed))
+        finally:
+            if process:
+                process.terminate()
+                process.wait()
+
+    print(f"Запросов: {report['requests']} за {report['duration_s']} с, "
+          f"{report['requests_per_second']} запросов/с ({report['connections']} соединений)")
+    for kind, stats in report['kinds'].items():
+        print(f"  {kind:<14} {stats['count']:>8}  p50 {stats['p50_ms']:>8.2f} мс  "
+              f"p95 {stats['p95_ms']:>8.2f} мс  p99 {stats['p99_ms']:>8.2f} мс")
+    if report['errors']:
+        print(f"Ошибки: {report['errors']}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nОтчет сохранен в {args.output}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
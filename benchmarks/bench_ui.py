@@ -0,0 +1,242 @@
+"""
+Замеры отрисовки интерфейса без экрана (платформа Qt offscreen).
+
+На синтетической базе (tools/generate_db.py) замеряются построение MainWindow,
+перестроение списков задач, кадры отрисовки и масштабирование временной
+шкалы, движения мыши над задачами и переключение вкладок. Для каждой операции
+в JSON-отчет записываются p50/p95 задержки, количество SQL-запросов и
+количество виджетов в окне после операции.
+
+Пример:
+    python -m benchmarks.bench_ui --scales small -o bench_ui.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time as timer
+from datetime import datetime
+from typing import Callable, List
+
+os.environ['QT_QPA_PLATFORM'] = 'offscreen'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt6.QtWidgets import QApplication, QWidget
+from PyQt6.QtCore import Qt, QEvent, QPointF, QDate
+from PyQt6.QtGui import QMouseEvent
+
+from database import Database
+from tools.generate_db import generate_database
+from benchmarks.bench_database import SCALES, QueryCounter, percentile, git_commit
+from ui.main_window import MainWindow
+
+def process_events(app: QApplication):
+    """Обработка отложенных событий, включая удаление виджетов и отрисовку."""
+    app.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+
+class UiBench:
+    """Накопление замеров операций интерфейса для одного масштаба."""
+    
+    def __init__(self, app: QApplication, counter: QueryCounter, scale: str):
+        self.app = app
+        self.counter = counter
+        self.scale = scale
+        self.operations = {}
+    
+    def measure(self, name: str, operation: Callable[[int], None], repeat: int,
+                window: Callable[[], QWidget]):
+        """
+        Замер операции интерфейса.
+        
+        Args:
+            name: Название операции в отчете
+            operation: Операция; получает номер повтора
+            repeat: Количество повторов
+            window: Функция, возвращающая окно, в котором считаются виджеты
+        """
+        durations = []
+        queries = 0
+        for run in range(repeat):
+            self.counter.count = 0
+            begin = timer.perf_counter()
+            operation(run)
+            process_events(self.app)
+            durations.append((timer.perf_counter() - begin) * 1000)
+            queries += self.counter.count
+        
+        stats = {
+            'runs': repeat,
+            'p50_ms': round(percentile(durations, 0.50), 3),
+            'p95_ms': round(percentile(durations, 0.95), 3),
+            'mean_ms': round(sum(durations) / len(durations), 3),
+            'queries': round(queries / repeat, 2),
+            'widgets': len(window().findChildren(QWidget)),
+        }
+        self.operations[name] = stats
+        print(f"[{self.scale}] {name:<30} p50 {stats['p50_ms']:>10.3f} мс  "
+              f"p95 {stats['p95_ms']:>10.3f} мс  запросов {stats['queries']:>8}  "
+              f"виджетов {stats['widgets']:>6}")
+
+def busiest_date(db: Database) -> datetime:
+    """Дата с наибольшим количеством задач в распорядке."""
+    db.cursor.execute('''
+        SELECT date FROM scheduled_tasks
+        GROUP BY date ORDER BY COUNT(*) DESC LIMIT 1
+    ''')
+    row = db.cursor.fetchone()
+    return datetime.fromisoformat(row[0]) if row else datetime.now()
+
+def run_scale(app: QApplication, name: str, params: dict, workdir: str,
+              seed: int, repeat: int) -> dict:
+    """Генерация базы заданного масштаба и замер операций интерфейса."""
+    path = os.path.join(workdir, f"bench_ui_{name}.db")
+    counts = generate_database(path, params['single'], params['daily'], params['scheduled'], seed)
+    print(f"[{name}] база: {counts}")
+    
+    db = Database(path)
+    bench = UiBench(app, QueryCounter(db), name)
+    
+    # Построение главного окна вместе с первой отрисовкой
+    windows: List[MainWindow] = []
+    
+    def build_window(run):
+        window = MainWindow(db)
+        window.show()
+        windows.append(window)
+    
+    bench.measure('main_window_construction', build_window, max(3, repeat // 5),
+                  lambda: windows[-1])
+    window = windows.pop()
+    for extra in windows:
+        extra.close()
+        extra.deleteLater()
+    process_events(app)
+    
+    calendar_tab = window.calendar_tab
+    tasks_tab = window.get_tasks_tab()
+    timeline = calendar_tab.timeline
+    
+    # Выбираем самый загруженный день, чтобы замерять худший случай отрисовки
+    day = busiest_date(db)
+    calendar_tab.calendar.setSelectedDate(QDate(day.year, day.month, day.day))
+    process_events(app)
+    print(f"[{name}] день {day.date()}: задач на шкале {len(timeline.scheduled_tasks)}")
+    
+    bench.measure('tasks_tab_update_task_list',
+                  lambda run: tasks_tab.update_task_list(), repeat, lambda: window)
+    
+    # Поиск в открытой вкладке задач: запрос и фильтрация уже построенных строк
+    window.tabs.setCurrentWidget(window.tasks_page)
+    process_events(app)
+    search_words = ("план", "отч", "встреча звонок", "й", "")
+    
+    def search_tasks_tab(run):
+        tasks_tab.search_edit.setText(search_words[run % len(search_words)])
+        tasks_tab._apply_search()
+    
+    bench.measure('tasks_tab_search', search_tasks_tab, repeat, lambda: window)
+    tasks_tab.search_edit.clear()
+    tasks_tab._apply_search()
+    window.tabs.setCurrentWidget(calendar_tab)
+    process_events(app)
+    
+    bench.measure('task_list_widget_update_tasks',
+                  lambda run: calendar_tab.update_available_tasks(), repeat, lambda: window)
+    bench.measure('timeline_repaint', lambda run: timeline.repaint(), repeat, lambda: window)
+    
+    # Движения мыши сверху вниз по шкале: поиск задачи под курсором и перерисовка
+    height = max(1, timeline.height())
+    
+    def hover(run):
+        position = QPointF(timeline.width() / 2, (run * 37) % height)
+        event = QMouseEvent(QEvent.Type.MouseMove, position, position,
+                            Qt.MouseButton.NoButton, Qt.MouseButton.NoButton,
+                            Qt.KeyboardModifier.NoModifier)
+        QApplication.sendEvent(timeline, event)
+    
+    bench.measure('timeline_hover_move', hover, repeat * 5, lambda: window)
+    
+    # Масштабирование шкалы колесом: по 10 шагов к 5-минутным делениям и
+    # обратно к суткам на экране, с отрисовкой видимой части
+    timeline_scroll = calendar_tab.timeline_scroll
+    
+    def zoom(run):
+        factor = timeline.ZOOM_STEP if (run // 10) % 2 == 0 else 1 / timeline.ZOOM_STEP
+        anchor = timeline_scroll.verticalScrollBar().value() + timeline_scroll.viewport().height() // 2
+        timeline.zoom(factor, anchor)
+        timeline_scroll.viewport().repaint()
+    
+    bench.measure('timeline_zoom', zoom, repeat * 4, lambda: window)
+    
+    # Распорядок недели с самым загруженным днем: загрузка одним запросом и отрисовка
+    week_view = calendar_tab.week_view
+    calendar_tab.set_week_mode(True)
+    process_events(app)
+    bench.measure('week_view_load', lambda run: week_view.reload(), repeat, lambda: window)
+    bench.measure('week_view_repaint', lambda run: week_view.repaint(), repeat, lambda: window)
+    calendar_tab.set_week_mode(False)
+    process_events(app)
+    
+    # Прокрутка повестки назад постранично: загрузка окон дней и отрисовка
+    agenda_tab = window.get_agenda_tab()
+    window.tabs.setCurrentWidget(window.agenda_page)
+    process_events(app)
+    agenda_scroll = agenda_tab.view.verticalScrollBar()
+    
+    def scroll_agenda(run):
+        agenda_scroll.setValue(agenda_scroll.value() - agenda_scroll.pageStep())
+        agenda_tab.view.viewport().repaint()
+    
+    bench.measure('agenda_scroll', scroll_agenda, repeat, lambda: window)
+    window.tabs.setCurrentWidget(calendar_tab)
+    process_events(app)
+    
+    def switch_tab(run):
+        window.tabs.setCurrentIndex((window.tabs.currentIndex() + 1) % window.tabs.count())
+    
+    bench.measure('tab_switch', switch_tab, repeat, lambda: window)
+    
+    window.close()
+    window.deleteLater()
+    process_events(app)
+    db.conn.close()
+    return {'params': params, 'counts': counts, 'operations': bench.operations}
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры отрисовки интерфейса (Qt offscreen)")
+    parser.add_argument('--scales', default='small',
+                        help=f"Масштабы через запятую: {', '.join(SCALES)}")
+    parser.add_argument('--repeat', type=int, default=10, help="Количество повторов операции")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора данных")
+    parser.add_argument('-o', '--output', default='bench_ui.json', help="Файл отчета")
+    args = parser.parse_args()
+    
+    app = QApplication(sys.argv[:1])
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'qt_platform': app.platformName(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'scales': {},
+    }
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales.split(','):
+            report['scales'][scale] = run_scale(app, scale, SCALES[scale], workdir,
+                                                args.seed, args.repeat)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\nОтчет сохранен в {args.output}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
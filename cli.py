@@ -0,0 +1,268 @@
+"""
+Командная строка планировщика без графического интерфейса.
+
+Команды работают с базой напрямую через Database и не загружают PyQt6,
+поэтому выполняются за десятки миллисекунд вместо запуска окна:
+    add         создание задачи
+    list        список задач
+    today       распорядок на сегодня
+    day         распорядок на дату или несколько дней
+    schedule    размещение задачи в распорядке
+    complete    отметка выполнения задачи
+    batch       команды из стандартного ввода, по одной в строке
+
+Команды batch выполняются одним подключением в одной транзакции; изменения
+строки с ошибкой откатываются, строка пропускается с сообщением, остальные
+выполняются.
+
+Пример:
+    python cli.py add "Отчет" --duration 45 --date 2026-10-20
+    python cli.py today
+    python main.py schedule 42 10:30 --date 2026-10-20
+    printf 'add "Звонок" --duration 15\\ncomplete 42\\n' | python cli.py batch
+"""
+import argparse
+import json
+import os
+import shlex
+import sys
+from datetime import datetime, time, timedelta
+from typing import List, Optional, TextIO, Union
+from database import Database
+from models import SingleTask, DailyTask, ScheduledTask, task_to_dict, scheduled_task_to_dict
+
+COMMANDS = ('add', 'list', 'today', 'day', 'schedule', 'complete', 'batch')
+
+class CommandError(Exception):
+    """Ошибка выполнения команды (сообщение выводится пользователю)."""
+
+class ArgumentParser(argparse.ArgumentParser):
+    """Разбор аргументов, сообщающий об ошибке исключением вместо выхода (для batch)."""
+
+    def error(self, message):
+        raise CommandError(message)
+
+def _date(value: str) -> datetime:
+    try:
+        return datetime.combine(datetime.strptime(value, '%Y-%m-%d').date(), time())
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"дата в формате ГГГГ-ММ-ДД, получено {value!r}")
+
+def _today() -> datetime:
+    return datetime.combine(datetime.now().date(), time())
+
+def _time(value: str) -> time:
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"время в формате ЧЧ:ММ, получено {value!r}")
+
+def _weekdays(value: str) -> List[int]:
+    """Дни недели через запятую, 0 - понедельник."""
+    days = sorted({int(day) for day in value.split(',')})
+    if not days or days[0] < 0 or days[-1] > 6:
+        raise argparse.ArgumentTypeError("дни недели - числа от 0 до 6 через запятую")
+    return days
+
+def build_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog='cli.py', description="Планировщик без графического интерфейса")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--json', action='store_true', help="Вывод в формате JSON")
+    # Общие параметры можно указать и после команды
+    common = ArgumentParser(add_help=False)
+    common.add_argument('--db', default=argparse.SUPPRESS, help="Файл базы данных")
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS, help="Вывод в формате JSON")
+    commands = parser.add_subparsers(dest='command', required=True, parser_class=ArgumentParser)
+
+    add = commands.add_parser('add', parents=[common], help="Создать задачу")
+    add.add_argument('title', help="Название")
+    add.add_argument('--duration', type=int, default=30, help="Длительность в минутах")
+    add.add_argument('--description', help="Описание")
+    add.add_argument('--date', type=_date, help="Дата выполнения единоразовой задачи (ГГГГ-ММ-ДД)")
+    add.add_argument('--time', type=_time, help="Время (ЧЧ:ММ); ежедневная задача сразу размещается в распорядке")
+    add.add_argument('--daily', type=_weekdays, metavar='ДНИ',
+                     help="Ежедневная задача по дням недели, например 0,1,2,3,4")
+    add.add_argument('--unlimited', action='store_true', help="Ежедневная задача без срока")
+
+    task_list = commands.add_parser('list', parents=[common], help="Список задач")
+    task_list.add_argument('--search', help="Полнотекстовый поиск")
+    task_list.add_argument('--unscheduled', action='store_true', help="Только задачи вне распорядка")
+
+    commands.add_parser('today', parents=[common], help="Распорядок на сегодня")
+
+    day = commands.add_parser('day', parents=[common], help="Распорядок на дату")
+    day.add_argument('date', type=_date, help="Дата (ГГГГ-ММ-ДД)")
+    day.add_argument('--days', type=int, default=1, help="Сколько дней начиная с даты")
+
+    schedule = commands.add_parser('schedule', parents=[common], help="Разместить задачу в распорядке")
+    schedule.add_argument('task_id', type=int, help="ID задачи")
+    schedule.add_argument('time', type=_time, help="Время начала (ЧЧ:ММ)")
+    schedule.add_argument('--date', type=_date,
+                          help="Дата (по умолчанию сегодня); ежедневная задача размещается с сегодняшнего дня")
+
+    complete = commands.add_parser('complete', parents=[common], help="Отметить задачу выполненной")
+    complete.add_argument('task_id', type=int, help="ID задачи")
+    complete.add_argument('--undo', action='store_true', help="Снять отметку")
+
+    commands.add_parser('batch', parents=[common], help="Выполнить команды из стандартного ввода")
+    return parser
+
+def _existing_task(db: Database, task_id: int) -> Union[SingleTask, DailyTask]:
+    task = db.get_task(task_id)
+    if task is None:
+        raise CommandError(f"Задача {task_id} не найдена")
+    return task
+
+def _format_task(task: Union[SingleTask, DailyTask]) -> str:
+    mark = 'x' if task.is_completed else ' '
+    when = ''
+    if isinstance(task, DailyTask):
+        when = 'дни ' + ','.join(str(day) for day in task.weekdays)
+    elif task.execution_date:
+        when = task.execution_date.date().isoformat()
+    if task.scheduled_time:
+        when = f"{when} {task.scheduled_time.strftime('%H:%M')}".strip()
+    return f"{task.id:>6} [{mark}] {task.title} ({task.duration_minutes} мин{', ' + when if when else ''})"
+
+def _format_scheduled(task: ScheduledTask) -> str:
+    start = datetime.combine(task.date, task.start_time)
+    end = start + timedelta(minutes=task.duration_minutes)
+    mark = 'x' if task.is_completed else ' '
+    return f"{start.strftime('%H:%M')}-{end.strftime('%H:%M')} [{mark}] {task.title} (#{task.task_id})"
+
+def _print_schedule(db: Database, start: datetime, days: int, as_json: bool, out: TextIO):
+    tasks = sorted(db.iter_scheduled_tasks(start, start + timedelta(days=days - 1)),
+                   key=lambda task: (task.date, task.start_time))
+    if as_json:
+        print(json.dumps([scheduled_task_to_dict(task) for task in tasks], ensure_ascii=False), file=out)
+        return
+    for offset in range(days):
+        date = start + timedelta(days=offset)
+        day_tasks = [task for task in tasks if task.date.date() == date.date()]
+        if days > 1:
+            print(date.strftime('%Y-%m-%d'), file=out)
+        if not day_tasks:
+            print("  нет задач" if days > 1 else "Нет задач", file=out)
+        for task in day_tasks:
+            print(("  " if days > 1 else "") + _format_scheduled(task), file=out)
+
+def run_command(db: Database, args: argparse.Namespace, out: TextIO = sys.stdout):
+    """Выполнение одной разобранной команды (кроме batch)."""
+    if args.command == 'add':
+        common = dict(title=args.title, duration_minutes=args.duration, description=args.description,
+                      scheduled_time=args.time)
+        if args.daily:
+            task = DailyTask(weekdays=args.daily, is_unlimited=args.unlimited, **common)
+            task_id = db.add_daily_task(task)
+            if task.scheduled_time:
+                db.schedule_daily_task(task_id, task.scheduled_time)
+        else:
+            task_id = db.add_single_task(SingleTask(execution_date=args.date, **common))
+        print(json.dumps({'id': task_id}) if args.json else task_id, file=out)
+
+    elif args.command == 'list':
+        if args.search:
+            tasks = db.search_tasks(args.search)
+        elif args.unscheduled:
+            tasks = db.get_unscheduled_tasks()
+        else:
+            tasks = db.get_all_tasks()
+        if args.json:
+            print(json.dumps([task_to_dict(task) for task in tasks], ensure_ascii=False), file=out)
+            return
+        for task in tasks:
+            print(_format_task(task), file=out)
+
+    elif args.command in ('today', 'day'):
+        if args.command == 'today':
+            _print_schedule(db, _today(), 1, args.json, out)
+        elif args.days < 1:
+            raise CommandError("--days должно быть больше нуля")
+        else:
+            _print_schedule(db, args.date, args.days, args.json, out)
+
+    elif args.command == 'schedule':
+        task = _existing_task(db, args.task_id)
+        if isinstance(task, DailyTask):
+            # Как в приложении: ежедневная задача размещается с сегодняшнего дня
+            if args.date:
+                raise CommandError("Ежедневная задача размещается с сегодняшнего дня, --date не нужен")
+            scheduled = db.schedule_daily_task(task.id, args.time)
+            if args.json:
+                print(json.dumps({'task_id': task.id, 'start_time': args.time.isoformat(),
+                                  'scheduled': scheduled}), file=out)
+            return
+        scheduled_task = ScheduledTask(task_id=task.id, date=args.date or _today(), start_time=args.time,
+                                       title=task.title, duration_minutes=task.duration_minutes,
+                                       description=task.description)
+        db.add_scheduled_task(scheduled_task)
+        if args.json:
+            print(json.dumps(scheduled_task_to_dict(scheduled_task), ensure_ascii=False), file=out)
+
+    elif args.command == 'complete':
+        _existing_task(db, args.task_id)
+        db.mark_task_completed(args.task_id, not args.undo)
+
+def run_batch(db: Database, parser: ArgumentParser, lines: TextIO, options: List[str],
+              out: TextIO = sys.stdout, err: TextIO = sys.stderr) -> int:
+    """
+    Выполнение команд из строк (пустые строки и строки с # пропускаются)
+    в одной транзакции. Каждая строка выполняется во вложенном пакете:
+    изменения строки с ошибкой откатываются, остальные строки сохраняются.
+
+    Args:
+        db: База данных
+        parser: Разбор команд
+        lines: Источник строк команд
+        options: Общие параметры (например, --json), добавляемые к каждой строке
+        out: Поток вывода команд
+        err: Поток сообщений об ошибках
+
+    Returns:
+        Количество строк с ошибками
+    """
+    failed = 0
+    with db.batch():
+        for number, line in enumerate(lines, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                args = parser.parse_args(options + shlex.split(line))
+                if args.command == 'batch':
+                    raise CommandError("batch нельзя вложить в batch")
+                with db.batch():
+                    run_command(db, args, out)
+            except (CommandError, ValueError) as e:
+                failed += 1
+                print(f"строка {number}: {e}", file=err)
+            except SystemExit:
+                # Разбор завершился без команды (например, -h вывел справку):
+                # выход не должен откатывать уже выполненные строки
+                failed += 1
+                print(f"строка {number}: команда не выполнена", file=err)
+    return failed
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except CommandError as e:
+        parser.print_usage(sys.stderr)
+        print(f"{parser.prog}: ошибка: {e}", file=sys.stderr)
+        return 2
+
+    db = Database(args.db)
+    try:
+        if args.command == 'batch':
+            return 1 if run_batch(db, parser, sys.stdin, ['--json'] if args.json else []) else 0
+        run_command(db, args)
+    except CommandError as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Вывод закрыт раньше времени (например, | head): дальнейший вывод отбрасывается
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
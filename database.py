@@ -1,7 +1,11 @@
+import os
 import sqlite3
-from datetime import datetime, time
-from typing import List, Optional, Union
-from models import Task, SingleTask, DailyTask, ScheduledTask, TaskType
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from models import (Task, SingleTask, DailyTask, ScheduledTask, DaySummary, DailySchedule, TaskType,
+                    EditScope, weekdays_to_mask, mask_to_weekdays)
 
 class Database:
     """
@@ -9,6 +13,60 @@ class Database:
     Обеспечивает хранение задач и их расписания.
     """
     
+    # Колонки, из которых собираются объекты задач (см. _task_from_row)
+    TASK_COLUMNS = '''
+        t.id, t.title, t.duration_minutes, t.description, t.scheduled_time,
+        t.is_completed, t.task_type, t.created_at,
+        s.execution_date, d.weekdays, d.is_unlimited
+    '''
+    
+    # Колонки, из которых собираются объекты распорядка (см. _scheduled_task_from_row)
+    SCHEDULED_COLUMNS = '''
+        st.task_id, st.date, st.start_time, st.is_completed,
+        t.title, t.duration_minutes, t.description
+    '''
+    
+    # Условие «у задачи нет экземпляров в распорядке»: рабочая таблица, архив и
+    # годовые файлы; каждая проверка идет по индексу task_id
+    UNSCHEDULED_CONDITION = '''
+        NOT EXISTS (SELECT 1 FROM scheduled_tasks WHERE task_id = t.id)
+        AND NOT EXISTS (SELECT 1 FROM archived_scheduled_tasks WHERE task_id = t.id)
+        AND NOT EXISTS (SELECT 1 FROM shard_tasks WHERE task_id = t.id)
+    '''
+    
+    # Колонки таблиц распорядка (рабочей и архивной)
+    SCHEDULED_TABLE_COLUMNS = 'id, task_id, date, start_time, is_completed'
+    
+    # Распорядок вместе с архивом; подставляется вместо scheduled_tasks в выборки,
+    # затрагивающие архивированные дни
+    SCHEDULED_WITH_ARCHIVE = f'''(
+        SELECT {SCHEDULED_TABLE_COLUMNS} FROM scheduled_tasks
+        UNION ALL
+        SELECT {SCHEDULED_TABLE_COLUMNS} FROM archived_scheduled_tasks
+    )'''
+    
+    # Через сколько дней распорядок переносится в архив (см. archive_scheduled_tasks)
+    ARCHIVE_HORIZON_DAYS = 90
+    
+    # Добавление строки к итогам дня, если итоги уже есть (см. _migrate_daily_summary)
+    SUMMARY_CONFLICT = '''
+        ON CONFLICT (date) DO UPDATE SET
+            planned_count = planned_count + excluded.planned_count,
+            completed_count = completed_count + excluded.completed_count,
+            planned_minutes = planned_minutes + excluded.planned_minutes,
+            completed_minutes = completed_minutes + excluded.completed_minutes,
+            daily_planned_count = daily_planned_count + excluded.daily_planned_count,
+            daily_completed_count = daily_completed_count + excluded.daily_completed_count
+    '''
+    
+    # Сколько файлов распорядка прошлых лет подключается (ATTACH) одновременно
+    # (см. shard_scheduled_tasks); SQLite допускает не больше 10
+    MAX_ATTACHED_SHARDS = 8
+    
+    # На сколько дней вперед ежедневные задачи размещаются в распорядке
+    # (см. materialize_daily_tasks)
+    DAILY_HORIZON_DAYS = 30
+    
     def __init__(self, db_name: str = "planner.db"):
         """
         Инициализация подключения к БД и создание необходимых таблиц.
@@ -16,9 +74,23 @@ class Database:
         Args:
             db_name: Имя файла базы данных
         """
+        self.db_name = db_name
+        self.closed = False
         self.conn = sqlite3.connect(db_name)
         self.cursor = self.conn.cursor()
+        # Подключенные файлы прошлых лет: имя схемы -> год, в порядке использования
+        self.attached_shards: OrderedDict[str, int] = OrderedDict()
+        # Изменения файлов прошлых лет, ждущие фиксации основной базы (см. _write_shard)
+        self._shard_writes: List[Tuple[str, str, tuple]] = []
+        # Освобожденные страницы возвращаются по PRAGMA incremental_vacuum (см. compact);
+        # на существующую базу настройка действует после первого VACUUM
+        self.cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        # Журнал WAL: фоновые потоки читают, не блокируя запись в главном потоке
+        self.cursor.execute('PRAGMA journal_mode = WAL')
         self._create_tables()
+        self._migrate()
+        self.has_fts = self._table_exists('tasks_fts')
+        self._batch_depth = 0
     
     def _create_tables(self):
         """Создание необходимых таблиц в базе данных."""
@@ -49,7 +121,7 @@ class Database:
         self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS daily_tasks (
                 task_id INTEGER PRIMARY KEY,
-                weekdays TEXT NOT NULL,
+                weekdays INTEGER NOT NULL,
                 is_unlimited BOOLEAN NOT NULL DEFAULT 0,
                 FOREIGN KEY (task_id) REFERENCES tasks (id)
             )
@@ -69,6 +141,564 @@ class Database:
         
         self.conn.commit()
     
+    def _migrate(self):
+        """
+        Последовательное применение миграций схемы.
+        Номер последней применённой миграции хранится в PRAGMA user_version.
+        """
+        migrations = [
+            self._migrate_weekdays_to_mask,
+            self._migrate_full_text_search,
+            self._migrate_data_version,
+            self._migrate_archive,
+            self._migrate_daily_schedule,
+            self._migrate_scheduled_task_index,
+            self._migrate_scheduled_date_index,
+            self._migrate_daily_summary,
+            self._migrate_shards,
+        ]
+        
+        self.cursor.execute('PRAGMA user_version')
+        version = self.cursor.fetchone()[0]
+        for number, migration in enumerate(migrations[version:], version + 1):
+            migration()
+            self.cursor.execute(f'PRAGMA user_version = {number}')
+            self.conn.commit()
+    
+    def _migrate_weekdays_to_mask(self):
+        """
+        Миграция 1: хранение дней недели ежедневных задач в виде битовой маски.
+        Строки вида "0,2,4" преобразуются в число, где бит i означает день недели i.
+        """
+        self.cursor.execute('PRAGMA table_info(daily_tasks)')
+        column_types = {row[1]: row[2].upper() for row in self.cursor.fetchall()}
+        
+        if column_types.get('weekdays') == 'TEXT':
+            # Старая схема: пересоздаем таблицу с целочисленной колонкой
+            self.cursor.execute('SELECT task_id, weekdays, is_unlimited FROM daily_tasks')
+            rows = [
+                (task_id,
+                 weekdays_to_mask([int(day) for day in str(weekdays).split(',') if day.strip()]),
+                 is_unlimited)
+                for task_id, weekdays, is_unlimited in self.cursor.fetchall()
+            ]
+            self.cursor.execute('DROP TABLE daily_tasks')
+            self.cursor.execute('''
+                CREATE TABLE daily_tasks (
+                    task_id INTEGER PRIMARY KEY,
+                    weekdays INTEGER NOT NULL,
+                    is_unlimited BOOLEAN NOT NULL DEFAULT 0,
+                    FOREIGN KEY (task_id) REFERENCES tasks (id)
+                )
+            ''')
+            self.cursor.executemany(
+                'INSERT INTO daily_tasks (task_id, weekdays, is_unlimited) VALUES (?, ?, ?)',
+                rows
+            )
+        
+        # Частичный индекс на каждый день недели: выборка задач на дату
+        # читает только записи нужного дня, а не всю таблицу
+        for weekday in range(7):
+            self.cursor.execute(f'''
+                CREATE INDEX IF NOT EXISTS idx_daily_tasks_weekday_{weekday}
+                ON daily_tasks (task_id) WHERE weekdays & {1 << weekday}
+            ''')
+    
+    def _migrate_full_text_search(self):
+        """
+        Миграция 2: полнотекстовый индекс FTS5 по названиям и описаниям задач.
+        Индекс хранит только токены (external content) и синхронизируется с
+        таблицей tasks триггерами. Если SQLite собран без FTS5, поиск работает
+        через LIKE.
+        """
+        try:
+            self.cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                    title, description,
+                    content='tasks', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2',
+                    prefix='1 2 3'
+                )
+            ''')
+        except sqlite3.OperationalError:
+            return
+        
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        ''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+        ''')
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+            AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+        ''')
+        
+        # Индексируем уже существующие задачи
+        self.cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+    
+    def _migrate_data_version(self):
+        """
+        Миграция 3: служебная таблица meta и счетчик изменений данных.
+        Счетчик data_version увеличивается триггерами при любом изменении задач
+        и распорядка; по нему проверяется актуальность сохраненного снимка.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value
+            )
+        ''')
+        self.cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+        
+        for table in ('tasks', 'single_tasks', 'daily_tasks', 'scheduled_tasks'):
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                self.cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                    AFTER {event} ON {table} BEGIN
+                        UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+                    END
+                ''')
+    
+    def _migrate_archive(self):
+        """
+        Миграция 4: архив распорядка archived_scheduled_tasks.
+        Строки старше горизонта переносятся в архив (archive_scheduled_tasks),
+        чтобы рабочая таблица оставалась небольшой. Граница архива хранится
+        в meta под ключом archived_before.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_scheduled_tasks (
+                id INTEGER PRIMARY KEY,
+                task_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                is_completed BOOLEAN NOT NULL DEFAULT 0,
+                FOREIGN KEY (task_id) REFERENCES tasks (id)
+            )
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_archived_scheduled_tasks_date
+            ON archived_scheduled_tasks (date)
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_archived_scheduled_tasks_task
+            ON archived_scheduled_tasks (task_id)
+        ''')
+        self.cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('archived_before', '')")
+    
+    def _migrate_daily_schedule(self):
+        """
+        Миграция 5: таблица daily_schedule с ежедневными задачами, размещенными
+        в распорядке. Для каждой хранится время начала и дата, по которую
+        экземпляры уже созданы (scheduled_until); materialize_daily_tasks
+        продлевает распорядок начиная со следующего дня.
+        Для существующих задач время и дата берутся из последнего экземпляра.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_schedule (
+                task_id INTEGER PRIMARY KEY,
+                start_time TEXT NOT NULL,
+                scheduled_until TEXT NOT NULL,
+                FOREIGN KEY (task_id) REFERENCES tasks (id)
+            )
+        ''')
+        # MAX(date) в SQLite берет start_time из той же строки
+        self.cursor.execute('''
+            INSERT OR IGNORE INTO daily_schedule (task_id, start_time, scheduled_until)
+            SELECT st.task_id, st.start_time, MAX(st.date)
+            FROM scheduled_tasks st
+            JOIN daily_tasks d ON d.task_id = st.task_id
+            GROUP BY st.task_id
+        ''')
+    
+    def _migrate_scheduled_task_index(self):
+        """
+        Миграция 6: индекс распорядка по задаче и дате.
+        Изменения экземпляров задачи (update_scheduled_task_time) и проверки
+        наличия задачи в распорядке читают только строки этой задачи.
+        """
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scheduled_tasks_task_date
+            ON scheduled_tasks (task_id, date)
+        ''')
+    
+    def _migrate_scheduled_date_index(self):
+        """
+        Миграция 7: индекс распорядка по дате для выборок за день и за период
+        (шкала дня, неделя, повестка).
+        """
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_scheduled_tasks_date
+            ON scheduled_tasks (date)
+        ''')
+    
+    def _migrate_daily_summary(self):
+        """
+        Миграция 8: итоги распорядка по дням daily_summary для статистики.
+        Итоги обновляются триггерами при любом изменении рабочей и архивной
+        таблиц распорядка (перенос в архив их не меняет) и длительности задач,
+        поэтому отчет за год читает не больше 365 строк.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS daily_summary (
+                date TEXT PRIMARY KEY,
+                planned_count INTEGER NOT NULL DEFAULT 0,
+                completed_count INTEGER NOT NULL DEFAULT 0,
+                planned_minutes INTEGER NOT NULL DEFAULT 0,
+                completed_minutes INTEGER NOT NULL DEFAULT 0,
+                daily_planned_count INTEGER NOT NULL DEFAULT 0,
+                daily_completed_count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        for table in ('scheduled_tasks', 'archived_scheduled_tasks'):
+            self.cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_summary_insert
+                AFTER INSERT ON {table} BEGIN
+                    {self._summary_upsert('new', 1)}
+                END
+            ''')
+            self.cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_summary_delete
+                AFTER DELETE ON {table} BEGIN
+                    {self._summary_upsert('old', -1)}
+                END
+            ''')
+            self.cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_summary_update
+                AFTER UPDATE OF task_id, date, is_completed ON {table} BEGIN
+                    {self._summary_upsert('old', -1)}
+                    {self._summary_upsert('new', 1)}
+                END
+            ''')
+        
+        # Изменение длительности задачи меняет время во всех днях с ее экземплярами
+        self.cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS tasks_summary_duration
+            AFTER UPDATE OF duration_minutes ON tasks
+            WHEN new.duration_minutes != old.duration_minutes BEGIN
+                UPDATE daily_summary SET
+                    planned_minutes = planned_minutes
+                        + (new.duration_minutes - old.duration_minutes) * (
+                            (SELECT COUNT(*) FROM scheduled_tasks
+                             WHERE task_id = new.id AND date = daily_summary.date)
+                            + (SELECT COUNT(*) FROM archived_scheduled_tasks
+                               WHERE task_id = new.id AND date = daily_summary.date)),
+                    completed_minutes = completed_minutes
+                        + (new.duration_minutes - old.duration_minutes) * (
+                            (SELECT COUNT(*) FROM scheduled_tasks
+                             WHERE task_id = new.id AND date = daily_summary.date AND is_completed)
+                            + (SELECT COUNT(*) FROM archived_scheduled_tasks
+                               WHERE task_id = new.id AND date = daily_summary.date AND is_completed))
+                WHERE date IN (SELECT date FROM scheduled_tasks WHERE task_id = new.id
+                               UNION SELECT date FROM archived_scheduled_tasks WHERE task_id = new.id);
+            END
+        ''')
+        
+        # Итоги по уже существующему распорядку
+        self.cursor.execute(f'''
+            INSERT OR REPLACE INTO daily_summary
+            SELECT st.date, COUNT(*), SUM(st.is_completed),
+                   SUM(t.duration_minutes), SUM(t.duration_minutes * st.is_completed),
+                   SUM(t.task_type = 'daily'), SUM((t.task_type = 'daily') * st.is_completed)
+            FROM {self.SCHEDULED_WITH_ARCHIVE} st
+            JOIN tasks t ON st.task_id = t.id
+            GROUP BY st.date
+        ''')
+    
+    @staticmethod
+    def _summary_upsert(row: str, sign: int) -> str:
+        """
+        Оператор триггера, добавляющий (sign = 1) или вычитающий (sign = -1)
+        строку распорядка row ('new' или 'old') из итогов ее дня.
+        """
+        return f'''
+            INSERT INTO daily_summary (date, planned_count, completed_count, planned_minutes,
+                                       completed_minutes, daily_planned_count, daily_completed_count)
+            SELECT {row}.date, {sign}, {sign} * {row}.is_completed,
+                   {sign} * t.duration_minutes, {sign} * t.duration_minutes * {row}.is_completed,
+                   {sign} * (t.task_type = 'daily'), {sign} * (t.task_type = 'daily') * {row}.is_completed
+            FROM tasks t WHERE t.id = {row}.task_id
+            {Database.SUMMARY_CONFLICT};
+        '''
+    
+    def _migrate_shards(self):
+        """
+        Миграция 9: распорядок прошлых лет в отдельных файлах (см. shard_scheduled_tasks).
+        Таблица shard_tasks хранит, у каких задач есть экземпляры в файле
+        какого года, чтобы проверки наличия задачи в распорядке и удаление
+        задачи не подключали все файлы. Граница хранится в meta под ключом
+        sharded_before.
+        """
+        self.cursor.execute('''
+            CREATE TABLE IF NOT EXISTS shard_tasks (
+                year INTEGER NOT NULL,
+                task_id INTEGER NOT NULL,
+                PRIMARY KEY (year, task_id)
+            ) WITHOUT ROWID
+        ''')
+        self.cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_shard_tasks_task
+            ON shard_tasks (task_id)
+        ''')
+        self.cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('sharded_before', '')")
+    
+    def _commit(self):
+        """
+        Фиксация изменений; внутри batch() откладывается до конца пакета.
+        После фиксации основной базы применяются отложенные изменения
+        файлов прошлых лет.
+        """
+        if not self._batch_depth:
+            self.conn.commit()
+            self._flush_shard_writes()
+    
+    def _write_shard(self, path: str, query: str, params: tuple):
+        """
+        Изменение файла прошлого года отдельным подключением. Выполняется
+        при фиксации основной базы (_commit), чтобы откат пакета или его
+        вложенного пакета отменял и изменение файла.
+        """
+        self._shard_writes.append((path, query, tuple(params)))
+    
+    def _flush_shard_writes(self):
+        """Применение отложенных изменений файлов прошлых лет, по одной транзакции на файл."""
+        writes, self._shard_writes = self._shard_writes, []
+        by_path: Dict[str, List[Tuple[str, tuple]]] = {}
+        for path, query, params in writes:
+            by_path.setdefault(path, []).append((query, params))
+        for path, statements in by_path.items():
+            with closing(sqlite3.connect(path)) as shard:
+                for query, params in statements:
+                    shard.execute(query, params)
+                shard.commit()
+    
+    @contextmanager
+    def batch(self):
+        """
+        Пакет изменений в одной транзакции.
+        Методы, вызванные внутри пакета, не фиксируют изменения по отдельности;
+        при выходе из пакета выполняется одна фиксация, при ошибке - откат.
+        Пакеты могут быть вложенными: при ошибке во вложенном пакете
+        откатываются только его изменения, и внешний пакет, перехвативший
+        исключение, может продолжаться.
+        """
+        # Вложенный пакет внутри открытой транзакции работает в точке сохранения;
+        # если транзакция еще не открыта, все ее изменения принадлежат пакету
+        savepoint = None
+        shard_writes = len(self._shard_writes)
+        if self._batch_depth and self.conn.in_transaction:
+            savepoint = f'batch_{self._batch_depth}'
+            self.cursor.execute(f'SAVEPOINT {savepoint}')
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._batch_depth -= 1
+            del self._shard_writes[shard_writes:]
+            if savepoint:
+                # SQLite мог уже откатить всю транзакцию сам (например, при нехватке места)
+                if self.conn.in_transaction:
+                    self.cursor.execute(f'ROLLBACK TO {savepoint}')
+                    self.cursor.execute(f'RELEASE {savepoint}')
+            else:
+                self.conn.rollback()
+            raise
+        self._batch_depth -= 1
+        if savepoint:
+            self.cursor.execute(f'RELEASE {savepoint}')
+        self._commit()
+    
+    def _table_exists(self, name: str) -> bool:
+        """Проверяет наличие таблицы (в том числе виртуальной) в БД."""
+        self.cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (name,)
+        )
+        return self.cursor.fetchone() is not None
+    
+    def get_archived_before(self) -> Optional[datetime]:
+        """
+        Граница архива: распорядок до этой даты (не включительно) хранится
+        в archived_scheduled_tasks.
+        
+        Returns:
+            Дата границы или None, если архив пуст
+        """
+        self.cursor.execute("SELECT value FROM meta WHERE key = 'archived_before'")
+        row = self.cursor.fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    def get_sharded_before(self) -> Optional[datetime]:
+        """
+        Граница файлов прошлых лет: распорядок до этой даты (1 января,
+        не включительно) хранится в файлах по годам.
+        
+        Returns:
+            Дата границы или None, если распорядок не разделялся по годам
+        """
+        self.cursor.execute("SELECT value FROM meta WHERE key = 'sharded_before'")
+        row = self.cursor.fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    def shard_path(self, year: int) -> str:
+        """Файл распорядка года рядом с файлом базы: planner.db -> planner.2024.db."""
+        base, extension = os.path.splitext(self.db_name)
+        return f"{base}.{year}{extension or '.db'}"
+    
+    def _attach_shard(self, year: int) -> str:
+        """
+        Подключение файла распорядка года, если он еще не подключен. Сверх
+        MAX_ATTACHED_SHARDS отключается файл, который дольше всех не использовался.
+        
+        Returns:
+            Имя схемы файла (shard_<год>)
+        """
+        alias = f'shard_{year}'
+        if alias in self.attached_shards:
+            self.attached_shards.move_to_end(alias)
+            return alias
+        
+        if len(self.attached_shards) >= self.MAX_ATTACHED_SHARDS:
+            for old_alias in list(self.attached_shards):
+                try:
+                    self.cursor.execute(f'DETACH DATABASE {old_alias}')
+                except sqlite3.OperationalError:
+                    continue  # Файл читает незавершенная выборка (iter_scheduled_tasks)
+                del self.attached_shards[old_alias]
+                break
+        
+        self.cursor.execute(f'ATTACH DATABASE ? AS {alias}', (self.shard_path(year),))
+        self.cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {alias}.scheduled_tasks (
+                id INTEGER PRIMARY KEY,
+                task_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                start_time TEXT NOT NULL,
+                is_completed BOOLEAN NOT NULL DEFAULT 0
+            )
+        ''')
+        self.cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS {alias}.idx_scheduled_tasks_date
+            ON scheduled_tasks (date)
+        ''')
+        self.cursor.execute(f'''
+            CREATE INDEX IF NOT EXISTS {alias}.idx_scheduled_tasks_task_date
+            ON scheduled_tasks (task_id, date)
+        ''')
+        self.attached_shards[alias] = year
+        return alias
+    
+    def _shard_years(self, start: Optional[datetime], end: Optional[datetime]) -> List[int]:
+        """Годы с файлами распорядка, которые пересекаются с периодом."""
+        sharded_before = self.get_sharded_before()
+        if sharded_before is None or (start is not None and start.date() >= sharded_before.date()):
+            return []
+        self.cursor.execute('SELECT MIN(year) FROM shard_tasks')
+        first_year = self.cursor.fetchone()[0]
+        if first_year is None:
+            return []
+        if start is not None:
+            first_year = max(first_year, start.year)
+        last_year = sharded_before.year - 1
+        if end is not None:
+            last_year = min(last_year, end.year)
+        return [year for year in range(first_year, last_year + 1)
+                if os.path.exists(self.shard_path(year))]
+    
+    def _scheduled_source(self, start: Optional[datetime], end: Optional[datetime] = None) -> str:
+        """
+        Источник распорядка для выборки за период: рабочая таблица, если период
+        не заходит в архив, иначе объединение с архивом и файлами прошлых лет,
+        которые пересекаются с периодом (они подключаются при необходимости).
+        
+        Raises:
+            ValueError: Период охватывает больше MAX_ATTACHED_SHARDS файлов
+        """
+        archived_before = self.get_archived_before()
+        if archived_before is None or (start is not None and start.date() >= archived_before.date()):
+            return 'scheduled_tasks'
+        shard_years = self._shard_years(start, end)
+        if not shard_years:
+            return self.SCHEDULED_WITH_ARCHIVE
+        if len(shard_years) > self.MAX_ATTACHED_SHARDS:
+            raise ValueError(f"Период охватывает больше {self.MAX_ATTACHED_SHARDS} лет "
+                             f"из файлов распорядка прошлых лет")
+        shards = ''.join(
+            f'''
+            UNION ALL
+            SELECT {self.SCHEDULED_TABLE_COLUMNS} FROM {self._attach_shard(year)}.scheduled_tasks'''
+            for year in shard_years
+        )
+        return f'''(
+            SELECT {self.SCHEDULED_TABLE_COLUMNS} FROM scheduled_tasks
+            UNION ALL
+            SELECT {self.SCHEDULED_TABLE_COLUMNS} FROM archived_scheduled_tasks{shards}
+        )'''
+    
+    @staticmethod
+    def _task_from_row(row) -> Union[SingleTask, DailyTask]:
+        """
+        Создание объекта задачи из строки выборки по TASK_COLUMNS.
+        
+        Args:
+            row: Строка результата запроса
+        
+        Returns:
+            Единоразовая или ежедневная задача
+        """
+        (task_id, title, duration, description, scheduled_time, is_completed,
+         task_type, created_at, execution_date, weekdays, is_unlimited) = row
+        
+        if task_type == TaskType.SINGLE.value:
+            return SingleTask(
+                title=title,
+                duration_minutes=duration,
+                description=description,
+                scheduled_time=time.fromisoformat(scheduled_time) if scheduled_time else None,
+                execution_date=datetime.fromisoformat(execution_date) if execution_date else None,
+                id=task_id,
+                is_completed=bool(is_completed),
+                created_at=datetime.fromisoformat(created_at)
+            )
+        return DailyTask(
+            title=title,
+            duration_minutes=duration,
+            description=description,
+            scheduled_time=time.fromisoformat(scheduled_time) if scheduled_time else None,
+            weekdays=mask_to_weekdays(weekdays or 0),
+            id=task_id,
+            is_completed=bool(is_completed),
+            is_unlimited=bool(is_unlimited),
+            created_at=datetime.fromisoformat(created_at)
+        )
+    
+    @staticmethod
+    def _scheduled_task_from_row(row) -> ScheduledTask:
+        """Создание объекта распорядка из строки выборки по SCHEDULED_COLUMNS."""
+        task_id, date_str, start_time_str, is_completed, title, duration, description = row
+        return ScheduledTask(
+            task_id=task_id,
+            date=datetime.fromisoformat(date_str),
+            start_time=time.fromisoformat(start_time_str),
+            title=title,
+            duration_minutes=duration,
+            description=description,
+            is_completed=bool(is_completed)
+        )
+    
     def add_single_task(self, task: SingleTask) -> int:
         """
         Добавление единоразовой задачи в БД.
@@ -95,7 +725,7 @@ class Database:
             'INSERT INTO single_tasks (task_id, execution_date) VALUES (?, ?)',
             (task_id, task.execution_date.isoformat() if task.execution_date else None)
         )
-        self.conn.commit()
+        self._commit()
         return task_id
     
     def add_daily_task(self, task: DailyTask) -> int:
@@ -122,14 +752,16 @@ class Database:
         
         self.cursor.execute(
             'INSERT INTO daily_tasks (task_id, weekdays, is_unlimited) VALUES (?, ?, ?)',
-            (task_id, ','.join(map(str, task.weekdays)), task.is_unlimited)
+            (task_id, task.weekday_mask, task.is_unlimited)
         )
-        self.conn.commit()
+        self._commit()
         return task_id
     
     def add_scheduled_task(self, scheduled_task: ScheduledTask) -> int:
         """
         Добавление задачи в распорядок дня.
+        Экземпляр ежедневной задачи размещает ее в распорядке (daily_schedule):
+        materialize_daily_tasks продлевает его со дня после последнего экземпляра.
         
         Args:
             scheduled_task: Объект размещенной задачи
@@ -146,8 +778,16 @@ class Database:
              scheduled_task.start_time.isoformat(),
              scheduled_task.is_completed)
         )
-        self.conn.commit()
-        return self.cursor.lastrowid
+        scheduled_id = self.cursor.lastrowid
+        self.cursor.execute('''
+            INSERT INTO daily_schedule (task_id, start_time, scheduled_until)
+            SELECT task_id, ?, ? FROM daily_tasks WHERE task_id = ?
+            ON CONFLICT (task_id) DO UPDATE
+            SET scheduled_until = MAX(scheduled_until, excluded.scheduled_until)
+        ''', (scheduled_task.start_time.isoformat(), scheduled_task.date.date().isoformat(),
+              scheduled_task.task_id))
+        self._commit()
+        return scheduled_id
     
     def get_all_tasks(self) -> List[Union[SingleTask, DailyTask]]:
         """
@@ -156,47 +796,172 @@ class Database:
         Returns:
             Список всех задач
         """
-        tasks = []
-        self.cursor.execute('SELECT * FROM tasks')
-        for task_row in self.cursor.fetchall():
-            task_id, title, duration, description, scheduled_time, is_completed, task_type, created_at = task_row
+        self.cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS}
+            FROM tasks t
+            LEFT JOIN single_tasks s ON s.task_id = t.id
+            LEFT JOIN daily_tasks d ON d.task_id = t.id
+            ORDER BY t.id
+        ''')
+        return [self._task_from_row(row) for row in self.cursor.fetchall()]
+    
+    def iter_tasks(self, chunk_size: int = 1000) -> Iterator[Union[SingleTask, DailyTask]]:
+        """
+        Потоковое чтение всех задач без загрузки всего списка в память.
+        Используется отдельный курсор, поэтому во время обхода можно вызывать
+        другие методы.
+        
+        Args:
+            chunk_size: Сколько строк читать из БД за раз
+        
+        Yields:
+            Задачи в порядке ID
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS}
+            FROM tasks t
+            LEFT JOIN single_tasks s ON s.task_id = t.id
+            LEFT JOIN daily_tasks d ON d.task_id = t.id
+            ORDER BY t.id
+        ''')
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._task_from_row(row)
+    
+    def get_unscheduled_tasks(self) -> List[Union[SingleTask, DailyTask]]:
+        """
+        Получение задач, которых нет в расписании (список доступных задач).
+        
+        Returns:
+            Список задач без экземпляров в распорядке
+        """
+        self.cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS}
+            FROM tasks t
+            LEFT JOIN single_tasks s ON s.task_id = t.id
+            LEFT JOIN daily_tasks d ON d.task_id = t.id
+            WHERE {self.UNSCHEDULED_CONDITION}
+            ORDER BY t.id
+        ''')
+        return [self._task_from_row(row) for row in self.cursor.fetchall()]
+    
+    def get_data_version(self) -> int:
+        """
+        Счетчик изменений данных (см. _migrate_data_version).
+        
+        Returns:
+            Текущее значение счетчика
+        """
+        self.cursor.execute("SELECT value FROM meta WHERE key = 'data_version'")
+        row = self.cursor.fetchone()
+        return row[0] if row else 0
+    
+    def get_task(self, task_id: int) -> Optional[Union[SingleTask, DailyTask]]:
+        """
+        Получение задачи по ID.
+        
+        Args:
+            task_id: ID задачи
             
-            if task_type == TaskType.SINGLE.value:
-                self.cursor.execute(
-                    'SELECT execution_date FROM single_tasks WHERE task_id = ?',
-                    (task_id,)
-                )
-                execution_date = self.cursor.fetchone()[0]
-                tasks.append(SingleTask(
-                    title=title,
-                    duration_minutes=duration,
-                    description=description,
-                    scheduled_time=time.fromisoformat(scheduled_time) if scheduled_time else None,
-                    execution_date=datetime.fromisoformat(execution_date) if execution_date else None,
-                    id=task_id,
-                    is_completed=bool(is_completed),
-                    created_at=datetime.fromisoformat(created_at)
-                ))
-            else:
-                self.cursor.execute(
-                    'SELECT weekdays, is_unlimited FROM daily_tasks WHERE task_id = ?',
-                    (task_id,)
-                )
-                weekdays_str, is_unlimited = self.cursor.fetchone()
-                weekdays = [int(day) for day in weekdays_str.split(',')]
-                tasks.append(DailyTask(
-                    title=title,
-                    duration_minutes=duration,
-                    description=description,
-                    scheduled_time=time.fromisoformat(scheduled_time) if scheduled_time else None,
-                    weekdays=weekdays,
-                    id=task_id,
-                    is_completed=bool(is_completed),
-                    is_unlimited=bool(is_unlimited),
-                    created_at=datetime.fromisoformat(created_at)
-                ))
-        
-        return tasks
+        Returns:
+            Задача или None, если задача не найдена
+        """
+        self.cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS}
+            FROM tasks t
+            LEFT JOIN single_tasks s ON s.task_id = t.id
+            LEFT JOIN daily_tasks d ON d.task_id = t.id
+            WHERE t.id = ?
+        ''', (task_id,))
+        row = self.cursor.fetchone()
+        return self._task_from_row(row) if row else None
+    
+    def get_daily_tasks_for_date(self, date: datetime) -> List[DailyTask]:
+        """
+        Получение ежедневных задач, выполняемых в указанный день.
+        День недели проверяется на стороне SQLite по битовой маске; условие
+        подставляется литералом, чтобы планировщик выбрал частичный индекс дня.
+        
+        Args:
+            date: Дата, для которой нужно получить задачи
+        
+        Returns:
+            Список ежедневных задач
+        """
+        self.cursor.execute(f'''
+            SELECT {self.TASK_COLUMNS}
+            FROM daily_tasks d
+            JOIN tasks t ON t.id = d.task_id
+            LEFT JOIN single_tasks s ON s.task_id = t.id
+            WHERE d.weekdays & {1 << date.weekday()}
+            ORDER BY d.task_id
+        ''')
+        return [self._task_from_row(row) for row in self.cursor.fetchall()]
+    
+    @staticmethod
+    def _fts_query(text: str) -> str:
+        """
+        Преобразование пользовательского ввода в запрос FTS5.
+        Каждое слово ищется как префикс, все слова должны присутствовать.
+        
+        Args:
+            text: Строка поиска
+        
+        Returns:
+            Выражение для MATCH или пустая строка
+        """
+        terms = [term.replace('"', '') for term in text.split()]
+        return ' '.join(f'"{term}"*' for term in terms if term)
+    
+    def search_tasks(self, text: str, limit: int = 200,
+                     unscheduled_only: bool = False) -> List[Union[SingleTask, DailyTask]]:
+        """
+        Полнотекстовый поиск задач по названию и описанию.
+        
+        Args:
+            text: Строка поиска
+            limit: Максимальное количество результатов
+            unscheduled_only: Искать только среди задач без экземпляров в распорядке
+        
+        Returns:
+            Список задач, отсортированный по релевантности
+        """
+        condition = f'AND {self.UNSCHEDULED_CONDITION}' if unscheduled_only else ''
+        if self.has_fts:
+            query = self._fts_query(text)
+            if not query:
+                return []
+            # Ранжирует сам FTS5 по всем совпадениям; совпадение в названии
+            # весит больше, чем в описании
+            self.cursor.execute(f'''
+                SELECT {self.TASK_COLUMNS}
+                FROM tasks_fts f
+                JOIN tasks t ON t.id = f.rowid
+                LEFT JOIN single_tasks s ON s.task_id = t.id
+                LEFT JOIN daily_tasks d ON d.task_id = t.id
+                WHERE tasks_fts MATCH ? AND f.rank MATCH 'bm25(10.0, 1.0)' {condition}
+                ORDER BY f.rank
+                LIMIT ?
+            ''', (query, limit))
+        else:
+            text = text.strip()
+            if not text:
+                return []
+            pattern = f'%{text}%'
+            self.cursor.execute(f'''
+                SELECT {self.TASK_COLUMNS}
+                FROM tasks t
+                LEFT JOIN single_tasks s ON s.task_id = t.id
+                LEFT JOIN daily_tasks d ON d.task_id = t.id
+                WHERE (t.title LIKE ? OR t.description LIKE ?) {condition}
+                ORDER BY t.id
+                LIMIT ?
+            ''', (pattern, pattern, limit))
+        return [self._task_from_row(row) for row in self.cursor.fetchall()]
     
     def get_scheduled_tasks_for_date(self, date: datetime) -> List[ScheduledTask]:
         """
@@ -208,26 +973,238 @@ class Database:
         Returns:
             Список запланированных задач
         """
-        self.cursor.execute('''
-            SELECT st.*, t.title, t.duration_minutes, t.description
-            FROM scheduled_tasks st
+        self.cursor.execute(f'''
+            SELECT {self.SCHEDULED_COLUMNS}
+            FROM {self._scheduled_source(date, date)} st
             JOIN tasks t ON st.task_id = t.id
             WHERE st.date = ?
         ''', (date.date().isoformat(),))
+        return [self._scheduled_task_from_row(row) for row in self.cursor.fetchall()]
+    
+    def iter_scheduled_tasks(self, start: datetime = None, end: datetime = None,
+                             chunk_size: int = 1000) -> Iterator[ScheduledTask]:
+        """
+        Потоковое чтение распорядка без загрузки всех записей в память.
+        Используется отдельный курсор, поэтому во время обхода можно вызывать
+        другие методы. Годы, хранящиеся в отдельных файлах, читаются по одному,
+        поэтому период может охватывать любое количество лет.
         
-        scheduled_tasks = []
+        Args:
+            start: Первая дата (включительно), по умолчанию без ограничения
+            end: Последняя дата (включительно), по умолчанию без ограничения
+            chunk_size: Сколько строк читать из БД за раз
+        
+        Yields:
+            Задачи из распорядка в порядке дат
+        """
+        shard_years = self._shard_years(start, end)
+        if len(shard_years) > 1:
+            sharded_before = self.get_sharded_before()
+            last_year = sharded_before.year - 1 if end is None else min(sharded_before.year - 1, end.year)
+            for year in range(shard_years[0], last_year + 1):
+                year_start = datetime(year, 1, 1)
+                year_end = datetime(year, 12, 31)
+                yield from self.iter_scheduled_tasks(max(start, year_start) if start else year_start,
+                                                     min(end, year_end) if end else year_end,
+                                                     chunk_size)
+            if end is not None and end < sharded_before:
+                return
+            start = sharded_before
+        
+        source = self._scheduled_source(start, end)
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT {self.SCHEDULED_COLUMNS}
+            FROM {source} st
+            JOIN tasks t ON st.task_id = t.id
+            WHERE st.date >= ? AND st.date <= ?
+            ORDER BY st.date, st.id
+        ''', (start.date().isoformat() if start else '',
+              end.date().isoformat() if end else '9999-12-31'))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            for row in rows:
+                yield self._scheduled_task_from_row(row)
+    
+    def get_agenda_days(self, start: datetime, end: datetime,
+                        tasks_per_day: int = 3) -> List[Tuple[datetime, int, List[ScheduledTask]]]:
+        """
+        Краткий распорядок по дням за период одним запросом: количество задач
+        дня и первые из них по времени. Дни без задач не возвращаются.
+        
+        Args:
+            start: Первая дата (включительно)
+            end: Последняя дата (включительно)
+            tasks_per_day: Сколько первых задач дня возвращать
+        
+        Returns:
+            Список (дата, количество задач, первые задачи) в порядке дат
+        """
+        self.cursor.execute(f'''
+            SELECT {self.SCHEDULED_COLUMNS}, total FROM (
+                SELECT st.*,
+                       COUNT(*) OVER (PARTITION BY st.date) AS total,
+                       ROW_NUMBER() OVER (PARTITION BY st.date
+                                          ORDER BY st.start_time, st.id) AS position
+                FROM {self._scheduled_source(start, end)} st
+                WHERE st.date >= ? AND st.date <= ?
+            ) st
+            JOIN tasks t ON st.task_id = t.id
+            WHERE st.position <= ?
+            ORDER BY st.date, st.position
+        ''', (start.date().isoformat(), end.date().isoformat(), tasks_per_day))
+        
+        days = []
         for row in self.cursor.fetchall():
-            scheduled_id, task_id, date_str, start_time_str, is_completed, title, duration, description = row
-            scheduled_tasks.append(ScheduledTask(
+            task = self._scheduled_task_from_row(row[:-1])
+            if not days or days[-1][0] != task.date:
+                days.append((task.date, row[-1], []))
+            days[-1][2].append(task)
+        return days
+    
+    def get_daily_summary(self, start: datetime, end: datetime) -> List[DaySummary]:
+        """
+        Итоги распорядка по дням за период (см. _migrate_daily_summary).
+        Дни без задач не возвращаются.
+        
+        Args:
+            start: Первая дата (включительно)
+            end: Последняя дата (включительно)
+        
+        Returns:
+            Итоги дней в порядке дат
+        """
+        self.cursor.execute('''
+            SELECT date, planned_count, completed_count, planned_minutes, completed_minutes,
+                   daily_planned_count, daily_completed_count
+            FROM daily_summary
+            WHERE date >= ? AND date <= ? AND planned_count > 0
+            ORDER BY date
+        ''', (start.date().isoformat(), end.date().isoformat()))
+        return [DaySummary(datetime.fromisoformat(row[0]), *row[1:]) for row in self.cursor.fetchall()]
+    
+    def get_scheduled_date_range(self) -> Optional[Tuple[datetime, datetime]]:
+        """
+        Первая и последняя даты распорядка, включая архив и файлы прошлых лет.
+        
+        Returns:
+            Пара дат или None, если распорядок пуст
+        """
+        shard_years = self._shard_years(None, None)
+        first_shard = ''
+        if shard_years:
+            first_shard = f'''
+                UNION ALL
+                SELECT MIN(date), MAX(date) FROM {self._attach_shard(shard_years[0])}.scheduled_tasks
+            '''
+        self.cursor.execute(f'''
+            SELECT MIN(first), MAX(last) FROM (
+                SELECT MIN(date) AS first, MAX(date) AS last FROM scheduled_tasks
+                UNION ALL
+                SELECT MIN(date), MAX(date) FROM archived_scheduled_tasks
+                {first_shard}
+            )
+        ''')
+        first, last = self.cursor.fetchone()
+        if first is None:
+            return None
+        return datetime.fromisoformat(first), datetime.fromisoformat(last)
+    
+    def get_daily_schedules(self, start: datetime, end: datetime) -> Dict[int, DailySchedule]:
+        """
+        Ежедневные задачи, размещенные в распорядке (daily_schedule), со
+        сверкой их экземпляров за период с правилом задачи. Сверяются дни от
+        создания задачи (не раньше start) по scheduled_until (не позже end);
+        распорядок расходится с правилом, если экземпляр удален, перенесен
+        в другой день или на время, отличное от daily_schedule.start_time.
+        Сначала распорядок сводится по задачам одним запросом, экземпляры
+        читаются только для задач с расхождениями.
+        
+        Args:
+            start: Первая дата (включительно)
+            end: Последняя дата (включительно)
+        
+        Returns:
+            ID задачи -> ее распорядок; задачи без сверяемых дней и без
+            экземпляров за период не включаются
+        """
+        first, last = start.date().isoformat(), end.date().isoformat()
+        source = self._scheduled_source(start, end)
+        self.cursor.execute('''
+            SELECT ds.task_id, ds.start_time, ds.scheduled_until, d.weekdays,
+                   substr(t.created_at, 1, 10)
+            FROM daily_schedule ds
+            JOIN daily_tasks d ON d.task_id = ds.task_id
+            JOIN tasks t ON t.id = ds.task_id
+        ''')
+        placed = self.cursor.fetchall()
+        # Число экземпляров и дней, крайние даты, экземпляры не в свое время
+        # и в дни не по правилу (бит дня недели, понедельник = 0)
+        self.cursor.execute(f'''
+            SELECT st.task_id, COUNT(*), COUNT(DISTINCT st.date), MIN(st.date), MAX(st.date),
+                   SUM(st.start_time != ds.start_time),
+                   SUM((d.weekdays >> ((CAST(strftime('%w', st.date) AS INTEGER) + 6) % 7)) & 1 = 0)
+            FROM {source} st
+            JOIN daily_schedule ds ON ds.task_id = st.task_id
+            JOIN daily_tasks d ON d.task_id = st.task_id
+            WHERE st.date >= ? AND st.date <= ?
+            GROUP BY st.task_id
+        ''', (first, last))
+        summary = {row[0]: row[1:] for row in self.cursor.fetchall()}
+        
+        schedules = {}
+        for task_id, start_time, scheduled_until, weekdays, created_at in placed:
+            count, days, min_date, max_date, moved, off_rule = summary.get(
+                task_id, (0, 0, None, None, 0, 0))
+            window_start = max(first, created_at or first)
+            window_end = min(last, scheduled_until)
+            expected = self._count_weekdays(datetime.fromisoformat(window_start),
+                                            datetime.fromisoformat(window_end), weekdays)
+            if not count and not expected:
+                continue
+            regular = (count == expected and days == count and not moved and not off_rule
+                       and (not count or window_start <= min_date and max_date <= window_end))
+            schedules[task_id] = DailySchedule(
                 task_id=task_id,
-                date=datetime.fromisoformat(date_str),
-                start_time=datetime.strptime(start_time_str, '%H:%M:%S').time(),
-                title=title,
-                duration_minutes=duration,
-                description=description,
-                is_completed=bool(is_completed)
-            ))
-        return scheduled_tasks
+                start_time=time.fromisoformat(start_time),
+                first_day=datetime.fromisoformat(window_start),
+                last_day=datetime.fromisoformat(window_end),
+                instances=None if regular else [],
+            )
+        
+        task_ids = [task_id for task_id, schedule in schedules.items() if schedule.instances is not None]
+        for offset in range(0, len(task_ids), 500):
+            chunk = task_ids[offset:offset + 500]
+            self.cursor.execute(f'''
+                SELECT {self.SCHEDULED_COLUMNS}
+                FROM {source} st
+                JOIN tasks t ON st.task_id = t.id
+                WHERE st.task_id IN ({', '.join('?' * len(chunk))})
+                  AND st.date >= ? AND st.date <= ?
+                ORDER BY st.task_id, st.date, st.start_time
+            ''', (*chunk, first, last))
+            for row in self.cursor.fetchall():
+                instance = self._scheduled_task_from_row(row)
+                schedules[instance.task_id].instances.append(instance)
+        return schedules
+    
+    @staticmethod
+    def _count_weekdays(first: datetime, last: datetime, weekdays: int) -> int:
+        """
+        Количество дней с first по last (включительно), отмеченных в маске
+        дней недели weekdays.
+        """
+        total = (last.date() - first.date()).days + 1
+        if total <= 0:
+            return 0
+        weeks, rest = divmod(total, 7)
+        count = weeks * bin(weekdays & 0x7f).count('1')
+        for offset in range(rest):
+            if weekdays & (1 << (first.weekday() + offset) % 7):
+                count += 1
+        return count
     
     def mark_task_completed(self, task_id: int, completed: bool = True):
         """
@@ -241,26 +1218,74 @@ class Database:
             'UPDATE tasks SET is_completed = ? WHERE id = ?',
             (completed, task_id)
         )
-        self.conn.commit()
+        self._commit()
+    
+    def _scheduled_tables(self, since: Optional[datetime] = None) -> List[str]:
+        """
+        Таблицы основной базы, в которых может быть распорядок начиная с даты
+        since (None - за все время): рабочая таблица, а если since раньше
+        границы архива - и архив. Рабочая таблица входит всегда: задачу можно
+        добавить и на уже архивированный день.
+        """
+        archived_before = self.get_archived_before()
+        if archived_before is None or (since is not None and since.date() >= archived_before.date()):
+            return ['scheduled_tasks']
+        return ['scheduled_tasks', 'archived_scheduled_tasks']
+    
+    def _archive_changed(self):
+        """
+        Увеличение счетчика версий данных после изменения архива: триггеры
+        счетчика есть только у рабочих таблиц, чтобы перенос в архив не
+        увеличивал его на каждую строку.
+        """
+        self.cursor.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+    
+    def _check_not_sharded(self, *dates: datetime):
+        """
+        Проверка, что дни не перенесены в файлы прошлых лет: экземпляры в них
+        на другие дни не переносятся (см. shard_scheduled_tasks).
+        
+        Raises:
+            ValueError: Один из дней раньше границы файлов прошлых лет
+        """
+        sharded_before = self.get_sharded_before()
+        if sharded_before is not None and any(date.date() < sharded_before.date() for date in dates):
+            raise ValueError(f"Распорядок до {sharded_before.date().isoformat()} хранится "
+                             f"в файлах прошлых лет и не переносится")
+    
+    def _change_scheduled_row(self, query: str, params: tuple):
+        """
+        Изменение записи распорядка по ID. При переносе в архив ID сохраняется,
+        поэтому запись, которой нет в рабочей таблице, изменяется в архиве.
+        
+        Args:
+            query: Запрос с {table} вместо имени таблицы
+            params: Параметры запроса
+        """
+        self.cursor.execute(query.format(table='scheduled_tasks'), params)
+        if self.cursor.rowcount or len(self._scheduled_tables()) == 1:
+            return
+        self.cursor.execute(query.format(table='archived_scheduled_tasks'), params)
+        if self.cursor.rowcount:
+            self._archive_changed()
     
     def mark_scheduled_task_completed(self, scheduled_id: int, completed: bool = True):
         """
         Отметить запланированную задачу как выполненную/невыполненную.
+        Запись ищется в рабочей таблице, затем в архиве.
         
         Args:
             scheduled_id: ID записи в расписании
             completed: Статус выполнения
         """
-        self.cursor.execute(
-            'UPDATE scheduled_tasks SET is_completed = ? WHERE id = ?',
-            (completed, scheduled_id)
-        )
-        self.conn.commit()
+        self._change_scheduled_row('UPDATE {table} SET is_completed = ? WHERE id = ?',
+                                   (completed, scheduled_id))
+        self._commit()
     
     def remove_scheduled_task(self, scheduled_id: int):
-        """Удалить задачу из расписания."""
-        self.cursor.execute('DELETE FROM scheduled_tasks WHERE id = ?', (scheduled_id,))
-        self.conn.commit()
+        """Удалить задачу из расписания (запись ищется в рабочей таблице, затем в архиве)."""
+        self._change_scheduled_row('DELETE FROM {table} WHERE id = ?', (scheduled_id,))
+        self._commit()
     
     def remove_task(self, task_id: int):
         """
@@ -269,8 +1294,11 @@ class Database:
         Args:
             task_id: ID задачи для удаления
         """
-        # Удаляем запланированные экземпляры
+        # Удаляем запланированные экземпляры, в том числе архивные и прошлых лет
+        self._remove_shard_instances(task_id)
         self.cursor.execute('DELETE FROM scheduled_tasks WHERE task_id = ?', (task_id,))
+        self.cursor.execute('DELETE FROM archived_scheduled_tasks WHERE task_id = ?', (task_id,))
+        self.cursor.execute('DELETE FROM daily_schedule WHERE task_id = ?', (task_id,))
         
         # Удаляем из таблицы single_tasks
         self.cursor.execute('DELETE FROM single_tasks WHERE task_id = ?', (task_id,))
@@ -281,7 +1309,7 @@ class Database:
         # Удаляем саму задачу
         self.cursor.execute('DELETE FROM tasks WHERE id = ?', (task_id,))
         
-        self.conn.commit()
+        self._commit()
     
     def is_task_scheduled(self, task_id: int) -> bool:
         """
@@ -294,48 +1322,133 @@ class Database:
             True если задача есть в расписании, False иначе
         """
         self.cursor.execute(
-            'SELECT COUNT(*) FROM scheduled_tasks WHERE task_id = ?',
-            (task_id,)
+            '''SELECT EXISTS (SELECT 1 FROM scheduled_tasks WHERE task_id = ?)
+                   OR EXISTS (SELECT 1 FROM archived_scheduled_tasks WHERE task_id = ?)
+                   OR EXISTS (SELECT 1 FROM shard_tasks WHERE task_id = ?)''',
+            (task_id, task_id, task_id)
         )
-        count = self.cursor.fetchone()[0]
-        return count > 0
+        return bool(self.cursor.fetchone()[0])
     
     def remove_all_scheduled_instances(self, task_id: int):
         """
-        Удаляет все запланированные экземпляры задачи из расписания.
+        Удаляет все запланированные экземпляры задачи из расписания, включая архив
+        и файлы прошлых лет. Ежедневная задача больше не продлевается в распорядке.
         
         Args:
             task_id: ID задачи
         """
+        self._remove_shard_instances(task_id)
         self.cursor.execute('DELETE FROM scheduled_tasks WHERE task_id = ?', (task_id,))
-        self.conn.commit()
+        self.cursor.execute('DELETE FROM archived_scheduled_tasks WHERE task_id = ?', (task_id,))
+        self.cursor.execute('DELETE FROM daily_schedule WHERE task_id = ?', (task_id,))
+        self._commit()
     
-    def update_scheduled_task_time(self, task_id: int, new_time: time, date: datetime = None):
+    def update_scheduled_task_time(self, task_id: int, new_time: time, date: datetime = None,
+                                   scope: EditScope = None):
         """
         Обновляет время запланированной задачи.
-        Если задача ежедневная и date не указан, обновляет время для всех экземпляров.
+        Изменение выполняется одним запросом по индексу (task_id, date);
+        строки, где время уже совпадает, не перезаписываются. Изменяются все
+        таблицы, где могут быть затронутые дни: рабочая, архив и файлы прошлых
+        лет.
         
         Args:
             task_id: ID задачи
             new_time: Новое время
-            date: Дата конкретного экземпляра (для единоразовых задач)
+            date: Дата экземпляра, от которой отсчитывается scope
+            scope: Какие экземпляры изменить; по умолчанию только экземпляр
+                на date, а если дата не указана - все экземпляры
         """
-        if date:
-            # Обновляем время только для конкретной даты
-            self.cursor.execute(
-                '''UPDATE scheduled_tasks 
-                   SET start_time = ? 
-                   WHERE task_id = ? AND date = ?''',
-                (new_time.isoformat(), task_id, date.date().isoformat())
-            )
-        else:
-            # Обновляем время для всех экземпляров задачи
+        if scope is None:
+            scope = EditScope.OCCURRENCE if date else EditScope.ALL
+        if scope != EditScope.ALL and date is None:
+            raise ValueError("Для изменения экземпляра задачи нужна дата")
+        
+        query = 'UPDATE scheduled_tasks SET start_time = ? WHERE task_id = ? AND start_time != ?'
+        params = [new_time.isoformat(), task_id, new_time.isoformat()]
+        if scope == EditScope.OCCURRENCE:
+            query += ' AND date = ?'
+            params.append(date.date().isoformat())
+        elif scope == EditScope.FOLLOWING:
+            query += ' AND date >= ?'
+            params.append(date.date().isoformat())
+        since = None if scope == EditScope.ALL else date
+        for table in self._scheduled_tables(since):
+            self.cursor.execute(query.replace('scheduled_tasks', table), params)
+            if table == 'archived_scheduled_tasks' and self.cursor.rowcount:
+                self._archive_changed()
+        self._update_shard_times(task_id, query, params, since,
+                                 date if scope == EditScope.OCCURRENCE else None)
+        
+        if scope != EditScope.OCCURRENCE:
+            # Новые дни ежедневной задачи создаются с новым временем
             self.cursor.execute(
-                'UPDATE scheduled_tasks SET start_time = ? WHERE task_id = ?',
+                'UPDATE daily_schedule SET start_time = ? WHERE task_id = ?',
                 (new_time.isoformat(), task_id)
             )
-        self.conn.commit()
+        self._commit()
 
+    def _update_shard_times(self, task_id: int, query: str, params: list,
+                            since: Optional[datetime], occurrence: Optional[datetime]):
+        """
+        Изменение времени экземпляров задачи в файлах прошлых лет тем же
+        запросом, что и в основной базе (после ее фиксации, см. _write_shard);
+        итоги дней от времени не зависят и не меняются.
+        
+        Args:
+            task_id: ID задачи
+            query: Запрос к scheduled_tasks
+            params: Параметры запроса
+            since: Первый затронутый день (None - все дни)
+            occurrence: Единственный затронутый день, если меняется один экземпляр
+        """
+        sharded_before = self.get_sharded_before()
+        if sharded_before is None or (since is not None and since.date() >= sharded_before.date()):
+            return
+        self.cursor.execute('SELECT year FROM shard_tasks WHERE task_id = ?', (task_id,))
+        for (year,) in self.cursor.fetchall():
+            path = self.shard_path(year)
+            if ((since is not None and year < since.year)
+                    or (occurrence is not None and year != occurrence.year)
+                    or not os.path.exists(path)):
+                continue
+            self._write_shard(path, query, params)
+    
+    def move_scheduled_task(self, task_id: int, date: datetime, new_date: datetime, new_time: time):
+        """
+        Перенос экземпляра задачи на другой день и время.
+        Если дни по разные стороны границы архива, экземпляр переносится
+        между рабочей таблицей и архивом.
+        
+        Args:
+            task_id: ID задачи
+            date: Текущая дата экземпляра
+            new_date: Новая дата
+            new_time: Новое время
+        
+        Raises:
+            ValueError: Текущий или новый день в файлах прошлых лет
+        """
+        self._check_not_sharded(date, new_date)
+        params = (new_date.date().isoformat(), new_time.isoformat(), task_id, date.date().isoformat())
+        target = self._scheduled_tables(new_date)[-1]
+        for table in self._scheduled_tables(date):
+            if table == target:
+                self.cursor.execute(
+                    f'UPDATE {table} SET date = ?, start_time = ? WHERE task_id = ? AND date = ?',
+                    params
+                )
+            else:
+                self.cursor.execute(f'''
+                    INSERT INTO {target} ({self.SCHEDULED_TABLE_COLUMNS})
+                    SELECT id, task_id, ?, ?, is_completed FROM {table}
+                    WHERE task_id = ? AND date = ?
+                ''', params)
+                self.cursor.execute(f'DELETE FROM {table} WHERE task_id = ? AND date = ?', params[2:])
+            if self.cursor.rowcount and 'archived_scheduled_tasks' in (table, target):
+                self._archive_changed()
+        self._commit()
+    
     def is_daily_task(self, task_id: int) -> bool:
         """
         Проверяет, является ли задача ежедневной.
@@ -356,10 +1469,16 @@ class Database:
     def update_task(self, task: Union[SingleTask, DailyTask]):
         """
         Обновление существующей задачи.
+        Если изменилось время задачи, оно переносится в распорядок; у ежедневной
+        задачи - начиная с сегодняшнего дня, прошедшие дни не меняются.
         
         Args:
             task: Обновленная задача
         """
+        self.cursor.execute('SELECT scheduled_time, duration_minutes FROM tasks WHERE id = ?', (task.id,))
+        row = self.cursor.fetchone()
+        old_time, old_duration = row if row else (None, None)
+        
         # Обновляем базовую информацию
         self.cursor.execute(
             '''UPDATE tasks 
@@ -381,15 +1500,351 @@ class Database:
         else:
             self.cursor.execute(
                 'UPDATE daily_tasks SET weekdays = ?, is_unlimited = ? WHERE task_id = ?',
-                (','.join(map(str, task.weekdays)), task.is_unlimited, task.id)
+                (task.weekday_mask, task.is_unlimited, task.id)
             )
         
-        self.conn.commit()
+        # Итоги дней прошлых лет триггеры не видят (см. _add_to_summary)
+        if old_duration is not None and task.duration_minutes != old_duration:
+            delta = task.duration_minutes - old_duration
+            self._add_to_summary([
+                (date, 0, 0, count * delta, completed * delta, 0, 0)
+                for date, count, completed in self._shard_task_counts(task.id)
+            ])
+        
+        self._commit()
         
         # Обновляем время в запланированных экземплярах, если оно изменилось
-        if task.scheduled_time:
-            self.update_scheduled_task_time(task.id, task.scheduled_time)
+        if task.scheduled_time and task.scheduled_time.isoformat() != old_time:
+            if isinstance(task, DailyTask):
+                today = datetime.combine(datetime.now().date(), time())
+                self.update_scheduled_task_time(task.id, task.scheduled_time, today, EditScope.FOLLOWING)
+            else:
+                self.update_scheduled_task_time(task.id, task.scheduled_time)
+    
+    def schedule_daily_task(self, task_id: int, start_time: time,
+                            horizon_days: int = None) -> int:
+        """
+        Размещение ежедневной задачи в распорядке начиная с сегодняшнего дня.
+        Дальше распорядок задачи продлевается materialize_daily_tasks.
+        Если задача уже размещена, меняется только время для новых дней.
+        
+        Args:
+            task_id: ID ежедневной задачи
+            start_time: Время начала
+            horizon_days: На сколько дней вперед создать экземпляры,
+                по умолчанию DAILY_HORIZON_DAYS
+        
+        Returns:
+            Количество созданных экземпляров
+        """
+        yesterday = datetime.now().date() - timedelta(days=1)
+        self.cursor.execute('''
+            INSERT INTO daily_schedule (task_id, start_time, scheduled_until)
+            VALUES (?, ?, ?)
+            ON CONFLICT (task_id) DO UPDATE SET start_time = excluded.start_time
+        ''', (task_id, start_time.isoformat(), yesterday.isoformat()))
+        return self.materialize_daily_tasks(horizon_days, task_id)
+    
+    def materialize_daily_tasks(self, horizon_days: int = None, task_id: int = None) -> int:
+        """
+        Продление распорядка ежедневных задач до горизонта.
+        Создаются только дни после scheduled_until каждой задачи (и не раньше
+        сегодняшнего), существующие экземпляры не читаются и не меняются.
+        Все экземпляры добавляются одной транзакцией; повторный вызов в тот же
+        день ничего не делает.
+        
+        Args:
+            horizon_days: На сколько дней вперед должен быть заполнен распорядок,
+                по умолчанию DAILY_HORIZON_DAYS
+            task_id: Продлить только эту задачу
+        
+        Returns:
+            Количество созданных экземпляров
+        """
+        today = datetime.now().date()
+        until = today + timedelta(days=self.DAILY_HORIZON_DAYS if horizon_days is None else horizon_days)
+        query = '''
+            SELECT ds.task_id, ds.start_time, ds.scheduled_until, d.weekdays
+            FROM daily_schedule ds
+            JOIN daily_tasks d ON d.task_id = ds.task_id
+            WHERE ds.scheduled_until < ?
+        '''
+        params = [until.isoformat()]
+        if task_id is not None:
+            query += ' AND ds.task_id = ?'
+            params.append(task_id)
+        self.cursor.execute(query, params)
+        rows = self.cursor.fetchall()
+        if not rows:
+            return 0
+        
+        instances = []
+        for row_task_id, start_time, scheduled_until, weekdays in rows:
+            day = max(datetime.fromisoformat(scheduled_until).date() + timedelta(days=1), today)
+            while day <= until:
+                if weekdays & (1 << day.weekday()):
+                    instances.append((row_task_id, day.isoformat(), start_time))
+                day += timedelta(days=1)
+        
+        with self.batch():
+            self.cursor.executemany(
+                'INSERT INTO scheduled_tasks (task_id, date, start_time) VALUES (?, ?, ?)',
+                instances
+            )
+            self.cursor.executemany(
+                'UPDATE daily_schedule SET scheduled_until = ? WHERE task_id = ?',
+                [(until.isoformat(), row[0]) for row in rows]
+            )
+        return len(instances)
+    
+    def archive_scheduled_tasks(self, before: datetime = None, batch_size: int = 10000,
+                                progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Перенос распорядка до даты before в архив пакетами по batch_size строк,
+        каждый в своей транзакции, с последующим сжатием файла (compact без
+        полного VACUUM). Выборки за период, заходящий в архив, читают его
+        автоматически. Нельзя вызывать внутри batch().
+        
+        Args:
+            before: Граница архива (не включительно), по умолчанию
+                ARCHIVE_HORIZON_DAYS дней назад
+            batch_size: Количество строк в одной транзакции
+            progress: Функция, получающая количество перенесенных строк
+        
+        Returns:
+            Количество перенесенных строк
+        """
+        if before is None:
+            before = datetime.combine(datetime.now().date(), time()) - timedelta(days=self.ARCHIVE_HORIZON_DAYS)
+        boundary = before.date().isoformat()
+        
+        # Граница записывается первой: во время переноса выборки уже читают архив
+        archived_before = self.get_archived_before()
+        if archived_before is None or archived_before.date() < before.date():
+            self.cursor.execute(
+                "UPDATE meta SET value = ? WHERE key = 'archived_before'",
+                (boundary,)
+            )
+            self._commit()
+        
+        moved = 0
+        while True:
+            with self.batch():
+                batch = '''
+                    SELECT id FROM scheduled_tasks
+                    WHERE date < ? ORDER BY id LIMIT ?
+                '''
+                self.cursor.execute(f'''
+                    INSERT INTO archived_scheduled_tasks ({self.SCHEDULED_TABLE_COLUMNS})
+                    SELECT {self.SCHEDULED_TABLE_COLUMNS} FROM scheduled_tasks
+                    WHERE id IN ({batch})
+                ''', (boundary, batch_size))
+                count = self.cursor.rowcount
+                self.cursor.execute(
+                    f'DELETE FROM scheduled_tasks WHERE id IN ({batch})',
+                    (boundary, batch_size)
+                )
+            moved += count
+            if progress:
+                progress(moved)
+            if count < batch_size:
+                break
+        
+        if moved:
+            self.compact()
+        return moved
+    
+    def shard_scheduled_tasks(self, before_year: int = None,
+                              progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Перенос архивного распорядка прошлых лет в отдельные файлы по годам
+        (planner.2024.db и т.д.), с последующим сжатием основного файла
+        (compact без полного VACUUM); нельзя вызывать внутри batch().
+        Переносятся только годы, целиком вошедшие в архив. Файл года
+        подключается (ATTACH) только выборками за период, который его
+        затрагивает, поэтому основной файл не растет с годами истории.
+        
+        Args:
+            before_year: Переносить годы раньше этого, по умолчанию все
+                целиком архивированные
+            progress: Функция, получающая количество перенесенных строк
+        
+        Returns:
+            Количество перенесенных строк
+        
+        Raises:
+            ValueError: База открыта в памяти
+        """
+        if self.db_name == ':memory:':
+            raise ValueError("Распорядок базы в памяти не разделяется по файлам")
+        archived_before = self.get_archived_before()
+        if archived_before is None:
+            return 0
+        last_year = archived_before.year - 1
+        if before_year is not None:
+            last_year = min(last_year, before_year - 1)
+        self.cursor.execute('SELECT MIN(date) FROM archived_scheduled_tasks')
+        first_date = self.cursor.fetchone()[0]
+        if first_date is None:
+            return 0
+        
+        moved = 0
+        for year in range(datetime.fromisoformat(first_date).year, last_year + 1):
+            moved += self._move_year_to_shard(year)
+            if progress:
+                progress(moved)
+        
+        if moved:
+            self.compact()
+        return moved
+    
+    def _move_year_to_shard(self, year: int) -> int:
+        """
+        Перенос архивного распорядка года в его файл.
+        Сначала строки копируются в файл года, затем одной транзакцией
+        основной базы сдвигается граница и строки удаляются из архива, поэтому
+        выборки видят год целиком либо в архиве, либо в файле. Если перенос
+        прервется между этими шагами, повторный перенос его завершит.
+        
+        Returns:
+            Количество перенесенных строк
+        """
+        start, end = f'{year}-01-01', f'{year + 1}-01-01'
+        alias = self._attach_shard(year)
+        with self.batch():
+            self.cursor.execute(f'''
+                INSERT OR IGNORE INTO {alias}.scheduled_tasks ({self.SCHEDULED_TABLE_COLUMNS})
+                SELECT {self.SCHEDULED_TABLE_COLUMNS} FROM archived_scheduled_tasks
+                WHERE date >= ? AND date < ?
+            ''', (start, end))
+        
+        with self.batch():
+            self.cursor.execute(f'''
+                INSERT OR IGNORE INTO shard_tasks (year, task_id)
+                SELECT DISTINCT ?, task_id FROM {alias}.scheduled_tasks
+            ''', (year,))
+            sharded_before = self.get_sharded_before()
+            if sharded_before is None or sharded_before.date().isoformat() < end:
+                self.cursor.execute("UPDATE meta SET value = ? WHERE key = 'sharded_before'", (end,))
+            self.cursor.execute(
+                'DELETE FROM archived_scheduled_tasks WHERE date >= ? AND date < ?',
+                (start, end)
+            )
+            moved = self.cursor.rowcount
+            # Триггеры вычли удаленные строки из итогов; возвращаем их по файлу года
+            self.cursor.execute(f'''
+                SELECT st.date, COUNT(*), SUM(st.is_completed),
+                       SUM(t.duration_minutes), SUM(t.duration_minutes * st.is_completed),
+                       SUM(t.task_type = 'daily'), SUM((t.task_type = 'daily') * st.is_completed)
+                FROM {alias}.scheduled_tasks st
+                JOIN tasks t ON st.task_id = t.id
+                WHERE st.date >= ? AND st.date < ?
+                GROUP BY st.date
+            ''', (start, end))
+            self._add_to_summary(self.cursor.fetchall())
+        return moved
+    
+    def _shard_task_counts(self, task_id: int, delete: bool = False) -> List[Tuple[str, int, int]]:
+        """
+        Количество экземпляров задачи в файлах прошлых лет по дням; при delete
+        экземпляры удаляются. Файлы открываются отдельными подключениями, а не
+        ATTACH, поэтому одно изменение может затронуть любое количество лет;
+        удаление выполняется после фиксации основной базы (см. _write_shard).
+        
+        Returns:
+            Список (дата, количество экземпляров, из них выполненных)
+        """
+        self.cursor.execute('SELECT year FROM shard_tasks WHERE task_id = ?', (task_id,))
+        counts = []
+        for (year,) in self.cursor.fetchall():
+            path = self.shard_path(year)
+            if not os.path.exists(path):
+                continue
+            with closing(sqlite3.connect(path)) as shard:
+                counts.extend(shard.execute('''
+                    SELECT date, COUNT(*), SUM(is_completed) FROM scheduled_tasks
+                    WHERE task_id = ? GROUP BY date
+                ''', (task_id,)).fetchall())
+            if delete:
+                self._write_shard(path, 'DELETE FROM scheduled_tasks WHERE task_id = ?', (task_id,))
+        return counts
+    
+    def _remove_shard_instances(self, task_id: int):
+        """Удаление экземпляров задачи из файлов прошлых лет с вычитанием их из итогов дней."""
+        self.cursor.execute("SELECT duration_minutes, task_type = 'daily' FROM tasks WHERE id = ?", (task_id,))
+        row = self.cursor.fetchone()
+        counts = self._shard_task_counts(task_id, delete=True)
+        self.cursor.execute('DELETE FROM shard_tasks WHERE task_id = ?', (task_id,))
+        if row:
+            duration, is_daily = row
+            self._add_to_summary([
+                (date, -count, -completed, -count * duration, -completed * duration,
+                 -count * is_daily, -completed * is_daily)
+                for date, count, completed in counts
+            ])
+    
+    def _add_to_summary(self, rows: List[tuple]):
+        """
+        Добавление к итогам дней (со знаком) изменений в файлах прошлых лет,
+        которые триггеры daily_summary не видят.
+        
+        Args:
+            rows: Строки (дата, planned_count, completed_count, planned_minutes,
+                completed_minutes, daily_planned_count, daily_completed_count)
+        """
+        self.cursor.executemany(f'''
+            INSERT INTO daily_summary (date, planned_count, completed_count, planned_minutes,
+                                       completed_minutes, daily_planned_count, daily_completed_count)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            {self.SUMMARY_CONFLICT}
+        ''', rows)
+    
+    def compact(self, vacuum: bool = False) -> bool:
+        """
+        Возврат освободившихся страниц файлу базы (PRAGMA incremental_vacuum).
+        
+        База, созданная без auto_vacuum = INCREMENTAL, сжимается только
+        однократным полным VACUUM, после которого достаточно incremental_vacuum.
+        VACUUM переписывает весь файл и на большой базе идет долго, поэтому
+        выполняется только по явному vacuum=True: из командной строки
+        (archive.py) или фонового потока, но не из потока интерфейса.
+        
+        Нельзя вызывать внутри batch(): сжатие фиксирует транзакцию, а VACUUM
+        внутри нее не выполняется.
+        
+        Args:
+            vacuum: Выполнить полный VACUUM, если incremental_vacuum недоступен
+        
+        Returns:
+            True, если файл сжат; False, если для сжатия нужен VACUUM
+        
+        Raises:
+            ValueError: Вызов внутри batch()
+        """
+        if self._batch_depth:
+            raise ValueError("compact нельзя вызывать внутри batch()")
+        self._commit()
+        self.cursor.execute('PRAGMA auto_vacuum')
+        if self.cursor.fetchone()[0] == 2:
+            # executescript выполняет прагму до конца; execute освободил бы одну страницу
+            self.conn.executescript('PRAGMA incremental_vacuum')
+        elif vacuum:
+            self.cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+            self.cursor.execute('VACUUM')
+        else:
+            return False
+        self.cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return True
+    
+    def close(self):
+        """
+        Закрытие соединения с БД. Соединение закрывается в потоке, в котором
+        открыто; повторный вызов ничего не делает.
+        """
+        if not self.closed:
+            self.closed = True
+            self.conn.close()
     
     def __del__(self):
         """Закрытие соединения с БД при уничтожении объекта."""
-        self.conn.close() 
\ No newline at end of file
+        self.close() 
\ No newline at end of file
@@ -0,0 +1,332 @@
+"""
+Экспорт расписания в формат iCalendar (RFC 5545).
+
+Единоразовые задачи записываются отдельными событиями VEVENT по своим
+экземплярам в распорядке, а не размещенные в распорядке - по дате выполнения.
+Ежедневные задачи, размещенные в распорядке (daily_schedule), записываются
+одним событием с правилом повторения RRULE:FREQ=WEEKLY;BYDAY=..., а не
+каждым экземпляром; время правила берется из распорядка, правило действует
+от создания задачи по последний день распорядка. Расхождения распорядка с правилом
+записываются исключениями: удаленные экземпляры - датами EXDATE, перенесенные
+на другое время или в другой день - событиями с RECURRENCE-ID исходного дня.
+Исходная дата экземпляра в распорядке не хранится: экземпляр в дне не по
+правилу (или второй за день) считается перенесенным с ближайшего дня правила,
+оставшегося без экземпляра (см. recurrence_exceptions).
+Время записывается без часового пояса (локальное).
+
+Файл пишется потоково, задачи читаются из базы генератором.
+
+Пример:
+    python ical_export.py planner.ics --start 2025-01-01 --end 2025-12-31
+"""
+import argparse
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Set, TextIO, Tuple, Union
+from database import Database
+from models import SingleTask, DailyTask, ScheduledTask, DailySchedule
+
+PRODID = "-//Simple Planner//RU"
+UID_DOMAIN = "simple-planner"
+
+# Коды дней недели RFC 5545 (0 = понедельник)
+WEEKDAY_CODES = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+
+def escape_text(text: str) -> str:
+    """Экранирование значения TEXT: обратная косая черта, ';', ',' и переводы строк."""
+    return (text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+def fold_line(line: str) -> str:
+    """
+    Перенос строки содержимого длиннее 75 октетов (RFC 5545, 3.1).
+    Строка режется по границам символов UTF-8; продолжение начинается с пробела.
+    """
+    if len(line.encode('utf-8')) <= 75:
+        return line + '\r\n'
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode('utf-8'))
+        if size + char_size > limit:
+            parts.append(current)
+            current = ' '
+            size = 1
+            limit = 75
+        current += char
+        size += char_size
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+def format_datetime(value: datetime) -> str:
+    """Локальное время без часового пояса."""
+    return value.strftime('%Y%m%dT%H%M%S')
+
+def format_date(value: date) -> str:
+    return value.strftime('%Y%m%d')
+
+def _start_property(name: str, value: datetime, all_day: bool) -> str:
+    """DTSTART/RECURRENCE-ID в форме даты-времени или даты (для задач без времени)."""
+    if all_day:
+        return f"{name};VALUE=DATE:{format_date(value)}"
+    return f"{name}:{format_datetime(value)}"
+
+def _event_lines(uid: str, start: datetime, all_day: bool,
+                 task: Union[SingleTask, DailyTask, ScheduledTask],
+                 stamp: str, extra: List[str] = ()) -> Iterator[str]:
+    """Строки одного события VEVENT."""
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{stamp}"
+    yield _start_property("DTSTART", start, all_day)
+    if all_day:
+        yield "DURATION:P1D"
+    else:
+        yield f"DURATION:PT{task.duration_minutes}M"
+    yield from extra
+    yield f"SUMMARY:{escape_text(task.title)}"
+    if task.description:
+        yield f"DESCRIPTION:{escape_text(task.description)}"
+    yield "END:VEVENT"
+
+def _rule_day(task: DailyTask, day: date, step: int, limit: date, excluded: Set[date]) -> Optional[date]:
+    """Ближайший к day (в сторону step, не дальше limit) день правила, не исключенный из него."""
+    if not task.weekdays:
+        return None
+    while (day <= limit) if step > 0 else (day >= limit):
+        if task.occurs_on(day) and day not in excluded:
+            return day
+        day += timedelta(days=step)
+    return None
+
+def recurrence_exceptions(task: DailyTask, first_day: date, last_day: date, start_time: time,
+                          instances: List[ScheduledTask]
+                          ) -> Tuple[List[date], List[Tuple[date, ScheduledTask]], List[ScheduledTask]]:
+    """
+    Сверка экземпляров ежедневной задачи с ее правилом за дни first_day..last_day.
+    
+    Каждому дню правила сопоставляется экземпляр этого дня, экземпляр не во
+    время start_time становится исключением на этот же день. Лишние экземпляры
+    (в день не по правилу, вне сверяемых дней или второй за день) по порядку
+    дат сопоставляются ближайшему дню правила без экземпляра. Оставшиеся дни
+    без экземпляров исключаются из правила, оставшиеся лишние экземпляры
+    записываются отдельными событиями.
+    
+    Returns:
+        (дни для EXDATE, пары (исходный день, экземпляр) для RECURRENCE-ID,
+        экземпляры для отдельных событий)
+    """
+    by_day: Dict[date, List[ScheduledTask]] = defaultdict(list)
+    for instance in instances:
+        by_day[instance.date.date()].append(instance)
+    
+    missing: List[date] = []
+    overrides: List[Tuple[date, ScheduledTask]] = []
+    extras: List[ScheduledTask] = []
+    day = first_day
+    while day <= last_day:
+        if task.occurs_on(day):
+            day_instances = by_day.pop(day, [])
+            if not day_instances:
+                missing.append(day)
+            else:
+                # Дню правила достается экземпляр в свое время, если он есть
+                day_instances.sort(key=lambda instance: instance.start_time != start_time)
+                kept, *rest = day_instances
+                if kept.start_time != start_time:
+                    overrides.append((day, kept))
+                extras.extend(rest)
+        day += timedelta(days=1)
+    for day_instances in by_day.values():
+        extras.extend(day_instances)
+    extras.sort(key=lambda instance: (instance.date, instance.start_time))
+    
+    unpaired = []
+    for instance in extras:
+        if not missing:
+            unpaired.append(instance)
+            continue
+        moved_day = instance.date.date()
+        original = min(missing, key=lambda day: (abs((day - moved_day).days), day))
+        missing.remove(original)
+        overrides.append((original, instance))
+    overrides.sort(key=lambda pair: pair[0])
+    return missing, overrides, unpaired
+
+def _instance_uid(task_id: int, instance: ScheduledTask) -> str:
+    """UID отдельного события экземпляра из распорядка."""
+    instance_start = datetime.combine(instance.date.date(), instance.start_time)
+    return f"task-{task_id}-{format_datetime(instance_start)}@{UID_DOMAIN}"
+
+def _instance_start(instance: ScheduledTask) -> datetime:
+    return datetime.combine(instance.date.date(), instance.start_time)
+
+def daily_task_events(task: DailyTask, schedule: DailySchedule, end: date, stamp: str,
+                      overrides: bool = True) -> Iterator[str]:
+    """
+    Событие с правилом повторения для ежедневной задачи и исключения из него
+    по распорядку.
+    
+    Правило начинается с первого дня сверки (не раньше создания задачи) и
+    заканчивается последним днем распорядка, для бессрочных задач - концом
+    периода. Время событий берется из распорядка (daily_schedule.start_time).
+    
+    Args:
+        task: Ежедневная задача
+        schedule: Распорядок задачи за период (см. Database.get_daily_schedules)
+        end: Последняя дата периода
+        stamp: Значение DTSTAMP
+        overrides: Записывать ли исключения из правила
+    """
+    uid = f"task-{task.id}@{UID_DOMAIN}"
+    first_day, last_day = schedule.first_day.date(), schedule.last_day.date()
+    start_time = schedule.start_time
+    exdates, moved, extras = [], [], []
+    if overrides and schedule.instances is not None:
+        exdates, moved, extras = recurrence_exceptions(task, first_day, last_day, start_time,
+                                                       schedule.instances)
+    
+    excluded = set(exdates)
+    limit = end if task.is_unlimited else last_day
+    first = _rule_day(task, first_day, 1, limit, excluded)
+    if first is not None:
+        rule_end = end if task.is_unlimited else _rule_day(task, last_day, -1, first, excluded)
+        byday = ','.join(WEEKDAY_CODES[day] for day in sorted(task.weekdays))
+        until = format_datetime(datetime.combine(rule_end, time(23, 59, 59)))
+        extra = [f"RRULE:FREQ=WEEKLY;BYDAY={byday};UNTIL={until}"]
+        exdates = [day for day in exdates if first <= day <= rule_end]
+        if exdates:
+            extra.append("EXDATE:" + ','.join(format_datetime(datetime.combine(day, start_time))
+                                              for day in exdates))
+        yield from _event_lines(uid, datetime.combine(first, start_time), False, task, stamp, extra)
+        
+        for original, instance in moved:
+            recurrence_id = _start_property("RECURRENCE-ID", datetime.combine(original, start_time), False)
+            yield from _event_lines(uid, _instance_start(instance), False, task, stamp, [recurrence_id])
+    else:
+        # Правило не дает дней - переносить экземпляры некуда
+        extras = sorted(extras + [instance for _, instance in moved],
+                        key=lambda instance: (instance.date, instance.start_time))
+    
+    for instance in extras:
+        yield from _event_lines(_instance_uid(task.id, instance), _instance_start(instance),
+                                False, task, stamp)
+
+def single_task_events(task: SingleTask, start: date, end: date, stamp: str) -> Iterator[str]:
+    """
+    Событие единоразовой задачи, не размещенной в распорядке, по ее дате
+    выполнения, если дата попадает в период.
+    """
+    if task.execution_date is None or not start <= task.execution_date.date() <= end:
+        return
+    all_day = task.scheduled_time is None and task.execution_date.time() == time()
+    event_start = task.execution_date
+    if task.scheduled_time:
+        event_start = datetime.combine(task.execution_date.date(), task.scheduled_time)
+    yield from _event_lines(f"task-{task.id}@{UID_DOMAIN}", event_start, all_day, task, stamp)
+
+def _write_event(f: TextIO, lines: Iterator[str]) -> bool:
+    """Запись строк события; True, если записана хотя бы одна строка."""
+    written = False
+    for line in lines:
+        f.write(fold_line(line))
+        written = True
+    return written
+
+def write_calendar(db: Database, f: TextIO, start: date, end: date, overrides: bool = True,
+                   progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Запись календаря в открытый файл.
+    
+    Ежедневные задачи записываются правилами, если они размещены в
+    распорядке. Единоразовые задачи записываются по своим экземплярам в
+    распорядке за период (один запрос по диапазону дат), не размещенные в
+    распорядке - по дате выполнения.
+    
+    Args:
+        db: База данных
+        f: Текстовый файл, открытый с newline=''
+        start: Первая дата периода
+        end: Последняя дата периода
+        overrides: Записывать ли исключения из правил ежедневных задач
+            (удаленные и перенесенные экземпляры)
+        progress: Функция, получающая количество обработанных задач
+    
+    Returns:
+        Количество записанных событий (без исключений)
+    """
+    stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+    start_dt, end_dt = datetime.combine(start, time()), datetime.combine(end, time())
+    schedules = db.get_daily_schedules(start_dt, end_dt)
+    
+    for line in ("BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"):
+        f.write(fold_line(line))
+    
+    events = 0
+    daily_ids = set()
+    for processed, task in enumerate(db.iter_tasks(), 1):
+        if isinstance(task, DailyTask):
+            daily_ids.add(task.id)
+            if task.id in schedules:
+                events += _write_event(f, daily_task_events(task, schedules[task.id], end, stamp,
+                                                            overrides))
+        if progress and processed % 10000 == 0:
+            progress(processed)
+    
+    seen = set()
+    for instance in db.iter_scheduled_tasks(start_dt, end_dt):
+        if instance.task_id in daily_ids:
+            continue
+        uid = (_instance_uid(instance.task_id, instance) if instance.task_id in seen
+               else f"task-{instance.task_id}@{UID_DOMAIN}")
+        seen.add(instance.task_id)
+        events += _write_event(f, _event_lines(uid, _instance_start(instance), False, instance, stamp))
+    
+    for task in db.get_unscheduled_tasks():
+        if isinstance(task, SingleTask):
+            events += _write_event(f, single_task_events(task, start, end, stamp))
+    
+    f.write(fold_line("END:VCALENDAR"))
+    return events
+
+def export_ical(db: Database, path: str, start: date, end: date, overrides: bool = True,
+                progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Экспорт расписания за период в файл .ics.
+    
+    Args:
+        db: База данных
+        path: Путь к файлу
+        start: Первая дата периода
+        end: Последняя дата периода
+        overrides: Записывать ли исключения из правил ежедневных задач
+            (удаленные и перенесенные экземпляры)
+        progress: Функция, получающая количество обработанных задач
+    
+    Returns:
+        Количество записанных событий
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        return write_calendar(db, f, start, end, overrides, progress)
+
+def main():
+    today = date.today()
+    parser = argparse.ArgumentParser(description="Экспорт расписания в iCalendar (.ics)")
+    parser.add_argument('path', help="Файл .ics")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--start', type=date.fromisoformat, default=today,
+                        help="Первая дата периода (ГГГГ-ММ-ДД), по умолчанию сегодня")
+    parser.add_argument('--end', type=date.fromisoformat, default=today + timedelta(days=365),
+                        help="Последняя дата периода (ГГГГ-ММ-ДД), по умолчанию через год")
+    parser.add_argument('--no-overrides', action='store_true',
+                        help="Не записывать удаленные и перенесенные экземпляры ежедневных задач")
+    args = parser.parse_args()
+    
+    events = export_ical(Database(args.db), args.path, args.start, args.end,
+                         overrides=not args.no_overrides)
+    print(f"{args.path}: событий {events}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
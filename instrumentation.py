@@ -0,0 +1,414 @@
+import inspect
+import re
+import sqlite3
+import time as timer
+from collections import deque, Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from database import Database
+
+@dataclass
+class StatementStats:
+    """
+    Накопленная статистика по одному SQL-оператору.
+    
+    Attributes:
+        sql: Текст оператора с нормализованными пробелами и ? вместо значений
+        count: Количество выполнений
+        total_ms: Суммарное время от начала оператора до следующего оператора
+            или завершения метода Database (включая выборку и разбор строк)
+    """
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+
+@dataclass
+class MethodStats:
+    """
+    Накопленная статистика по методу Database.
+    
+    Attributes:
+        name: Имя метода
+        calls: Количество вызовов
+        total_ms: Суммарное время выполнения
+        statements: Количество SQL-операторов, выполненных внутри метода
+    """
+    name: str
+    calls: int = 0
+    total_ms: float = 0.0
+    statements: int = 0
+
+@dataclass
+class SlowQuery:
+    """Пример медленного запроса."""
+    sql: str
+    params: tuple
+    duration_ms: float
+    method: Optional[str]
+
+@dataclass
+class ActionRecord:
+    """
+    Одно действие пользователя и выполненные за него запросы.
+    
+    Attributes:
+        name: Название действия
+        statements: Количество SQL-операторов
+        total_ms: Суммарное время SQL-операторов
+        methods: Методы Database, вызванные за действие
+        repeated: Операторы, повторенные не меньше порога N+1, и число повторов
+    """
+    name: str
+    statements: int = 0
+    total_ms: float = 0.0
+    methods: List[str] = field(default_factory=list)
+    repeated: Dict[str, int] = field(default_factory=dict)
+
+class StatementTracer:
+    """
+    Перехват SQL-операторов подключения через set_trace_callback.
+    
+    В отличие от подмены курсора видит все операторы подключения, в том числе
+    запросы собственных курсоров методов (iter_*) и executescript. SQLite
+    сообщает оператор с подставленными параметрами, executemany - по строкам.
+    В callback передаются только операторы приложения: программы триггеров,
+    вложенные и внутренние запросы SQLite и FTS5, управление транзакциями
+    пропускаются. У подключения может быть только один такой перехватчик.
+    """
+    
+    # Вложенные операторы (триггеры, виртуальные таблицы) сообщаются с префиксом
+    # «--», а внутренние запросы SQLite и FTS5 указывают схему в кавычках ('main'.)
+    INTERNAL_STATEMENT = re.compile(r"^\s*--|'\w+'\.")
+    # Служебные операторы транзакций
+    TRANSACTION_STATEMENTS = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+    # Операторы, которые могут запускать триггеры
+    WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+    
+    def __init__(self, conn: sqlite3.Connection, callback: Callable[[str], None]):
+        """
+        Args:
+            conn: Подключение SQLite
+            callback: Функция, получающая текст каждого оператора приложения
+        """
+        self.callback = callback
+        self._last_sql = None
+        conn.set_trace_callback(self._trace)
+    
+    def reset(self):
+        """Сброс последнего оператора: следующий такой же оператор снова передается."""
+        self._last_sql = None
+    
+    def _trace(self, sql: str):
+        if self.INTERNAL_STATEMENT.search(sql):
+            return
+        keyword = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+        if keyword in self.TRANSACTION_STATEMENTS:
+            return
+        # Программа триггера и ее операторы сообщаются текстом внешнего
+        # оператора сразу после него; повтор той же записи с теми же
+        # параметрами подряд от них неотличим и тоже пропускается
+        if keyword in self.WRITE_STATEMENTS and sql == self._last_sql:
+            return
+        self._last_sql = sql
+        self.callback(sql)
+
+@dataclass
+class _PendingStatement:
+    """Оператор, время которого еще учитывается."""
+    key: str
+    params: tuple
+    method: Optional[str]
+    action: ActionRecord
+    owner: Optional[object]
+    elapsed_ms: float = 0.0
+    running_since: Optional[float] = None
+    
+    def pause(self, now: float):
+        if self.running_since is not None:
+            self.elapsed_ms += (now - self.running_since) * 1000
+            self.running_since = None
+
+class QueryProfiler:
+    """
+    Opt-in профилировщик запросов к Database.
+    
+    Подключается к открытой базе методом attach: оборачивает публичные методы
+    экземпляра и перехватывает операторы его подключения (StatementTracer).
+    Собирает количество и время вызовов по методам и операторам, примеры
+    медленных запросов и группирует операторы по действиям пользователя для
+    поиска N+1: один и тот же оператор, выполненный много раз за одно действие.
+    
+    SQLite сообщает только начало оператора, поэтому время оператора считается
+    до начала следующего или до завершения внешнего метода Database (вместе с
+    выборкой и разбором строк); у генераторов iter_* - за все время их обхода
+    внутри генератора. Значения параметров заменяются в тексте
+    оператора на ?, чтобы одинаковые операторы с разными параметрами
+    учитывались вместе.
+    
+    Действие начинается явно (action/begin_action) или неявно, с первым
+    оператором вне действия. Неявное действие закрывается функцией action_closer
+    (в интерфейсе - при возврате в цикл событий Qt) либо по завершении
+    внешнего метода Database, если action_closer не задан.
+    """
+    
+    def __init__(self, slow_query_ms: float = 20.0, n_plus_one_threshold: int = 10,
+                 max_samples: int = 50, max_actions: int = 100):
+        """
+        Args:
+            slow_query_ms: Порог медленного запроса в миллисекундах
+            n_plus_one_threshold: Сколько повторов одного оператора за действие считать N+1
+            max_samples: Сколько примеров медленных запросов хранить
+            max_actions: Сколько последних действий хранить
+        """
+        self.slow_query_ms = slow_query_ms
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_samples = max_samples
+        self.max_actions = max_actions
+        self.action_closer: Optional[Callable[[], None]] = None
+        self.reset()
+    
+    def reset(self):
+        """Сброс всей накопленной статистики."""
+        self.statements: Dict[str, StatementStats] = {}
+        self.methods: Dict[str, MethodStats] = {}
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=self.max_samples)
+        self.actions: Deque[ActionRecord] = deque(maxlen=self.max_actions)
+        self.n_plus_one: Dict[str, int] = {}
+        self._method_stack: List[str] = []
+        self._current_action: Optional[ActionRecord] = None
+        self._action_counts: Counter = Counter()
+        self._implicit_action = False
+        self._pending: Optional[_PendingStatement] = None
+        # Обертка генератора, который сейчас продвигается
+        self._iterator: Optional[object] = None
+    
+    def attach(self, db: Database) -> Database:
+        """
+        Подключение профилировщика к базе данных.
+        
+        Args:
+            db: Открытая база данных
+        
+        Returns:
+            Та же база данных
+        """
+        self._tracer = StatementTracer(db.conn, self.record_statement)
+        for name in dir(Database):
+            if name.startswith('_') or not callable(getattr(Database, name)):
+                continue
+            setattr(db, name, self._wrap_method(name, getattr(db, name)))
+        db.profiler = self
+        return db
+    
+    def _wrap_method(self, name: str, method: Callable) -> Callable:
+        """Обертка метода Database с замером времени."""
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            stats = self.methods.setdefault(name, MethodStats(name))
+            self._method_stack.append(name)
+            begin = timer.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                end = timer.perf_counter()
+                stats.calls += 1
+                stats.total_ms += (end - begin) * 1000
+                self._leave_method(end)
+            # Запросы генератора (iter_*) выполняются при его обходе
+            if inspect.isgenerator(result):
+                return self._wrap_iterator(name, result)
+            return result
+        return wrapper
+    
+    def _wrap_iterator(self, name: str, iterator: Iterator) -> Iterator:
+        """Обход результата-генератора метода как продолжение вызова метода."""
+        stats = self.methods[name]
+        token = object()
+        while True:
+            self._method_stack.append(name)
+            outer_iterator, self._iterator = self._iterator, token
+            begin = timer.perf_counter()
+            # Оператор генератора продолжает выборку строк
+            pending = self._pending
+            if pending and pending.owner is token and pending.running_since is None:
+                pending.running_since = begin
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                end = timer.perf_counter()
+                stats.total_ms += (end - begin) * 1000
+                self._iterator = outer_iterator
+                self._leave_method(end)
+            yield item
+    
+    def _leave_method(self, now: float):
+        """Выход из метода Database; по завершении внешнего метода время его последнего оператора останавливается."""
+        self._method_stack.pop()
+        if not self._method_stack:
+            if self._pending:
+                self._pending.pause(now)
+            if self._implicit_action and self.action_closer is None:
+                self.end_action()
+    
+    # Строковые и числовые значения, подставленные SQLite вместо параметров
+    LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    
+    @classmethod
+    def normalize(cls, sql: str) -> Tuple[str, tuple]:
+        """
+        Нормализация оператора: пробелы схлопываются, значения заменяются на ?.
+        
+        Returns:
+            Текст оператора и значения в порядке появления
+        """
+        params = []
+        
+        def replace(match) -> str:
+            text = match.group()
+            if text.startswith("'"):
+                params.append(text[1:-1].replace("''", "'"))
+            else:
+                params.append(float(text) if '.' in text else int(text))
+            return '?'
+        
+        return cls.LITERAL.sub(replace, re.sub(r'\s+', ' ', sql).strip()), tuple(params)
+    
+    def record_statement(self, sql: str):
+        """
+        Учет начала оператора (вызывается StatementTracer); предыдущий
+        оператор при этом завершается.
+        
+        Args:
+            sql: Текст оператора с подставленными параметрами
+        """
+        self._finish_statement()
+        key, params = self.normalize(sql)
+        stats = self.statements.get(key)
+        if stats is None:
+            stats = self.statements[key] = StatementStats(key)
+        stats.count += 1
+        
+        method = self._method_stack[0] if self._method_stack else None
+        if method:
+            self.methods[method].statements += 1
+        
+        if self._current_action is None:
+            self._begin('SQL', implicit=True)
+        action = self._current_action
+        if method and method not in action.methods:
+            action.methods.append(method)
+        action.statements += 1
+        self._action_counts[key] += 1
+        self._pending = _PendingStatement(key, params, method, action, self._iterator,
+                                          running_since=timer.perf_counter())
+    
+    def _finish_statement(self):
+        """Учет времени последнего оператора."""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        pending.pause(timer.perf_counter())
+        self.statements[pending.key].total_ms += pending.elapsed_ms
+        pending.action.total_ms += pending.elapsed_ms
+        self._check_slow(pending.key, pending.params, pending.elapsed_ms, pending.method)
+    
+    def _check_slow(self, key: str, params, duration_ms: float, method: Optional[str]):
+        """Сохранение примера медленного запроса."""
+        if duration_ms >= self.slow_query_ms:
+            self.slow_queries.append(SlowQuery(key, tuple(params or ()), duration_ms, method))
+    
+    def _begin(self, name: str, implicit: bool):
+        """Начало нового действия."""
+        self._current_action = ActionRecord(name)
+        self._action_counts = Counter()
+        self._implicit_action = implicit
+        if implicit and self.action_closer:
+            self.action_closer()
+    
+    def begin_action(self, name: str):
+        """
+        Явное начало действия пользователя.
+        
+        Args:
+            name: Название действия
+        """
+        self.end_action()
+        self._begin(name, implicit=False)
+    
+    def end_action(self):
+        """Завершение текущего действия и поиск повторяющихся операторов."""
+        self._finish_statement()
+        action = self._current_action
+        if action is None:
+            return
+        if self._implicit_action and action.methods:
+            # Неявное действие называется по вызванным методам
+            action.name = ', '.join(action.methods)
+        self._current_action = None
+        self._implicit_action = False
+        
+        for key, count in self._action_counts.items():
+            if count >= self.n_plus_one_threshold:
+                action.repeated[key] = count
+                self.n_plus_one[key] = max(self.n_plus_one.get(key, 0), count)
+        self.actions.append(action)
+    
+    @contextmanager
+    def action(self, name: str):
+        """Контекстный менеджер для явного действия пользователя."""
+        self.begin_action(name)
+        try:
+            yield
+        finally:
+            self.end_action()
+    
+    def top_statements(self, limit: int = 20) -> List[StatementStats]:
+        """Операторы с наибольшим суммарным временем."""
+        return sorted(self.statements.values(), key=lambda s: s.total_ms, reverse=True)[:limit]
+    
+    def method_stats(self) -> List[MethodStats]:
+        """Методы Database, отсортированные по суммарному времени."""
+        return sorted(self.methods.values(), key=lambda m: m.total_ms, reverse=True)
+    
+    def total_statements(self) -> int:
+        """Общее количество выполненных операторов."""
+        return sum(stats.count for stats in self.statements.values())
+
+class StartupTimer:
+    """
+    Замер этапов запуска приложения.
+    Каждая отметка фиксирует время, прошедшее с предыдущей отметки.
+    """
+    
+    def __init__(self):
+        self.started = timer.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.started
+    
+    def mark(self, phase: str):
+        """
+        Завершение этапа запуска.
+        
+        Args:
+            phase: Название завершившегося этапа
+        """
+        now = timer.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+    
+    def total_ms(self) -> float:
+        """Время от создания таймера до последней отметки."""
+        return (self._last - self.started) * 1000
+    
+    def report(self) -> str:
+        """Таблица этапов запуска с длительностями."""
+        lines = ["Этапы запуска:"]
+        for phase, duration_ms in self.phases:
+            lines.append(f"  {phase:<36} {duration_ms:>9.1f} мс")
+        lines.append(f"  {'Итого':<36} {self.total_ms():>9.1f} мс")
+        return '\n'.join(lines)
\ No newline at end of file
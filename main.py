@@ -1,16 +1,70 @@
+import argparse
+import os
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import MainWindow
+from cli import COMMANDS
+from snapshot import DEFAULT_SNAPSHOT_PATH
 
 def main():
     """
     Точка входа в приложение.
-    Инициализирует главное окно и запускает event loop приложения.
+    Показывает заставку, инициализирует главное окно и запускает event loop
+    приложения. Заставка закрывается после загрузки начальных данных.
+    С --serve вместо окна запускается локальный HTTP/JSON API (server.py),
+    а если первый аргумент - команда cli.py (add, today и т.д.), выполняется
+    эта команда; PyQt6 в этих случаях не загружается.
     """
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        from cli import main as run_cli
+        sys.exit(run_cli(sys.argv[1:]))
+    
+    parser = argparse.ArgumentParser(description="Simple Planner")
+    parser.add_argument('--profile', action='store_true',
+                        default=bool(os.environ.get('PLANNER_PROFILE')),
+                        help="Профилирование запросов к базе (Вид → Производительность)")
+    parser.add_argument('--no-snapshot', action='store_true',
+                        help="Не использовать снимок состояния для быстрого запуска")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="Вывести длительность этапов запуска")
+    parser.add_argument('--serve', action='store_true',
+                        help="Запустить локальный HTTP/JSON API вместо окна")
+    parser.add_argument('--port', type=int, help="Порт API (с --serve)")
+    args, qt_args = parser.parse_known_args()
+    
+    if args.serve:
+        from server import DEFAULT_PORT, serve
+        serve(port=args.port or DEFAULT_PORT)
+        return
+    
+    from PyQt6.QtWidgets import QApplication
+    from ui.splash import SplashScreen
+    
+    startup = None
+    if args.startup_profile:
+        from instrumentation import StartupTimer
+        startup = StartupTimer()
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    if startup:
+        startup.mark("QApplication")
+    
+    splash = SplashScreen()
+    splash.show()
+    splash.set_progress("Создание окна", 0)
+    app.processEvents()
+    
+    # Модули интерфейса загружаются уже при показанной заставке
+    from ui.main_window import MainWindow
+    
+    profiler = None
+    if args.profile:
+        from instrumentation import QueryProfiler
+        profiler = QueryProfiler()
+    snapshot_path = None if args.no_snapshot else DEFAULT_SNAPSHOT_PATH
+    window = MainWindow(profiler=profiler, startup=startup, snapshot_path=snapshot_path)
+    window.loading_progress.connect(splash.set_progress)
+    window.loading_finished.connect(lambda: splash.finish(window))
     window.show()
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -1,13 +1,46 @@
 from dataclasses import dataclass, field
-from datetime import datetime, time
+from datetime import date, datetime, time
 from enum import Enum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 class TaskType(Enum):
     """Тип задачи: единоразовая или ежедневная"""
     SINGLE = "single"
     DAILY = "daily"
 
+class EditScope(Enum):
+    """Какие экземпляры повторяющейся задачи затрагивает изменение"""
+    OCCURRENCE = "occurrence"  # Только экземпляр на выбранную дату
+    FOLLOWING = "following"    # Экземпляр на выбранную дату и все последующие
+    ALL = "all"                # Все экземпляры
+
+def weekdays_to_mask(weekdays: List[int]) -> int:
+    """
+    Преобразование списка дней недели в 7-битную маску.
+    
+    Args:
+        weekdays: Список дней недели (0 = понедельник, 6 = воскресенье)
+    
+    Returns:
+        Битовая маска, в которой бит i соответствует дню недели i
+    """
+    mask = 0
+    for day in weekdays:
+        mask |= 1 << day
+    return mask
+
+def mask_to_weekdays(mask: int) -> List[int]:
+    """
+    Преобразование 7-битной маски в список дней недели.
+    
+    Args:
+        mask: Битовая маска дней недели
+    
+    Returns:
+        Отсортированный список дней недели
+    """
+    return [day for day in range(7) if mask & (1 << day)]
+
 @dataclass
 class Task:
     """
@@ -83,6 +116,15 @@ class DailyTask:
     is_unlimited: bool = False
     created_at: datetime = field(default_factory=datetime.now)
     task_type: TaskType = field(default=TaskType.DAILY, init=False)
+    
+    @property
+    def weekday_mask(self) -> int:
+        """Битовая маска дней недели."""
+        return weekdays_to_mask(self.weekdays)
+    
+    def occurs_on(self, day: date) -> bool:
+        """Проверяет, выполняется ли задача в указанный день."""
+        return bool(self.weekday_mask & (1 << day.weekday()))
 
 @dataclass
 class ScheduledTask:
@@ -104,4 +146,131 @@ class ScheduledTask:
     title: str
     duration_minutes: int
     description: Optional[str] = None
-    is_completed: bool = False 
\ No newline at end of file
+    is_completed: bool = False 
+
+@dataclass
+class DaySummary:
+    """
+    Итоги распорядка за день (см. Database.get_daily_summary).
+    
+    Attributes:
+        date: Дата
+        planned_count: Количество задач в распорядке
+        completed_count: Количество выполненных задач
+        planned_minutes: Запланированное время в минутах
+        completed_minutes: Время выполненных задач в минутах
+        daily_planned_count: Количество экземпляров ежедневных задач
+        daily_completed_count: Количество выполненных экземпляров ежедневных задач
+    """
+    date: datetime
+    planned_count: int = 0
+    completed_count: int = 0
+    planned_minutes: int = 0
+    completed_minutes: int = 0
+    daily_planned_count: int = 0
+    daily_completed_count: int = 0
+    
+    @property
+    def completion_rate(self) -> float:
+        """Доля выполненных задач (0, если задач нет)."""
+        return self.completed_count / self.planned_count if self.planned_count else 0.0
+
+@dataclass
+class DailySchedule:
+    """
+    Ежедневная задача в распорядке за период (см. Database.get_daily_schedules).
+    
+    Attributes:
+        task_id: ID ежедневной задачи
+        start_time: Время, с которым создаются экземпляры (daily_schedule)
+        first_day: Первый сверяемый с правилом день: не раньше начала периода
+            и создания задачи
+        last_day: Последний сверяемый день: не позже конца периода и дня,
+            по который создан распорядок
+        instances: Экземпляры задачи за период в порядке дат, если распорядок
+            расходится с правилом задачи; None, если совпадает
+    """
+    task_id: int
+    start_time: time
+    first_day: datetime
+    last_day: datetime
+    instances: Optional[List[ScheduledTask]] = None
+
+def task_to_dict(task: Union[SingleTask, DailyTask]) -> Dict[str, Any]:
+    """
+    Преобразование задачи в словарь из JSON-совместимых значений.
+    
+    Args:
+        task: Единоразовая или ежедневная задача
+    
+    Returns:
+        Словарь с полями задачи; даты и время в формате ISO 8601
+    """
+    data = {
+        'id': task.id,
+        'task_type': task.task_type.value,
+        'title': task.title,
+        'duration_minutes': task.duration_minutes,
+        'description': task.description,
+        'scheduled_time': task.scheduled_time.isoformat() if task.scheduled_time else None,
+        'is_completed': task.is_completed,
+        'created_at': task.created_at.isoformat(),
+    }
+    if isinstance(task, DailyTask):
+        data['weekdays'] = task.weekdays
+        data['is_unlimited'] = task.is_unlimited
+    else:
+        data['execution_date'] = task.execution_date.isoformat() if task.execution_date else None
+    return data
+
+def task_from_dict(data: Dict[str, Any]) -> Union[SingleTask, DailyTask]:
+    """
+    Создание задачи из словаря, полученного task_to_dict.
+    
+    Args:
+        data: Словарь с полями задачи
+    
+    Returns:
+        Единоразовая или ежедневная задача
+    """
+    common = dict(
+        title=data['title'],
+        duration_minutes=data['duration_minutes'],
+        description=data.get('description'),
+        scheduled_time=time.fromisoformat(data['scheduled_time']) if data.get('scheduled_time') else None,
+        id=data.get('id'),
+        is_completed=bool(data.get('is_completed', False)),
+    )
+    if data.get('created_at'):
+        common['created_at'] = datetime.fromisoformat(data['created_at'])
+    
+    if data.get('task_type', TaskType.SINGLE.value) == TaskType.DAILY.value:
+        return DailyTask(weekdays=list(data.get('weekdays', [])),
+                         is_unlimited=bool(data.get('is_unlimited', False)), **common)
+    execution_date = data.get('execution_date')
+    return SingleTask(execution_date=datetime.fromisoformat(execution_date) if execution_date else None,
+                      **common)
+
+def scheduled_task_to_dict(scheduled_task: ScheduledTask) -> Dict[str, Any]:
+    """Преобразование задачи из распорядка в словарь из JSON-совместимых значений."""
+    return {
+        'task_id': scheduled_task.task_id,
+        'date': scheduled_task.date.date().isoformat(),
+        'start_time': scheduled_task.start_time.isoformat(),
+        'title': scheduled_task.title,
+        'duration_minutes': scheduled_task.duration_minutes,
+        'description': scheduled_task.description,
+        'is_completed': scheduled_task.is_completed,
+    }
+
+def scheduled_task_from_dict(data: Dict[str, Any]) -> ScheduledTask:
+    """Создание задачи из распорядка из словаря, полученного scheduled_task_to_dict."""
+    return ScheduledTask(
+        task_id=data['task_id'],
+        date=datetime.fromisoformat(data['date']),
+        start_time=time.fromisoformat(data['start_time']),
+        title=data['title'],
+        duration_minutes=data['duration_minutes'],
+        description=data.get('description'),
+        is_completed=bool(data.get('is_completed', False))
+    )
\ No newline at end of file
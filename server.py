@@ -0,0 +1,463 @@
+"""
+Локальный HTTP/JSON API планировщика для скриптов и других клиентов.
+
+Сервер на asyncio обслуживает соединения на localhost и работает с той же
+базой, что и приложение:
+- чтение выполняется в пуле из READ_WORKERS потоков, у каждого потока свое
+  подключение; в режиме WAL чтения идут параллельно и не ждут записи;
+- запись выполняется одним подключением в отдельном потоке. Запросы на
+  запись, пришедшие, пока выполняется предыдущий пакет, собираются в пакет
+  до WRITE_BATCH_SIZE и фиксируются одной транзакцией (Database.batch).
+  Если запись из пакета завершилась ошибкой, пакет откатывается и записи
+  повторяются по одной, так что ошибку получает только ее запрос.
+
+Соединения HTTP/1.1 остаются открытыми между запросами (keep-alive).
+Тела запросов и ответов - JSON; задачи и распорядок в формате
+models.task_to_dict и models.scheduled_task_to_dict, даты ГГГГ-ММ-ДД.
+
+Маршруты:
+    GET    /version                       счетчик изменений данных
+    GET    /tasks[?q=текст]               все задачи или поиск
+    GET    /tasks/unscheduled             задачи вне распорядка
+    GET    /tasks/<id>
+    POST   /tasks                         создание задачи
+    PUT    /tasks/<id>                    изменение полей задачи
+    DELETE /tasks/<id>
+    POST   /tasks/<id>/complete           {"completed": true}
+    GET    /schedule?date=...             распорядок дня
+    GET    /schedule?start=...&end=...    распорядок за период
+    POST   /schedule                      {"task_id", "date", "start_time"}; ежедневная
+                                          задача - с сегодняшнего дня, без date
+    POST   /schedule/move                 {"task_id", "date", "new_date", "new_time"}
+    GET    /summary?start=...&end=...     итоги по дням
+
+Пример:
+    python main.py --serve
+    python server.py --db planner.db --port 8765
+    curl "localhost:8765/schedule?date=2026-10-19"
+"""
+import argparse
+import asyncio
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from database import Database
+from models import DailyTask, ScheduledTask, task_to_dict, task_from_dict, scheduled_task_to_dict
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Потоков (и подключений) для чтения
+READ_WORKERS = 4
+# Максимум записей, фиксируемых одной транзакцией
+WRITE_BATCH_SIZE = 100
+# Максимальный размер тела запроса, байт
+MAX_BODY_SIZE = 1024 * 1024
+# Максимальная длина периода в запросах распорядка и итогов, дней
+MAX_RANGE_DAYS = 366
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class ApiError(Exception):
+    """Ошибка запроса с кодом ответа HTTP."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _object(data: Any) -> Dict[str, Any]:
+    """Тело запроса - объект JSON (пустое тело - пустой объект)."""
+    if data is None:
+        return {}
+    if not isinstance(data, dict):
+        raise ApiError(400, "Тело запроса должно быть объектом JSON")
+    return data
+
+def _required(data: Optional[Dict[str, Any]], name: str) -> Any:
+    """Обязательное поле тела запроса или параметр строки запроса."""
+    if not isinstance(data, dict) or data.get(name) in (None, ''):
+        raise ApiError(400, f"Не указано поле {name}")
+    return data[name]
+
+def _date(data: Optional[Dict[str, Any]], name: str) -> datetime:
+    value = datetime.fromisoformat(_required(data, name))
+    return datetime.combine(value.date(), time())
+
+def _period(params: Dict[str, str]) -> Tuple[datetime, datetime]:
+    """Период start..end из строки запроса (не длиннее MAX_RANGE_DAYS)."""
+    start, end = _date(params, 'start'), _date(params, 'end')
+    if end < start:
+        raise ApiError(400, "Конец периода раньше начала")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ApiError(400, f"Период длиннее {MAX_RANGE_DAYS} дней")
+    return start, end
+
+def _boolean(data: Optional[Dict[str, Any]], name: str, default: bool) -> bool:
+    """Логическое поле тела запроса: только true или false JSON."""
+    value = _object(data).get(name, default)
+    if not isinstance(value, bool):
+        raise ApiError(400, f"Поле {name} должно быть true или false")
+    return value
+
+def _existing_task(db: Database, task_id: str):
+    task = db.get_task(int(task_id))
+    if task is None:
+        raise ApiError(404, f"Задача {task_id} не найдена")
+    return task
+
+# Обработчики маршрутов: вызываются в потоке чтения или записи с подключением
+# этого потока, параметрами строки запроса, телом запроса и группами пути
+
+def get_version(db: Database, params, data) -> dict:
+    return {'data_version': db.get_data_version()}
+
+def list_tasks(db: Database, params, data) -> List[dict]:
+    tasks = db.search_tasks(params['q']) if params.get('q') else db.get_all_tasks()
+    return [task_to_dict(task) for task in tasks]
+
+def list_unscheduled_tasks(db: Database, params, data) -> List[dict]:
+    return [task_to_dict(task) for task in db.get_unscheduled_tasks()]
+
+def get_task(db: Database, params, data, task_id: str) -> dict:
+    return task_to_dict(_existing_task(db, task_id))
+
+def create_task(db: Database, params, data) -> dict:
+    """Создание задачи; ежедневная задача со временем сразу размещается в распорядке."""
+    _required(data, 'title')
+    task = task_from_dict({**data, 'id': None})
+    if isinstance(task, DailyTask):
+        task_id = db.add_daily_task(task)
+        if task.scheduled_time:
+            db.schedule_daily_task(task_id, task.scheduled_time)
+    else:
+        task_id = db.add_single_task(task)
+    return {'id': task_id}
+
+def update_task(db: Database, params, data, task_id: str) -> dict:
+    """Изменение переданных полей задачи; тип задачи не меняется."""
+    current = task_to_dict(_existing_task(db, task_id))
+    changes = {key: value for key, value in _object(data).items() if key not in ('id', 'task_type')}
+    for name in ('is_completed', 'is_unlimited'):
+        if name in changes:
+            _boolean(changes, name, False)
+    task = task_from_dict({**current, **changes})
+    db.update_task(task)
+    return task_to_dict(task)
+
+def delete_task(db: Database, params, data, task_id: str) -> dict:
+    _existing_task(db, task_id)
+    db.remove_task(int(task_id))
+    return {'id': int(task_id)}
+
+def complete_task(db: Database, params, data, task_id: str) -> dict:
+    _existing_task(db, task_id)
+    completed = _boolean(data, 'completed', True)
+    db.mark_task_completed(int(task_id), completed)
+    return {'id': int(task_id), 'is_completed': completed}
+
+def get_schedule(db: Database, params, data) -> List[dict]:
+    if params.get('date'):
+        tasks = db.get_scheduled_tasks_for_date(_date(params, 'date'))
+    else:
+        tasks = db.iter_scheduled_tasks(*_period(params))
+    return [scheduled_task_to_dict(task) for task in tasks]
+
+def add_to_schedule(db: Database, params, data) -> dict:
+    """
+    Размещение задачи в распорядке. Ежедневная задача, как и в приложении,
+    размещается с сегодняшнего дня (Database.schedule_daily_task), date не нужен.
+    """
+    task = _existing_task(db, str(int(_required(data, 'task_id'))))
+    start_time = time.fromisoformat(_required(data, 'start_time'))
+    if isinstance(task, DailyTask):
+        return {'task_id': task.id, 'start_time': start_time.isoformat(),
+                'scheduled': db.schedule_daily_task(task.id, start_time)}
+    scheduled_task = ScheduledTask(task_id=task.id, date=_date(data, 'date'), start_time=start_time,
+                                   title=task.title, duration_minutes=task.duration_minutes,
+                                   description=task.description)
+    db.add_scheduled_task(scheduled_task)
+    return scheduled_task_to_dict(scheduled_task)
+
+def move_in_schedule(db: Database, params, data) -> dict:
+    task_id = int(_required(data, 'task_id'))
+    db.move_scheduled_task(task_id, _date(data, 'date'), _date(data, 'new_date'),
+                           time.fromisoformat(_required(data, 'new_time')))
+    return {'task_id': task_id}
+
+def get_summary(db: Database, params, data) -> List[dict]:
+    return [{**asdict(summary), 'date': summary.date.date().isoformat()}
+            for summary in db.get_daily_summary(*_period(params))]
+
+# Маршруты: метод, путь, обработчик, выполняется ли через подключение записи
+ROUTES: List[Tuple[str, re.Pattern, Callable, bool]] = [
+    ('GET', re.compile(r'/version'), get_version, False),
+    ('GET', re.compile(r'/tasks'), list_tasks, False),
+    ('POST', re.compile(r'/tasks'), create_task, True),
+    ('GET', re.compile(r'/tasks/unscheduled'), list_unscheduled_tasks, False),
+    ('GET', re.compile(r'/tasks/(\d+)'), get_task, False),
+    ('PUT', re.compile(r'/tasks/(\d+)'), update_task, True),
+    ('DELETE', re.compile(r'/tasks/(\d+)'), delete_task, True),
+    ('POST', re.compile(r'/tasks/(\d+)/complete'), complete_task, True),
+    ('GET', re.compile(r'/schedule'), get_schedule, False),
+    ('POST', re.compile(r'/schedule'), add_to_schedule, True),
+    ('POST', re.compile(r'/schedule/move'), move_in_schedule, True),
+    ('GET', re.compile(r'/summary'), get_summary, False),
+]
+
+class PlannerServer:
+    """
+    HTTP-сервер API: разбор запросов в цикле asyncio, чтение в пуле
+    потоков, запись пакетами через одно подключение (см. описание модуля).
+    """
+
+    def __init__(self, db_path: str = 'planner.db', host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT, read_workers: int = READ_WORKERS):
+        """
+        Args:
+            db_path: Файл базы данных
+            host: Адрес, на котором принимаются соединения
+            port: Порт (0 - любой свободный)
+            read_workers: Потоков для чтения
+        """
+        self.db_path = db_path
+        self.host = host
+        self.port = port
+        self.local = threading.local()
+        # Подключение записи создается в своем потоке первым и применяет миграции
+        self.write_executor = ThreadPoolExecutor(1, thread_name_prefix='planner-write',
+                                                 initializer=self._open_database)
+        self.write_executor.submit(lambda: None).result()
+        self.read_executor = ThreadPoolExecutor(read_workers, thread_name_prefix='planner-read',
+                                                initializer=self._open_database)
+        # Все потоки чтения запускаются сразу: пул больше не создает новых,
+        # и close() может закрыть подключение каждого в его потоке
+        self.read_workers = read_workers
+        self._run_on_each_thread(self.read_executor, read_workers, lambda: None)
+        self.write_queue: Optional[asyncio.Queue] = None
+        self.write_task: Optional[asyncio.Task] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        # Счетчики для замеров: запросы, записи и транзакции записи
+        self.stats = {'requests': 0, 'writes': 0, 'write_batches': 0}
+
+    def _open_database(self):
+        """Подключение к базе для текущего потока пула."""
+        self.local.db = Database(self.db_path)
+
+    def _close_database(self):
+        """Закрытие подключения текущего потока пула (SQLite требует закрывать его в этом потоке)."""
+        self.local.db.close()
+    
+    @staticmethod
+    def _run_on_each_thread(executor: ThreadPoolExecutor, workers: int, function: Callable[[], None]):
+        """
+        Выполнение function по одному разу в каждом из workers потоков пула:
+        поток, выполнивший функцию, ждет остальных и не берет вторую задачу.
+        """
+        barrier = threading.Barrier(workers)
+        
+        def run():
+            try:
+                function()
+            finally:
+                barrier.wait()
+        
+        for future in [executor.submit(run) for _ in range(workers)]:
+            future.result()
+    
+    def _run_read(self, handler: Callable, args: tuple):
+        return handler(self.local.db, *args)
+
+    def _run_writes(self, writes: List[Tuple[Callable, tuple]]) -> List[Tuple[Any, Optional[Exception]]]:
+        """
+        Выполнение пакета записей одной транзакцией.
+
+        Returns:
+            Пары (результат, исключение) в порядке записей
+        """
+        db = self.local.db
+        self.stats['write_batches'] += 1
+        try:
+            with db.batch():
+                return [(handler(db, *args), None) for handler, args in writes]
+        except Exception:
+            if len(writes) == 1:
+                raise
+        # Одна из записей не выполнилась: пакет откатан, записи повторяются по одной
+        outcomes = []
+        for handler, args in writes:
+            try:
+                with db.batch():
+                    outcomes.append((handler(db, *args), None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    async def _write_loop(self):
+        """Сбор ожидающих записей в пакеты и их выполнение в потоке записи."""
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await self.write_queue.get()]
+            while len(pending) < WRITE_BATCH_SIZE and not self.write_queue.empty():
+                pending.append(self.write_queue.get_nowait())
+            writes = [(handler, args) for handler, args, _ in pending]
+            self.stats['writes'] += len(writes)
+            try:
+                outcomes = await loop.run_in_executor(self.write_executor, self._run_writes, writes)
+            except Exception as e:
+                outcomes = [(None, e)]
+            for (_, _, future), (result, error) in zip(pending, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    async def _call(self, handler: Callable, writes: bool, args: tuple):
+        """Выполнение обработчика в потоке чтения или в очереди записи."""
+        loop = asyncio.get_running_loop()
+        if not writes:
+            return await loop.run_in_executor(self.read_executor, self._run_read, handler, args)
+        future = loop.create_future()
+        await self.write_queue.put((handler, args, future))
+        return await future
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        """Ответ на запрос: код HTTP и данные для JSON."""
+        url = urlsplit(target)
+        path = url.path.rstrip('/') or '/'
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        path_found = False
+        for route_method, pattern, handler, writes in ROUTES:
+            match = pattern.fullmatch(path)
+            if not match:
+                continue
+            path_found = True
+            if route_method != method:
+                continue
+            try:
+                data = json.loads(body) if body else None
+                return 200, await self._call(handler, writes, (params, data, *match.groups()))
+            except ApiError as e:
+                return e.status, {'error': str(e)}
+            except (ValueError, TypeError, KeyError) as e:
+                return 400, {'error': f"Некорректный запрос: {e}"}
+            except Exception as e:
+                return 500, {'error': str(e)}
+        if path_found:
+            return 405, {'error': f"Метод {method} не поддерживается для {path}"}
+        return 404, {'error': f"Нет маршрута {path}"}
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str], bytes]]:
+        """
+        Чтение одного запроса из соединения.
+
+        Returns:
+            (метод, путь, версия HTTP, заголовки, тело) или None, если клиент закрыл соединение
+        """
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise ApiError(400, "Некорректная строка запроса")
+        method, target, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get('content-length', 0))
+        if length > MAX_BODY_SIZE:
+            raise ApiError(413, "Слишком большое тело запроса")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), target, version, headers, body
+
+    @staticmethod
+    def _write_response(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обслуживание соединения: запросы обрабатываются по очереди до закрытия."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ApiError as e:
+                    self._write_response(writer, e.status, {'error': str(e)}, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, version, headers, body = request
+                self.stats['requests'] += 1
+                status, payload = await self._dispatch(method, target, body)
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Запуск сервера в текущем цикле asyncio; self.port - фактический порт."""
+        self.write_queue = asyncio.Queue()
+        self.write_task = asyncio.create_task(self._write_loop())
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    def close(self):
+        """Остановка приема соединений и потоков; подключения закрываются в своих потоках."""
+        if self.server:
+            self.server.close()
+            self.write_task.cancel()
+        self._run_on_each_thread(self.read_executor, self.read_workers, self._close_database)
+        self._run_on_each_thread(self.write_executor, 1, self._close_database)
+        self.read_executor.shutdown()
+        self.write_executor.shutdown()
+
+def serve(db_path: str = 'planner.db', host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+          read_workers: int = READ_WORKERS):
+    """Запуск сервера до прерывания (Ctrl+C)."""
+    server = PlannerServer(db_path, host, port, read_workers)
+
+    async def run():
+        await server.start()
+        print(f"API планировщика: http://{server.host}:{server.port} (база {db_path})")
+        async with server.server:
+            await server.server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный HTTP/JSON API планировщика")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Адрес (по умолчанию только localhost)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Порт")
+    parser.add_argument('--workers', type=int, default=READ_WORKERS, help="Потоков для чтения")
+    args = parser.parse_args()
+    serve(args.db, args.host, args.port, args.workers)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
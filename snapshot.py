@@ -0,0 +1,95 @@
+"""
+Снимок состояния календаря для мгновенного холодного старта.
+
+При закрытии приложения сохраняются распорядок на сегодня, список доступных
+задач и счетчик изменений данных (Database.get_data_version). При следующем
+запуске окно сразу отрисовывается по снимку, а база данных открывается и
+сверяется со снимком уже после первой отрисовки.
+"""
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Union
+from models import (SingleTask, DailyTask, ScheduledTask, task_to_dict, task_from_dict,
+                    scheduled_task_to_dict, scheduled_task_from_dict)
+
+DEFAULT_SNAPSHOT_PATH = "planner.snapshot.json"
+
+# Версия формата файла; снимок другой версии игнорируется
+SNAPSHOT_FORMAT = 1
+
+# Сколько доступных задач сохраняется в снимке. Остальные подгружаются из
+# базы после первой отрисовки, так что размер снимка не зависит от базы.
+AVAILABLE_TASKS_LIMIT = 100
+
+@dataclass
+class Snapshot:
+    """
+    Сохраненное состояние календаря.
+    
+    Attributes:
+        data_version: Счетчик изменений данных на момент сохранения
+        date: Дата распорядка
+        scheduled_tasks: Распорядок на дату
+        available_tasks: Начало списка доступных (не размещенных в распорядке) задач
+        available_count: Полная длина списка доступных задач
+    """
+    data_version: int
+    date: datetime
+    scheduled_tasks: List[ScheduledTask]
+    available_tasks: List[Union[SingleTask, DailyTask]]
+    available_count: int
+    
+    @property
+    def is_partial(self) -> bool:
+        """Сохранена ли только часть списка доступных задач."""
+        return len(self.available_tasks) < self.available_count
+
+def save_snapshot(path: str, snapshot: Snapshot):
+    """
+    Сохранение снимка. Файл записывается во временный и затем подменяется,
+    чтобы при сбое не остался недописанный снимок.
+    
+    Args:
+        path: Путь к файлу снимка
+        snapshot: Снимок
+    """
+    data = {
+        'format': SNAPSHOT_FORMAT,
+        'data_version': snapshot.data_version,
+        'date': snapshot.date.date().isoformat(),
+        'scheduled_tasks': [scheduled_task_to_dict(task) for task in snapshot.scheduled_tasks],
+        'available_tasks': [task_to_dict(task)
+                            for task in snapshot.available_tasks[:AVAILABLE_TASKS_LIMIT]],
+        'available_count': snapshot.available_count,
+    }
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+def load_snapshot(path: str) -> Optional[Snapshot]:
+    """
+    Загрузка снимка.
+    
+    Args:
+        path: Путь к файлу снимка
+    
+    Returns:
+        Снимок или None, если файла нет, он поврежден или другого формата
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != SNAPSHOT_FORMAT:
+            return None
+        return Snapshot(
+            data_version=data['data_version'],
+            date=datetime.fromisoformat(data['date']),
+            scheduled_tasks=[scheduled_task_from_dict(task) for task in data['scheduled_tasks']],
+            available_tasks=[task_from_dict(task) for task in data['available_tasks']],
+            available_count=data['available_count'],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Генератор синтетической базы данных планировщика.
+
+Создает planner.db с заданным количеством единоразовых и ежедневных задач
+и размещенных в распорядке экземпляров. Данные детерминированы: при одинаковых
+параметрах и seed получается одна и та же база, что позволяет сравнивать
+замеры производительности между коммитами.
+
+Пример:
+    python -m tools.generate_db bench.db --single 10000 --daily 1000 --scheduled 100000
+"""
+import argparse
+import os
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+from models import TaskType
+
+# Словарь для названий и описаний; частоты слов убывают по закону Ципфа
+WORDS = (
+    "план отчет встреча звонок спорт чтение уборка код ревью почта покупки обед "
+    "проект дизайн тест релиз бег йога английский врач бюджет презентация курс "
+    "прогулка ремонт договор клиент задача заметки семья книга сон вода зарядка "
+    "анализ документация команда интервью квартал стратегия сервер база данные"
+).split()
+WORD_WEIGHTS = [1 / (rank + 1) for rank in range(len(WORDS))]
+
+BATCH_SIZE = 10000
+
+def _text(rng: random.Random, words: int) -> str:
+    """Случайная фраза из словаря."""
+    return ' '.join(rng.choices(WORDS, WORD_WEIGHTS, k=words))
+
+def _quarter_time(rng: random.Random) -> time:
+    """Случайное время начала в пределах 6:00-22:45 с шагом 15 минут."""
+    return time(rng.randint(6, 22), rng.choice((0, 15, 30, 45)))
+
+def _batched(rows: Iterator[Tuple], size: int = BATCH_SIZE) -> Iterator[list]:
+    """Разбиение потока строк на пачки для executemany."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def generate_database(path: str, single_count: int, daily_count: int,
+                      scheduled_count: int, seed: int = 42,
+                      today: Optional[date] = None) -> dict:
+    """
+    Создание синтетической базы данных.
+    
+    Args:
+        path: Путь к создаваемому файлу (существующий файл перезаписывается)
+        single_count: Количество единоразовых задач
+        daily_count: Количество ежедневных задач
+        scheduled_count: Количество экземпляров ежедневных задач в распорядке
+        seed: Зерно генератора случайных чисел
+        today: Опорная дата (по умолчанию текущая)
+    
+    Returns:
+        Словарь с фактическим количеством созданных записей
+    """
+    # Вместе с файлом удаляются журнал WAL и его индекс: иначе SQLite
+    # применит старый журнал к новой базе
+    for stale in (path, path + '-wal', path + '-shm'):
+        if os.path.exists(stale):
+            os.remove(stale)
+    
+    rng = random.Random(seed)
+    today = today or date.today()
+    created_at = datetime.combine(today - timedelta(days=365), time(9, 0)).isoformat()
+    
+    db = Database(path)
+    cursor = db.cursor
+    
+    # Единоразовые задачи: дата выполнения в пределах года вокруг опорной даты,
+    # половина из них уже размещена в распорядке
+    scheduled_singles = 0
+    for index in range(single_count):
+        execution_date = datetime.combine(today + timedelta(days=rng.randint(-180, 180)),
+                                          _quarter_time(rng))
+        start = execution_date.time().isoformat()
+        cursor.execute(
+            '''INSERT INTO tasks (title, duration_minutes, description, scheduled_time,
+                                  task_type, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (_text(rng, 3), rng.choice((15, 30, 45, 60, 90)), _text(rng, 8),
+             start, TaskType.SINGLE.value, created_at)
+        )
+        task_id = cursor.lastrowid
+        cursor.execute(
+            'INSERT INTO single_tasks (task_id, execution_date) VALUES (?, ?)',
+            (task_id, execution_date.isoformat())
+        )
+        if rng.random() < 0.5:
+            cursor.execute(
+                'INSERT INTO scheduled_tasks (task_id, date, start_time, is_completed) '
+                'VALUES (?, ?, ?, ?)',
+                (task_id, execution_date.date().isoformat(), start,
+                 execution_date.date() < today and rng.random() < 0.7)
+            )
+            scheduled_singles += 1
+        if index % BATCH_SIZE == BATCH_SIZE - 1:
+            db.conn.commit()
+    db.conn.commit()
+    
+    # Ежедневные задачи
+    daily = []
+    for _ in range(daily_count):
+        mask = rng.randint(1, 127)
+        start = _quarter_time(rng)
+        cursor.execute(
+            '''INSERT INTO tasks (title, duration_minutes, description, scheduled_time,
+                                  task_type, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (_text(rng, 2), rng.choice((15, 30, 60)), _text(rng, 6),
+             start.isoformat(), TaskType.DAILY.value, created_at)
+        )
+        task_id = cursor.lastrowid
+        cursor.execute(
+            'INSERT INTO daily_tasks (task_id, weekdays, is_unlimited) VALUES (?, ?, ?)',
+            (task_id, mask, False)
+        )
+        daily.append((task_id, mask, start.isoformat()))
+    db.conn.commit()
+    
+    # Экземпляры ежедневных задач: от опорной даты + 30 дней назад в прошлое,
+    # пока не наберется нужное количество
+    def instances() -> Iterator[Tuple]:
+        if not daily:
+            return
+        produced = 0
+        day = today + timedelta(days=30)
+        while produced < scheduled_count:
+            bit = 1 << day.weekday()
+            for task_id, mask, start in daily:
+                if mask & bit:
+                    yield (task_id, day.isoformat(), start,
+                           day < today and rng.random() < 0.7)
+                    produced += 1
+                    if produced >= scheduled_count:
+                        return
+            day -= timedelta(days=1)
+    
+    scheduled_daily = 0
+    for batch in _batched(instances()):
+        cursor.executemany(
+            'INSERT INTO scheduled_tasks (task_id, date, start_time, is_completed) '
+            'VALUES (?, ?, ?, ?)',
+            batch
+        )
+        scheduled_daily += len(batch)
+        db.conn.commit()
+    
+    # Ежедневные задачи размещены в распорядке по последний экземпляр,
+    # дальше их продлевает materialize_daily_tasks
+    cursor.execute('''
+        INSERT INTO daily_schedule (task_id, start_time, scheduled_until)
+        SELECT st.task_id, st.start_time, MAX(st.date)
+        FROM scheduled_tasks st
+        JOIN daily_tasks d ON d.task_id = st.task_id
+        GROUP BY st.task_id
+    ''')
+    db.conn.commit()
+    
+    cursor.execute('ANALYZE')
+    db.conn.commit()
+    db.conn.close()
+    
+    return {
+        'single_tasks': single_count,
+        'daily_tasks': daily_count,
+        'scheduled_tasks': scheduled_singles + scheduled_daily,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетической базы planner.db")
+    parser.add_argument('path', nargs='?', default='planner.db', help="Путь к файлу базы данных")
+    parser.add_argument('--single', type=int, default=1000, help="Количество единоразовых задач")
+    parser.add_argument('--daily', type=int, default=100, help="Количество ежедневных задач")
+    parser.add_argument('--scheduled', type=int, default=10000,
+                        help="Количество экземпляров ежедневных задач в распорядке")
+    parser.add_argument('--seed', type=int, default=42, help="Зерно генератора")
+    args = parser.parse_args()
+    
+    counts = generate_database(args.path, args.single, args.daily, args.scheduled, args.seed)
+    print(f"{args.path}: " + ', '.join(f"{name}={count}" for name, count in counts.items()))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""
+Потоковый импорт и экспорт задач в форматах CSV и JSON Lines.
+
+Записи читаются и пишутся генераторами по одной, поэтому объем памяти не
+зависит от размера файла (кроме таблицы соответствия ID задач при импорте).
+Импорт выполняется пакетами в одной транзакции (Database.batch) вместо
+фиксации каждой строки.
+
+Файл содержит записи двух видов: задачи (record = "task") и экземпляры
+распорядка (record = "scheduled"). Экспорт пишет сначала все задачи, затем
+распорядок; при импорте task_id экземпляров распорядка переводится в ID
+созданных задач.
+
+Пример:
+    python transfer.py export tasks.jsonl
+    python transfer.py import tasks.csv
+"""
+import argparse
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+from database import Database
+from models import (SingleTask, DailyTask, ScheduledTask, task_to_dict, task_from_dict,
+                    scheduled_task_to_dict, scheduled_task_from_dict)
+
+TASK_RECORD = 'task'
+SCHEDULED_RECORD = 'scheduled'
+
+# Колонки CSV: объединение полей задач и экземпляров распорядка
+CSV_COLUMNS = [
+    'record', 'id', 'task_type', 'title', 'duration_minutes', 'description',
+    'scheduled_time', 'is_completed', 'created_at', 'execution_date', 'weekdays',
+    'is_unlimited', 'task_id', 'date', 'start_time',
+]
+
+# Числовые и логические колонки CSV, которые при чтении приводятся к типам
+CSV_INT_COLUMNS = {'id', 'duration_minutes', 'task_id'}
+CSV_BOOL_COLUMNS = {'is_completed', 'is_unlimited'}
+
+BATCH_SIZE = 10000
+
+Record = Tuple[str, Union[SingleTask, DailyTask, ScheduledTask]]
+
+def detect_format(path: str) -> str:
+    """Формат файла по расширению: csv или jsonl."""
+    return 'csv' if os.path.splitext(path)[1].lower() == '.csv' else 'jsonl'
+
+def _record_to_dict(kind: str, item) -> Dict[str, Any]:
+    """Словарь записи с полем record."""
+    data = task_to_dict(item) if kind == TASK_RECORD else scheduled_task_to_dict(item)
+    return {'record': kind, **data}
+
+def _record_from_dict(data: Dict[str, Any]) -> Record:
+    """Запись из словаря с полем record."""
+    kind = data.get('record', TASK_RECORD)
+    if kind == SCHEDULED_RECORD:
+        return kind, scheduled_task_from_dict(data)
+    if kind == TASK_RECORD:
+        return kind, task_from_dict(data)
+    raise ValueError(f"Неизвестный вид записи: {kind}")
+
+def _csv_row(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Значения записи для CSV: списки через запятую, логические как 0/1."""
+    row = {}
+    for column in CSV_COLUMNS:
+        value = data.get(column)
+        if isinstance(value, bool):
+            value = int(value)
+        elif isinstance(value, list):
+            value = ','.join(str(item) for item in value)
+        row[column] = '' if value is None else value
+    return row
+
+def _csv_values(row: Dict[str, str]) -> Dict[str, Any]:
+    """Приведение строки CSV к значениям словаря записи."""
+    data = {}
+    for column, value in row.items():
+        if value in ('', None):
+            data[column] = None
+        elif column in CSV_INT_COLUMNS:
+            data[column] = int(value)
+        elif column in CSV_BOOL_COLUMNS:
+            data[column] = value.strip().lower() in ('1', 'true', 'yes')
+        elif column == 'weekdays':
+            data[column] = [int(day) for day in value.split(',') if day.strip()]
+        else:
+            data[column] = value
+    return data
+
+def read_records(path: str, fmt: Optional[str] = None) -> Iterator[Record]:
+    """
+    Потоковое чтение записей из файла.
+    
+    Args:
+        path: Путь к файлу
+        fmt: Формат (csv или jsonl), по умолчанию по расширению
+    
+    Yields:
+        Пары (вид записи, задача или экземпляр распорядка)
+    """
+    fmt = fmt or detect_format(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                yield _record_from_dict(_csv_values(row))
+        else:
+            for line in f:
+                if line.strip():
+                    yield _record_from_dict(json.loads(line))
+
+def write_records(path: str, records: Iterable[Record], fmt: Optional[str] = None,
+                  progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Потоковая запись записей в файл.
+    
+    Args:
+        path: Путь к файлу
+        records: Пары (вид записи, задача или экземпляр распорядка)
+        fmt: Формат (csv или jsonl), по умолчанию по расширению
+        progress: Функция, получающая количество записанных записей
+    
+    Returns:
+        Количество записанных записей
+    """
+    fmt = fmt or detect_format(path)
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = None
+        if fmt == 'csv':
+            writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+            writer.writeheader()
+        for kind, item in records:
+            data = _record_to_dict(kind, item)
+            if writer:
+                writer.writerow(_csv_row(data))
+            else:
+                f.write(json.dumps(data, ensure_ascii=False) + '\n')
+            count += 1
+            if progress and count % BATCH_SIZE == 0:
+                progress(count)
+    if progress:
+        progress(count)
+    return count
+
+def export_records(db: Database, start: datetime = None,
+                   end: datetime = None) -> Iterator[Record]:
+    """Все задачи, затем распорядок за период (по умолчанию весь)."""
+    for task in db.iter_tasks():
+        yield TASK_RECORD, task
+    for scheduled_task in db.iter_scheduled_tasks(start, end):
+        yield SCHEDULED_RECORD, scheduled_task
+
+def export_tasks(db: Database, path: str, fmt: Optional[str] = None,
+                 start: datetime = None, end: datetime = None,
+                 progress: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Экспорт задач и распорядка в файл.
+    
+    Args:
+        db: База данных
+        path: Путь к файлу
+        fmt: Формат (csv или jsonl), по умолчанию по расширению
+        start: Первая дата распорядка (включительно)
+        end: Последняя дата распорядка (включительно)
+        progress: Функция, получающая количество записанных записей
+    
+    Returns:
+        Количество записанных записей
+    """
+    return write_records(path, export_records(db, start, end), fmt, progress)
+
+def import_records(db: Database, records: Iterable[Record], batch_size: int = BATCH_SIZE,
+                   progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    Импорт записей пакетами по batch_size записей в одной транзакции.
+    Задачи получают новые ID; ссылки распорядка на задачи из того же потока
+    переводятся в новые ID, остальные должны ссылаться на задачи в базе.
+    
+    Args:
+        db: База данных
+        records: Пары (вид записи, задача или экземпляр распорядка)
+        batch_size: Количество записей в одной транзакции
+        progress: Функция, получающая количество обработанных записей
+    
+    Returns:
+        Количество импортированных задач, экземпляров распорядка и
+        пропущенных записей распорядка с неизвестной задачей
+    """
+    counts = {'tasks': 0, 'scheduled_tasks': 0, 'skipped': 0}
+    id_map: Dict[int, int] = {}
+    processed = 0
+    records = iter(records)
+    
+    while True:
+        with db.batch():
+            for kind, item in records:
+                if kind == TASK_RECORD:
+                    if isinstance(item, DailyTask):
+                        new_id = db.add_daily_task(item)
+                    else:
+                        new_id = db.add_single_task(item)
+                    if item.is_completed:
+                        db.mark_task_completed(new_id)
+                    if item.id is not None:
+                        id_map[item.id] = new_id
+                    counts['tasks'] += 1
+                else:
+                    task_id = id_map.get(item.task_id)
+                    if task_id is None and not db.get_task(item.task_id):
+                        counts['skipped'] += 1
+                    else:
+                        item.task_id = task_id or item.task_id
+                        db.add_scheduled_task(item)
+                        counts['scheduled_tasks'] += 1
+                processed += 1
+                if processed % batch_size == 0:
+                    break
+            else:
+                break
+        if progress:
+            progress(processed)
+    
+    if progress:
+        progress(processed)
+    return counts
+
+def import_tasks(db: Database, path: str, fmt: Optional[str] = None,
+                 batch_size: int = BATCH_SIZE,
+                 progress: Optional[Callable[[int], None]] = None) -> Dict[str, int]:
+    """
+    Импорт задач и распорядка из файла (см. import_records).
+    
+    Args:
+        db: База данных
+        path: Путь к файлу
+        fmt: Формат (csv или jsonl), по умолчанию по расширению
+        batch_size: Количество записей в одной транзакции
+        progress: Функция, получающая количество обработанных записей
+    
+    Returns:
+        Количество импортированных и пропущенных записей
+    """
+    return import_records(db, read_records(path, fmt), batch_size, progress)
+
+def main():
+    parser = argparse.ArgumentParser(description="Импорт и экспорт задач (CSV / JSON Lines)")
+    parser.add_argument('command', choices=('import', 'export'), help="Действие")
+    parser.add_argument('path', help="Файл .csv или .jsonl")
+    parser.add_argument('--db', default='planner.db', help="Файл базы данных")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Формат (по умолчанию по расширению)")
+    parser.add_argument('--start', type=datetime.fromisoformat, help="Экспорт распорядка с даты (ГГГГ-ММ-ДД)")
+    parser.add_argument('--end', type=datetime.fromisoformat, help="Экспорт распорядка по дату (ГГГГ-ММ-ДД)")
+    args = parser.parse_args()
+    
+    db = Database(args.db)
+    report = lambda count: print(f"\r{count} записей", end='', flush=True)
+    if args.command == 'export':
+        export_tasks(db, args.path, args.format, args.start, args.end, report)
+        print()
+    else:
+        counts = import_tasks(db, args.path, args.format, progress=report)
+        print('\n' + ', '.join(f"{name}={count}" for name, count in counts.items()))
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
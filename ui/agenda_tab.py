@@ -0,0 +1,250 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, QPushButton,
+                             QStyledItemDelegate, QStyle, QAbstractItemView)
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QFont, QPen
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from typing import Dict, List, Tuple
+from database import Database
+from models import ScheduledTask
+
+MONTH_NAMES = ("января", "февраля", "марта", "апреля", "мая", "июня", "июля",
+               "августа", "сентября", "октября", "ноября", "декабря")
+WEEKDAY_NAMES = ("Понедельник", "Вторник", "Среда", "Четверг", "Пятница", "Суббота",
+                 "Воскресенье")
+
+# Роль модели с кратким распорядком дня: (количество задач, первые задачи)
+TasksRole = Qt.ItemDataRole.UserRole + 1
+# Роль модели с датой дня
+DateRole = Qt.ItemDataRole.UserRole + 2
+
+class AgendaModel(QAbstractListModel):
+    """
+    Модель повестки: одна строка на каждый день.
+
+    Распорядок читается окнами по WINDOW_DAYS дней одним запросом за период
+    (Database.get_agenda_days) при первом обращении к дню окна, то есть
+    только для видимых строк. В памяти хранится не больше MAX_WINDOWS
+    последних использованных окон, более старые вытесняются, поэтому
+    прокрутка за год не накапливает распорядок. Список начинается с первого
+    дня распорядка (но не позже чем за год до сегодняшнего дня) и
+    продлевается в будущее по мере прокрутки (fetchMore).
+    """
+
+    WINDOW_DAYS = 14
+    MAX_WINDOWS = 12
+    FETCH_DAYS = 365
+    TASKS_PER_DAY = 3
+
+    def __init__(self, db: Database, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.first_date = None
+        self.day_count = 0
+        # Номер окна -> {дата: (количество задач, первые задачи)}
+        self.windows: OrderedDict[int, Dict[datetime, Tuple[int, List[ScheduledTask]]]] = OrderedDict()
+        self.data_version = None
+
+    def load(self):
+        """Построение списка дней и сброс загруженных окон."""
+        today = datetime.combine(datetime.now().date(), time())
+        first_date = today - timedelta(days=self.FETCH_DAYS)
+        date_range = self.db.get_scheduled_date_range()
+        if date_range is not None:
+            first_date = min(first_date, date_range[0])
+
+        self.beginResetModel()
+        self.first_date = first_date
+        self.day_count = (today - first_date).days + self.FETCH_DAYS + 1
+        self.windows.clear()
+        self.data_version = self.db.get_data_version()
+        self.endResetModel()
+
+    def refresh(self):
+        """Сброс загруженных окон, если данные изменились с момента загрузки."""
+        version = self.db.get_data_version()
+        if version == self.data_version:
+            return
+        self.data_version = version
+        self.windows.clear()
+        if self.day_count:
+            self.dataChanged.emit(self.index(0), self.index(self.day_count - 1))
+
+    def date_at(self, row: int) -> datetime:
+        return self.first_date + timedelta(days=row)
+
+    def row_for_date(self, date: datetime) -> int:
+        return (datetime.combine(date.date(), time()) - self.first_date).days
+
+    def _window(self, number: int) -> Dict[datetime, Tuple[int, List[ScheduledTask]]]:
+        """Окно дней с номером number: из кэша или одним запросом к базе."""
+        window = self.windows.get(number)
+        if window is not None:
+            self.windows.move_to_end(number)
+            return window
+
+        start = self.date_at(number * self.WINDOW_DAYS)
+        end = start + timedelta(days=self.WINDOW_DAYS - 1)
+        window = {date: (count, tasks) for date, count, tasks
+                  in self.db.get_agenda_days(start, end, self.TASKS_PER_DAY)}
+        self.windows[number] = window
+        if len(self.windows) > self.MAX_WINDOWS:
+            self.windows.popitem(last=False)
+        return window
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.day_count
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        date = self.date_at(index.row())
+        if role == DateRole:
+            return date
+        if role == TasksRole:
+            return self._window(index.row() // self.WINDOW_DAYS).get(date, (0, []))
+        if role == Qt.ItemDataRole.DisplayRole:
+            return format_day(date)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.first_date is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Продление списка дней в будущее."""
+        if parent.isValid():
+            return
+        self.beginInsertRows(QModelIndex(), self.day_count, self.day_count + self.FETCH_DAYS - 1)
+        self.day_count += self.FETCH_DAYS
+        self.endInsertRows()
+
+def format_day(date: datetime) -> str:
+    """Заголовок дня: "Понедельник, 2 ноября 2026"."""
+    return f"{WEEKDAY_NAMES[date.weekday()]}, {date.day} {MONTH_NAMES[date.month - 1]} {date.year}"
+
+class AgendaDelegate(QStyledItemDelegate):
+    """
+    Отрисовка дня повестки: заголовок с датой и количеством задач и первые
+    задачи дня по времени. Высота строки постоянная (для uniformItemSizes).
+    """
+
+    HEADER_HEIGHT = 24
+    LINE_HEIGHT = 18
+    PADDING = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.header_font = QFont()
+        self.header_font.setBold(True)
+        self.task_font = QFont()
+        self.task_font.setPointSize(9)
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(),
+                     self.HEADER_HEIGHT + AgendaModel.TASKS_PER_DAY * self.LINE_HEIGHT + self.PADDING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        date = index.data(DateRole)
+        count, tasks = index.data(TasksRole)
+        is_today = date.date() == datetime.now().date()
+
+        # Фон и разделитель дней
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(rect, QColor(232, 240, 254))
+        elif is_today:
+            painter.fillRect(rect, QColor(255, 248, 225))
+        painter.setPen(QPen(QColor(224, 224, 224)))
+        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
+
+        # Заголовок дня
+        text_left = rect.left() + 10
+        text_width = rect.width() - 20
+        header_rect = QRect(text_left, rect.top(), text_width, self.HEADER_HEIGHT)
+        title = index.data(Qt.ItemDataRole.DisplayRole)
+        if is_today:
+            title = f"Сегодня, {title}"
+        painter.setFont(self.header_font)
+        painter.setPen(QColor(33, 33, 33))
+        painter.drawText(header_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+        if count:
+            painter.setFont(self.task_font)
+            painter.setPen(QColor(117, 117, 117))
+            painter.drawText(header_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                             f"задач: {count}")
+
+        # Первые задачи дня
+        painter.setFont(self.task_font)
+        metrics = painter.fontMetrics()
+        top = rect.top() + self.HEADER_HEIGHT
+        if not tasks:
+            painter.setPen(QColor(158, 158, 158))
+            painter.drawText(QRect(text_left, top, text_width, self.LINE_HEIGHT),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, "Нет задач")
+        for number, task in enumerate(tasks):
+            line = f"{task.start_time.strftime('%H:%M')}  {task.title}"
+            if number == len(tasks) - 1 and count > len(tasks):
+                line_rect = QRect(text_left, top, text_width - 80, self.LINE_HEIGHT)
+                painter.setPen(QColor(117, 117, 117))
+                painter.drawText(QRect(text_left, top, text_width, self.LINE_HEIGHT),
+                                 Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                                 f"ещё {count - len(tasks)}")
+            else:
+                line_rect = QRect(text_left, top, text_width, self.LINE_HEIGHT)
+            painter.setPen(QColor(158, 158, 158) if task.is_completed else QColor(33, 33, 33))
+            painter.drawText(line_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             metrics.elidedText(line, Qt.TextElideMode.ElideRight, line_rect.width()))
+            top += self.LINE_HEIGHT
+        painter.restore()
+
+class AgendaTab(QWidget):
+    """
+    Вкладка повестки: распорядок по дням с прокруткой на месяцы назад и вперед.
+    Список виртуализирован (QListView с постоянной высотой строк), распорядок
+    читается только для видимых дней (см. AgendaModel).
+    """
+
+    day_activated = pyqtSignal(object)  # Дата дня, выбранного двойным щелчком
+
+    def __init__(self, db: Database):
+        super().__init__()
+        self.db = db
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.today_button = QPushButton("Сегодня")
+        self.today_button.clicked.connect(self.scroll_to_today)
+        controls.addWidget(self.today_button)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.model = AgendaModel(db, self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(AgendaDelegate(self.view))
+        self.view.setUniformItemSizes(True)
+        self.view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.doubleClicked.connect(lambda index: self.day_activated.emit(index.data(DateRole)))
+        layout.addWidget(self.view)
+
+    def load_data(self):
+        """Загрузка списка дней и прокрутка к сегодняшнему дню."""
+        self.model.load()
+        self.scroll_to_today()
+
+    def refresh(self):
+        """Перечитывание видимых дней, если данные изменились."""
+        self.model.refresh()
+
+    def scroll_to_today(self):
+        self.scroll_to_date(datetime.now())
+
+    def scroll_to_date(self, date: datetime):
+        """Прокрутка к дню: он показывается первым в списке."""
+        row = self.model.row_for_date(date)
+        if 0 <= row < self.model.rowCount():
+            index = self.model.index(row)
+            self.view.setCurrentIndex(index)
+            self.view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
\ No newline at end of file
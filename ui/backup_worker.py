@@ -0,0 +1,48 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from backup import KEEP_BACKUPS, BackupCancelled, make_backup
+
+class BackupWorker(QObject):
+    """
+    Резервное копирование базы в отдельном потоке (см. backup.make_backup).
+    Копия снимается собственным подключением порциями страниц, поэтому
+    главный поток продолжает работать с базой. Копирование можно прервать
+    (cancel), например при закрытии окна.
+    """
+
+    progress = pyqtSignal(int)  # Процент выполнения
+    backup_created = pyqtSignal(str)  # Каталог копии
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, db_path: str, directory: str = None, keep: int = KEEP_BACKUPS):
+        """
+        Args:
+            db_path: Путь к файлу базы данных
+            directory: Каталог копий, по умолчанию backups рядом с базой
+            keep: Сколько последних копий хранить
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.directory = directory
+        self.keep = keep
+        self.is_cancelled = False
+
+    def cancel(self):
+        """Прерывание копирования; вызывается из главного потока."""
+        self.is_cancelled = True
+
+    def _report(self, percent: int):
+        if self.is_cancelled:
+            raise BackupCancelled()
+        self.progress.emit(percent)
+
+    def run(self):
+        """Копирование; выполняется в рабочем потоке."""
+        try:
+            self.backup_created.emit(make_backup(self.db_path, self.directory, self.keep, self._report))
+        except BackupCancelled:
+            pass
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
\ No newline at end of file
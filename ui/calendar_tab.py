@@ -1,27 +1,75 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QCalendarWidget,
                                QScrollArea, QFrame, QLabel, QMenu, QPushButton,
-                               QMessageBox, QGroupBox, QSplitter)
-from PyQt6.QtCore import Qt, pyqtSignal, QMimeData, QPoint, QTime
-from PyQt6.QtGui import QPainter, QPen, QColor, QDragEnterEvent, QDropEvent, QDrag, QTextCharFormat
+                               QMessageBox, QGroupBox, QSplitter, QStackedWidget)
+from PyQt6.QtCore import Qt, pyqtSignal, QEvent, QMimeData, QPoint, QPointF, QRect, QTime, QTimer
+from PyQt6.QtGui import (QPainter, QPen, QColor, QDragEnterEvent, QDropEvent, QDrag, QTextCharFormat,
+                         QFont, QFontMetrics, QStaticText, QTransform)
+from dataclasses import replace
 from datetime import datetime, time, timedelta
-from models import SingleTask, DailyTask, ScheduledTask
+from models import SingleTask, DailyTask, ScheduledTask, EditScope
 from database import Database
+from snapshot import Snapshot
 from .edit_task_dialog import EditTaskDialog
+from .edit_buffer import EditBuffer
+from .week_view import WeekViewWidget
+from .widgets import SearchLineEdit, ask_edit_scope
 
 class TimelineWidget(QFrame):
     """
     Виджет временной шкалы для отображения распорядка дня.
     Поддерживает drag & drop задач.
+    
+    На сегодняшний день показывается линия текущего времени. Таймер линии
+    срабатывает, только когда она сдвигается на пиксель (при 60 пикселях на
+    час - раз в минуту), и перерисовывается только полоса между старым и
+    новым положением. Пока шкала скрыта или показан не сегодняшний день,
+    таймер не работает.
+    
+    Шкала охватывает сутки и масштабируется колесом мыши с Ctrl: от всех
+    суток на экране до 20 пикселей на 5 минут. Детализация зависит от
+    масштаба: деления по 15 и 5 минут и подписи между часами рисуются, только
+    если между ними хватает места, название задачи - только если помещается
+    в ее блок. Перетаскивание привязывается к самому мелкому видимому
+    делению. Рисуется только открытая часть шкалы (event.rect()), поэтому
+    время кадра не растет с масштабом.
+    
+    Названия задач и подсказки рисуются подготовленными строками
+    (QStaticText), которые хранятся по тексту и ширине: повторная отрисовка
+    не измеряет и не раскладывает текст заново. Строки сбрасываются при
+    изменении ширины шкалы или шрифта; измененное название задачи - новый
+    ключ.
     """
     
     task_scheduled = pyqtSignal(ScheduledTask)
     task_removed = pyqtSignal(int)  # ID задачи
     
+    # Цвет линии текущего времени и сколько пикселей она занимает по вертикали
+    # от своей координаты (вместе с кружком в начале линии)
+    NOW_LINE_COLOR = "#dc3545"
+    NOW_LINE_RADIUS = 4
+    
+    # Пределы масштаба (пикселей на час) и множитель одного шага колеса
+    MIN_HOUR_HEIGHT = 12
+    MAX_HOUR_HEIGHT = 240
+    ZOOM_STEP = 1.25
+    # Отступ над первой меткой, чтобы подпись 00:00 была видна, и под последней
+    TOP_MARGIN = 20
+    BOTTOM_MARGIN = 20
+    # Деления и подписи (шаг в минутах от мелкого к крупному) и наименьшее
+    # расстояние между ними в пикселях, при котором они рисуются
+    GRID_STEPS = (5, 15, 60)
+    GRID_MIN_SPACING = 8
+    LABEL_STEPS = (15, 60, 120, 180, 360)
+    LABEL_MIN_SPACING = 24
+    # Час, к которому прокручивается шкала не на сегодняшний день
+    DAY_START_HOUR = 6
+    # Сколько подготовленных строк хранится; при превышении они сбрасываются
+    TEXT_CACHE_SIZE = 1000
+    
     def __init__(self, calendar_tab, parent=None):
         super().__init__(parent)
         self.calendar_tab = calendar_tab  # Сохраняем ссылку на родительский виджет
         self.setMinimumWidth(400)
-        self.setMinimumHeight(800)
         self.setFrameStyle(QFrame.Shape.NoFrame)
         self.setStyleSheet("""
             TimelineWidget {
@@ -44,9 +92,25 @@ class TimelineWidget(QFrame):
         self.setAcceptDrops(True)
         
         # Настройка временной шкалы
-        self.start_hour = 6  # 6:00
+        self.start_hour = 0  # 00:00
         self.end_hour = 24   # 00:00
         self.hour_height = 60  # пикселей на час
+        # Шкала показывается целиком в области прокрутки
+        self.setMinimumHeight(self._hour_to_y(self.end_hour) + self.BOTTOM_MARGIN)
+        
+        # Линия текущего времени: координата (None, если не показывается)
+        # и таймер до ее следующего сдвига
+        self.now_line_y = None
+        self.now_timer = QTimer(self)
+        self.now_timer.setSingleShot(True)
+        self.now_timer.timeout.connect(self.update_now_line)
+        
+        # Шрифт названий задач и подготовленные строки по (тексту, ширине
+        # сокращения или None)
+        self.title_font = None
+        self.title_metrics = None
+        self.text_cache: dict[tuple[str, int | None], QStaticText] = {}
+        self._update_title_font()
         
         # Список запланированных задач
         self.scheduled_tasks = []
@@ -69,6 +133,9 @@ class TimelineWidget(QFrame):
         self.preview_time = None
         self.preview_duration = None
         
+        # Задачи, скрытые со шкалы на время перетаскивания
+        self.dragged_tasks = []
+        
         # Кнопки управления
         self.edit_button = QPushButton("✎", self)
         self.edit_button.setFixedSize(32, 32)
@@ -91,9 +158,7 @@ class TimelineWidget(QFrame):
         prev_hovered = self.hovered_task
         self.hovered_task = None
         for task in self.scheduled_tasks:
-            task_y = self._hour_to_y(task.start_time.hour)
-            task_y += (task.start_time.minute / 60) * self.hour_height
-            task_height = (task.duration_minutes / 60) * self.hour_height
+            task_y, task_height = self._task_span(task)
             
             if (40 <= x <= self.width() - 10 and
                 task_y <= y <= task_y + task_height):
@@ -113,38 +178,40 @@ class TimelineWidget(QFrame):
         self.update()  # Перерисовка для отображения подсказки
     
     def paintEvent(self, event):
-        """Отрисовка временной шкалы и задач."""
+        """Отрисовка открытой части временной шкалы и задач."""
         super().paintEvent(event)
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # Включаем сглаживание
-        
-        # Отрисовка часовых линий и меток времени
-        pen = QPen(QColor("#dee2e6"))  # Светло-серый цвет для линий
-        painter.setPen(pen)
-        
-        # Отрисовка основных часовых линий
-        for hour in range(self.start_hour, self.end_hour + 1):
-            y = self._hour_to_y(hour)
-            painter.drawLine(30, y, self.width() - 10, y)
+        rect = event.rect()
+        
+        # Деления и подписи с шагом по масштабу; подпись рисуется над своей
+        # линией, поэтому захватываются и линии чуть ниже открытой части
+        grid_step = self._detail_step(self.GRID_STEPS, self.GRID_MIN_SPACING)
+        label_step = self._detail_step(self.LABEL_STEPS, self.LABEL_MIN_SPACING)
+        first = max(self.start_hour * 60, int(self._y_to_minutes(rect.top())) // grid_step * grid_step)
+        last = min(self.end_hour * 60, int(self._y_to_minutes(rect.bottom() + self.TOP_MARGIN)))
+        hour_pen = QPen(QColor("#dee2e6"))  # Светло-серый цвет для линий
+        grid_pen = QPen(QColor("#e9ecef"), 1, Qt.PenStyle.DotLine)  # Более светлый цвет для делений
+        for minutes in range(first, last + 1, grid_step):
+            y = self._minutes_to_y(minutes)
+            is_hour = minutes % 60 == 0
+            if is_hour:
+                painter.setPen(hour_pen)
+                painter.drawLine(30, y, self.width() - 10, y)
+            else:
+                painter.setPen(grid_pen)
+                painter.drawLine(35, y, self.width() - 15, y)
             
             # Отрисовка времени
-            painter.setPen(QColor("#495057"))  # Цвет текста
-            time_text = f"{hour:02d}:00"
-            painter.drawText(5, y - 5, time_text)
-            
-            # Отрисовка 15-минутных делений
-            if hour < self.end_hour:
-                pen.setWidth(1)
-                pen.setStyle(Qt.PenStyle.DotLine)
-                pen.setColor(QColor("#e9ecef"))  # Более светлый цвет для делений
-                painter.setPen(pen)
-                for i in range(1, 4):
-                    y_quarter = y + (self.hour_height * i) // 4
-                    painter.drawLine(35, y_quarter, self.width() - 15, y_quarter)
-        
-        # Отрисовка запланированных задач
+            if minutes % label_step == 0:
+                painter.setPen(QColor("#495057" if is_hour else "#adb5bd"))  # Цвет текста
+                painter.drawText(5, y - 5, f"{minutes // 60:02d}:{minutes % 60:02d}")
+        
+        # Отрисовка запланированных задач, попадающих в открытую часть
         for task in self.scheduled_tasks:
-            self._draw_task(painter, task)
+            task_y, task_height = self._task_span(task)
+            if task_y <= rect.bottom() and task_y + task_height >= rect.top():
+                self._draw_task(painter, task)
         
         # Отрисовка подсказки
         if self.hovered_task and self.hovered_task.description:
@@ -154,13 +221,103 @@ class TimelineWidget(QFrame):
         if self.preview_time and self.preview_duration:
             preview_color = QColor("#007bff")
             preview_color.setAlpha(128)  # Полупрозрачный
-            y = self._hour_to_y(self.preview_time.hour)
-            y += int((self.preview_time.minute / 60) * self.hour_height)
+            y = self._minutes_to_y(self.preview_time.hour * 60 + self.preview_time.minute)
             height = int((self.preview_duration / 60) * self.hour_height)
             
             painter.fillRect(40, int(y), self.width() - 50, height, preview_color)
             painter.setPen(QPen(preview_color.darker(120)))
             painter.drawRect(40, int(y), self.width() - 50, height)
+        
+        # Линия текущего времени поверх задач
+        if self.now_line_y is not None:
+            color = QColor(self.NOW_LINE_COLOR)
+            painter.setPen(QPen(color, 2))
+            painter.drawLine(30, self.now_line_y, self.width() - 10, self.now_line_y)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(color)
+            painter.drawEllipse(QPoint(30, self.now_line_y), self.NOW_LINE_RADIUS, self.NOW_LINE_RADIUS)
+    
+    def _now_line_rect(self, y: int) -> QRect:
+        """Полоса, которую занимает линия текущего времени на координате y."""
+        return QRect(0, y - self.NOW_LINE_RADIUS - 1, self.width(), 2 * self.NOW_LINE_RADIUS + 3)
+    
+    def update_now_line(self):
+        """
+        Перемещение линии текущего времени и взвод таймера на момент,
+        когда она сдвинется на следующий пиксель.
+        """
+        self.now_timer.stop()
+        now = datetime.now()
+        old_y = self.now_line_y
+        self.now_line_y = None
+        delay_ms = None
+        if self.isVisible() and self.current_date is not None and self.current_date.date() == now.date():
+            day_start = datetime.combine(now.date(), time(self.start_hour))
+            minutes = (now - day_start).total_seconds() / 60
+            if minutes < 0:
+                # До начала шкалы линия не показывается
+                delay_ms = -minutes * 60 * 1000
+            else:
+                position = self.TOP_MARGIN + minutes / 60 * self.hour_height
+                self.now_line_y = int(position)
+                next_minutes = (int(position) + 1 - self.TOP_MARGIN) * 60 / self.hour_height
+                delay_ms = (next_minutes - minutes) * 60 * 1000
+        
+        if old_y != self.now_line_y:
+            for y in (old_y, self.now_line_y):
+                if y is not None:
+                    self.update(self._now_line_rect(y))
+        if delay_ms is not None:
+            # Запас в 1 мс, чтобы не сработать за мгновение до сдвига
+            self.now_timer.start(int(delay_ms) + 1)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_now_line()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.now_timer.stop()
+    
+    def _update_title_font(self):
+        """Шрифт названий задач по шрифту виджета; подготовленные строки сбрасываются."""
+        self.title_font = QFont(self.font())
+        self.title_font.setPointSize(10)
+        self.title_metrics = QFontMetrics(self.title_font)
+        self.text_cache.clear()
+    
+    def _static_text(self, text: str, width: int | None = None) -> QStaticText:
+        """
+        Подготовленная строка шрифтом названий задач.
+        
+        Args:
+            text: Текст
+            width: Ширина в пикселях, до которой текст сокращается многоточием
+                (None - без сокращения)
+        """
+        key = (text, width)
+        static_text = self.text_cache.get(key)
+        if static_text is None:
+            if len(self.text_cache) >= self.TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            if width is not None:
+                text = self.title_metrics.elidedText(text, Qt.TextElideMode.ElideRight, width)
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(QTransform(), self.title_font)
+            self.text_cache[key] = static_text
+        return static_text
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Сокращенные названия зависят от ширины шкалы, но не от высоты
+        if event.size().width() != event.oldSize().width():
+            self.text_cache.clear()
+    
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.FontChange:
+            self._update_title_font()
     
     def _draw_tooltip(self, painter: QPainter, task: ScheduledTask):
         """Отрисовка подсказки с описанием задачи."""
@@ -170,24 +327,29 @@ class TimelineWidget(QFrame):
         # Настройка шрифта и цвета
         painter.setPen(Qt.GlobalColor.black)
         painter.setBrush(QColor(255, 255, 220))  # Светло-желтый фон
+        painter.setFont(self.title_font)
         
         # Расчет позиции и размеров подсказки
-        text = task.description
-        font_metrics = painter.fontMetrics()
-        text_width = font_metrics.horizontalAdvance(text)
-        text_height = font_metrics.height()
+        static_text = self._static_text(task.description)
+        text_size = static_text.size()
+        text_width = int(text_size.width()) + 1
+        text_height = int(text_size.height()) + 1
         
         # Отрисовка фона подсказки
         margin = 5
         rect_x = self.width() - text_width - margin * 4
-        rect_y = 10
+        # Над блоком задачи (под ним, если сверху нет места): подсказка
+        # прокручивается вместе со шкалой
+        task_y, task_height = self._task_span(task)
+        rect_y = task_y - text_height - margin * 3
+        if rect_y < 0:
+            rect_y = task_y + task_height + margin
         painter.drawRect(rect_x, rect_y,
                         text_width + margin * 2,
                         text_height + margin * 2)
         
         # Отрисовка текста
-        painter.drawText(rect_x + margin, rect_y + margin + text_height,
-                        task.description)
+        painter.drawStaticText(rect_x + margin, rect_y + margin, static_text)
     
     def _show_context_menu(self, position):
         """Отображение контекстного меню."""
@@ -195,9 +357,7 @@ class TimelineWidget(QFrame):
         y = position.y()
         task = None
         for t in self.scheduled_tasks:
-            task_y = self._hour_to_y(t.start_time.hour)
-            task_y += (t.start_time.minute / 60) * self.hour_height
-            task_height = (t.duration_minutes / 60) * self.hour_height
+            task_y, task_height = self._task_span(t)
             
             if task_y <= y <= task_y + task_height:
                 task = t
@@ -210,6 +370,7 @@ class TimelineWidget(QFrame):
             
             if action == remove_action:
                 # Удаляем все запланированные экземпляры задачи
+                self.calendar_tab.edit_buffer.discard(task.task_id)
                 self.calendar_tab.db.remove_all_scheduled_instances(task.task_id)
                 # Удаляем из текущего списка отображаемых задач
                 self.scheduled_tasks = [t for t in self.scheduled_tasks if t.task_id != task.task_id]
@@ -220,20 +381,93 @@ class TimelineWidget(QFrame):
     
     def _hour_to_y(self, hour: int) -> int:
         """Преобразование часа в координату Y на виджете."""
-        return (hour - self.start_hour) * self.hour_height
+        return self._minutes_to_y(hour * 60)
+    
+    def day_start_y(self) -> int:
+        """Верх области над меткой DAY_START_HOUR (вместе с ее подписью)."""
+        return self._hour_to_y(self.DAY_START_HOUR) - self.TOP_MARGIN
+    
+    def _minutes_to_y(self, minutes: float) -> int:
+        """Преобразование времени (в минутах от полуночи) в координату Y на виджете."""
+        return self.TOP_MARGIN + int((minutes - self.start_hour * 60) * self.hour_height / 60)
+    
+    def _y_to_minutes(self, y: int) -> float:
+        """Преобразование координаты Y во время в минутах от полуночи."""
+        return (y - self.TOP_MARGIN) / self.hour_height * 60 + self.start_hour * 60
     
     def _y_to_time(self, y: int) -> time:
         """Преобразование координаты Y в время."""
-        total_minutes = (y / self.hour_height * 60) + (self.start_hour * 60)
+        total_minutes = self._y_to_minutes(y)
         hours = int(total_minutes // 60)
         minutes = int(total_minutes % 60)
         return time(hour=min(23, max(0, hours)), minute=minutes)
     
+    def _task_span(self, task: ScheduledTask) -> tuple[int, int]:
+        """Координата Y и высота блока задачи (не меньше 2 пикселей при любом масштабе)."""
+        y = self._minutes_to_y(task.start_time.hour * 60 + task.start_time.minute)
+        return y, max(2, int((task.duration_minutes / 60) * self.hour_height))
+    
+    def _detail_step(self, steps: tuple[int, ...], min_spacing: int) -> int:
+        """Самый мелкий шаг (в минутах), при котором между отметками не меньше min_spacing пикселей."""
+        for step in steps:
+            if step * self.hour_height / 60 >= min_spacing:
+                return step
+        return steps[-1]
+    
+    def wheelEvent(self, event):
+        """Масштабирование колесом мыши с Ctrl; без Ctrl шкала прокручивается."""
+        if not event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            super().wheelEvent(event)
+            return
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom(self.ZOOM_STEP ** steps, int(event.position().y()))
+        event.accept()
+    
+    def zoom(self, factor: float, anchor_y: int):
+        """
+        Изменение масштаба шкалы.
+        
+        Args:
+            factor: Во сколько раз изменить высоту часа
+            anchor_y: Координата, время под которой остается на том же месте экрана
+        """
+        scroll = self.calendar_tab.timeline_scroll
+        viewport_height = scroll.viewport().height()
+        # Наименьший масштаб - сутки целиком на экране
+        hours = self.end_hour - self.start_hour
+        minimum = max(self.MIN_HOUR_HEIGHT, (viewport_height - self.TOP_MARGIN - self.BOTTOM_MARGIN) // hours)
+        height = round(self.hour_height * factor)
+        if height == self.hour_height:
+            # Мелкие шаги тачпада: хотя бы на пиксель
+            height += 1 if factor > 1 else -1
+        height = min(self.MAX_HOUR_HEIGHT, max(minimum, height))
+        if height == self.hour_height:
+            return
+        
+        scroll_bar = scroll.verticalScrollBar()
+        anchor_minutes = self._y_to_minutes(anchor_y)
+        anchor_offset = anchor_y - scroll_bar.value()
+        self.set_hour_height(height, viewport_height)
+        scroll_bar.setValue(self._minutes_to_y(anchor_minutes) - anchor_offset)
+    
+    def set_hour_height(self, hour_height: int, viewport_height: int = 0):
+        """Установка масштаба (пикселей на час) и высоты шкалы."""
+        self.hour_height = hour_height
+        self.setMinimumHeight(self._hour_to_y(self.end_hour) + self.BOTTOM_MARGIN)
+        # Размер меняется сразу, чтобы область прокрутки обновила диапазон
+        # до установки новой позиции
+        self.resize(self.width(), max(self.minimumHeight(), viewport_height))
+        # Кнопки задачи под курсором стоят по старым координатам
+        self.hovered_task = None
+        self.edit_button.hide()
+        self.delete_button.hide()
+        self.update_now_line()
+        self.update()
+    
     def _draw_task(self, painter: QPainter, task: ScheduledTask):
         """Отрисовка блока задачи на временной шкале."""
-        task_height = int((task.duration_minutes / 60) * self.hour_height)
-        y = self._hour_to_y(task.start_time.hour)
-        y += int((task.start_time.minute / 60) * self.hour_height)
+        y, task_height = self._task_span(task)
         
         # Определение цвета в зависимости от статуса выполнения
         if task.is_completed:
@@ -248,27 +482,19 @@ class TimelineWidget(QFrame):
         # Отрисовка с закругленными углами
         painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(color)
-        painter.drawRoundedRect(40, int(y), self.width() - 50, task_height, 6, 6)
+        radius = min(6, task_height / 2)
+        painter.drawRoundedRect(40, int(y), self.width() - 50, task_height, radius, radius)
         
         # Отрисовка текста
         painter.setPen(QColor("white"))
-        font = painter.font()
-        font.setPointSize(10)
-        painter.setFont(font)
-        
-        # Создаем прямоугольник для текста с отступами
-        text_rect = painter.boundingRect(
-            45, int(y), self.width() - 60, task_height,
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            task.title
-        )
+        painter.setFont(self.title_font)
+        # Название рисуется, только если строка помещается в блок
+        if task_height < self.title_metrics.height():
+            return
         
-        # Отрисовываем текст с правильными флагами
-        painter.drawText(
-            text_rect,
-            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
-            task.title
-        )
+        # Название, сокращенное до ширины блока с отступами, по центру по вертикали
+        static_text = self._static_text(task.title, max(0, self.width() - 60))
+        painter.drawStaticText(QPointF(45, y + (task_height - static_text.size().height()) / 2), static_text)
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Обработка начала перетаскивания."""
@@ -281,7 +507,7 @@ class TimelineWidget(QFrame):
     def dragMoveEvent(self, event):
         """Обработка перемещения при перетаскивании."""
         if event.mimeData().hasText():
-            # Получаем время с привязкой к 15-минутным интервалам
+            # Получаем время с привязкой к делениям сетки
             y = int(event.position().y())
             self.preview_time = self._snap_to_grid(self._y_to_time(y))
             self.update()  # Перерисовка для отображения предпросмотра
@@ -294,10 +520,11 @@ class TimelineWidget(QFrame):
         self.update()
 
     def _snap_to_grid(self, t: time) -> time:
-        """Привязка времени к 15-минутной сетке."""
+        """Привязка времени к сетке: 15 минут или 5, если видны 5-минутные деления."""
+        step = min(15, self._detail_step(self.GRID_STEPS, self.GRID_MIN_SPACING))
         total_minutes = t.hour * 60 + t.minute
-        # Округляем до ближайших 15 минут
-        snapped_minutes = ((total_minutes + 7) // 15) * 15
+        # Округляем до ближайшего деления, не переходя за конец суток
+        snapped_minutes = min(((total_minutes + step // 2) // step) * step, 24 * 60 - step)
         return time(snapped_minutes // 60, snapped_minutes % 60)
 
     def dropEvent(self, event: QDropEvent):
@@ -316,13 +543,31 @@ class TimelineWidget(QFrame):
         is_daily = self.calendar_tab.db.is_daily_task(task_id)
         
         if is_task_scheduled:
-            # Обновляем время существующей задачи
+            # Обновляем время существующей задачи. Шкала обновляется сразу,
+            # запись в базу откладывается и объединяется с последующими
+            # перемещениями (EditBuffer)
             if is_daily:
-                # Для ежедневной задачи обновляем время для всех экземпляров
-                self.calendar_tab.db.update_scheduled_task_time(task_id, drop_time)
+                # Для ежедневной задачи спрашиваем, какие дни изменить
+                scope = ask_edit_scope(self)
+                if scope is None:
+                    self.preview_time = None
+                    self.preview_duration = None
+                    self.update()
+                    event.ignore()
+                    return
             else:
                 # Для единоразовой задачи обновляем время только для текущей даты
-                self.calendar_tab.db.update_scheduled_task_time(task_id, drop_time, self.current_date)
+                scope = EditScope.OCCURRENCE
+            self.calendar_tab.edit_buffer.move(task_id, drop_time, self.current_date, scope)
+            
+            moved = [replace(t, start_time=drop_time) for t in self.dragged_tasks if t.task_id == task_id]
+            if moved:
+                self.scheduled_tasks = [t for t in self.scheduled_tasks if t.task_id != task_id] + moved
+            else:
+                # Задача перетащена не со шкалы: перечитываем распорядок
+                self.calendar_tab.flush_edits()
+                self.scheduled_tasks = self.calendar_tab.db.get_scheduled_tasks_for_date(self.current_date)
+            self.update()
         else:
             # Создаем новую задачу в расписании
             new_task = ScheduledTask(
@@ -335,38 +580,23 @@ class TimelineWidget(QFrame):
                 is_completed=False
             )
             
-            # Если это ежедневная задача, добавляем её на все выбранные дни
+            # Если это ежедневная задача, добавляем её на все выбранные дни;
+            # дальше распорядок продлевается автоматически
             if is_daily:
-                # Получаем информацию о днях недели для задачи
-                task = next((t for t in self.calendar_tab.db.get_all_tasks() if t.id == task_id), None)
-                if task and isinstance(task, DailyTask):
-                    current_date = datetime.now().date()
-                    end_date = current_date + timedelta(days=30)
-                    while current_date <= end_date:
-                        if current_date.weekday() in task.weekdays:
-                            scheduled_task = ScheduledTask(
-                                task_id=task_id,
-                                date=datetime.combine(current_date, time()),
-                                start_time=drop_time,
-                                title=title,
-                                duration_minutes=duration,
-                                description=description,
-                                is_completed=False
-                            )
-                            self.calendar_tab.db.add_scheduled_task(scheduled_task)
-                        current_date += timedelta(days=1)
+                self.calendar_tab.db.schedule_daily_task(task_id, drop_time)
+                self.calendar_tab.schedule_changed.emit()
             else:
                 # Для единоразовой задачи просто добавляем её в расписание
                 self.calendar_tab.db.add_scheduled_task(new_task)
             
             self.task_scheduled.emit(new_task)
-        
-        # Обновляем отображение
-        self.scheduled_tasks = self.calendar_tab.db.get_scheduled_tasks_for_date(self.current_date)
-        self.update()
-        
-        # Обновляем список доступных задач
-        self.calendar_tab.update_available_tasks()
+            
+            # Обновляем отображение
+            self.scheduled_tasks = self.calendar_tab.db.get_scheduled_tasks_for_date(self.current_date)
+            self.update()
+            
+            # Обновляем список доступных задач
+            self.calendar_tab.update_available_tasks()
         
         # Очищаем предпросмотр
         self.preview_time = None
@@ -380,9 +610,7 @@ class TimelineWidget(QFrame):
             # Поиск задачи под курсором
             y = int(event.position().y())
             for task in self.scheduled_tasks:
-                task_y = self._hour_to_y(task.start_time.hour)
-                task_y += (task.start_time.minute / 60) * self.hour_height
-                task_height = (task.duration_minutes / 60) * self.hour_height
+                task_y, task_height = self._task_span(task)
                 
                 if task_y <= y <= task_y + task_height:
                     # Начинаем перетаскивание
@@ -394,11 +622,13 @@ class TimelineWidget(QFrame):
                     drag.setMimeData(mime_data)
                     
                     # Временно скрываем задачу
+                    self.dragged_tasks = [t for t in self.scheduled_tasks if t.task_id == task.task_id]
                     self.scheduled_tasks = [t for t in self.scheduled_tasks if t.task_id != task.task_id]
                     self.update()
                     
                     # Выполняем перетаскивание
                     result = drag.exec()
+                    self.dragged_tasks = []
                     
                     # Если перетаскивание отменено
                     if result == Qt.DropAction.IgnoreAction:
@@ -419,14 +649,16 @@ class TimelineWidget(QFrame):
     def _edit_hovered_task(self):
         """Редактирование задачи под курсором."""
         if self.hovered_task:
+            # Отложенные перемещения записываются до изменения задачи
+            self.calendar_tab.flush_edits()
             # Получаем оригинальную задачу из БД
-            task = next((t for t in self.calendar_tab.db.get_all_tasks() 
-                        if t.id == self.hovered_task.task_id), None)
+            task = self.calendar_tab.db.get_task(self.hovered_task.task_id)
             if task:
                 dialog = EditTaskDialog(task, self.calendar_tab.db, self)
                 if dialog.exec():
                     edited_task = dialog.get_edited_task()
                     self.calendar_tab.db.update_task(edited_task)
+                    self.calendar_tab.schedule_changed.emit()
                     # Обновляем отображение
                     self.scheduled_tasks = self.calendar_tab.db.get_scheduled_tasks_for_date(self.current_date)
                     self.update()
@@ -446,6 +678,7 @@ class TimelineWidget(QFrame):
             
             if reply == QMessageBox.StandardButton.Yes:
                 # Удаляем задачу из БД
+                self.calendar_tab.edit_buffer.discard(self.hovered_task.task_id)
                 self.calendar_tab.db.remove_task(self.hovered_task.task_id)
                 # Обновляем отображение
                 self.scheduled_tasks = self.calendar_tab.db.get_scheduled_tasks_for_date(self.current_date)
@@ -528,6 +761,7 @@ class TaskWidget(QLabel):
         if dialog.exec():
             edited_task = dialog.get_edited_task()
             self.calendar_tab.db.update_task(edited_task)
+            self.calendar_tab.schedule_changed.emit()
             self.calendar_tab.update_available_tasks()
     
     def delete_task(self):
@@ -563,14 +797,13 @@ class TaskListWidget(QScrollArea):
         
         self.tasks = []
     
-    def update_tasks(self, tasks: list[SingleTask | DailyTask]):
-        """Обновление списка доступных задач."""
+    def show_tasks(self, tasks: list[SingleTask | DailyTask]):
+        """Отображение списка доступных (незапланированных) задач."""
         # Очистка старых задач
         for i in reversed(range(self.layout.count())):
             self.layout.itemAt(i).widget().deleteLater()
         
-        # Фильтруем только незапланированные задачи
-        self.tasks = [task for task in tasks if not self.calendar_tab.db.is_task_scheduled(task.id)]
+        self.tasks = tasks
         
         # Добавление новых задач
         for task in self.tasks:
@@ -601,7 +834,7 @@ class TaskListWidget(QScrollArea):
                 widget.show()
             else:
                 # Обновляем список задач после успешного перетаскивания
-                self.update_tasks(self.calendar_tab.db.get_all_tasks())
+                self.calendar_tab.update_available_tasks()
 
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Обработка начала перетаскивания над виджетом."""
@@ -616,10 +849,11 @@ class TaskListWidget(QScrollArea):
             task_id = int(task_data[0])
             
             # Удаляем все экземпляры задачи из расписания
+            self.calendar_tab.edit_buffer.discard(task_id)
             self.calendar_tab.db.remove_all_scheduled_instances(task_id)
             
             # Обновляем список задач
-            self.update_tasks(self.calendar_tab.db.get_all_tasks())
+            self.calendar_tab.update_available_tasks()
             
             event.acceptProposedAction()
         
@@ -630,11 +864,18 @@ class CalendarTab(QWidget):
     
     task_scheduled = pyqtSignal(ScheduledTask)
     task_removed = pyqtSignal(int)
+    # Распорядок изменен иначе, чем добавлением одной задачи (перенос, смена
+    # времени, размещение ежедневной задачи на несколько дней)
+    schedule_changed = pyqtSignal()
     
     def __init__(self, db: Database):
         super().__init__()
         self.db = db
         
+        # Отложенная запись перемещений задач на шкале
+        self.edit_buffer = EditBuffer(self)
+        self.edit_buffer.flush_requested.connect(self.flush_edits)
+        
         # Устанавливаем общий стиль для вкладки
         self.setStyleSheet("""
             QWidget {
@@ -740,9 +981,6 @@ class CalendarTab(QWidget):
         
         self.calendar.selectionChanged.connect(self._on_date_selected)
         
-        # Настройка отображения прошедших дней
-        self._update_calendar_format()
-        
         calendar_layout.addWidget(self.calendar)
         calendar_group.setLayout(calendar_layout)
         
@@ -751,6 +989,11 @@ class CalendarTab(QWidget):
         tasks_layout = QVBoxLayout()
         tasks_layout.setContentsMargins(15, 25, 15, 15)
         
+        # Фильтр доступных задач
+        self.task_filter = SearchLineEdit("Фильтр задач")
+        self.task_filter.search_changed.connect(lambda _: self.update_available_tasks())
+        tasks_layout.addWidget(self.task_filter)
+        
         self.task_list = TaskListWidget(self)
         tasks_layout.addWidget(self.task_list)
         tasks_group.setLayout(tasks_layout)
@@ -759,30 +1002,165 @@ class CalendarTab(QWidget):
         left_panel_layout.addWidget(tasks_group)
         
         # Временная шкала
-        timeline_group = QGroupBox("Распорядок дня")
+        self.timeline_group = QGroupBox("Распорядок дня")
         timeline_layout = QVBoxLayout()
         timeline_layout.setContentsMargins(15, 25, 15, 15)
         
+        # Переключение между распорядком дня и недели
+        view_layout = QHBoxLayout()
+        view_layout.addStretch()
+        self.day_view_button = QPushButton("День")
+        self.week_view_button = QPushButton("Неделя")
+        for button in (self.day_view_button, self.week_view_button):
+            button.setCheckable(True)
+            button.setAutoExclusive(True)
+            view_layout.addWidget(button)
+        self.day_view_button.setChecked(True)
+        self.week_view_button.toggled.connect(self.set_week_mode)
+        timeline_layout.addLayout(view_layout)
+        
         self.timeline = TimelineWidget(self)
+        self.timeline.current_date = datetime.combine(self.calendar.selectedDate().toPyDate(), time())
         self.timeline.task_scheduled.connect(self._on_task_scheduled)
         self.timeline.task_removed.connect(self._on_task_removed)
-        timeline_layout.addWidget(self.timeline)
-        timeline_group.setLayout(timeline_layout)
+        
+        # Распорядок недели, общий для семи дней
+        self.week_view = WeekViewWidget(self)
+        self.week_view.day_selected.connect(self._on_week_day_selected)
+        
+        # Шкала дня прокручивается; на сегодняшний день - к текущему времени
+        self.timeline_scroll = QScrollArea()
+        self.timeline_scroll.setWidgetResizable(True)
+        self.timeline_scroll.setWidget(self.timeline)
+        
+        # Шкала недели тоже прокручивается, чтобы ее высота не задавала
+        # минимальную высоту окна
+        self.week_scroll = QScrollArea()
+        self.week_scroll.setWidgetResizable(True)
+        self.week_scroll.setWidget(self.week_view)
+        # Закрепленный заголовок недели перерисовывается на новом месте
+        self.week_scroll.verticalScrollBar().valueChanged.connect(self.week_view.update)
+        
+        self.timeline_stack = QStackedWidget()
+        self.timeline_stack.addWidget(self.timeline_scroll)
+        self.timeline_stack.addWidget(self.week_scroll)
+        timeline_layout.addWidget(self.timeline_stack)
+        self.timeline_group.setLayout(timeline_layout)
         
         # Добавляем виджеты в разделитель
         splitter.addWidget(left_panel)
-        splitter.addWidget(timeline_group)
+        splitter.addWidget(self.timeline_group)
         
         # Устанавливаем начальные размеры
         splitter.setSizes([400, self.width() - 400])
         
         # Добавляем разделитель в главный layout
         layout.addWidget(splitter)
-        
-        # Загрузка начальных данных
+    
+    def load_data(self):
+        """
+        Загрузка начальных данных: списка доступных задач и распорядка на выбранную дату.
+        Вызывается главным окном после первой отрисовки.
+        """
         self.update_available_tasks()
         self._on_date_selected()
     
+    def apply_snapshot(self, snapshot: Snapshot):
+        """
+        Отображение сохраненного снимка до открытия базы данных.
+        Распорядок из снимка показывается, только если он на выбранную дату.
+        
+        Args:
+            snapshot: Снимок состояния календаря
+        """
+        self.set_scheduled_tasks(snapshot.date, snapshot.scheduled_tasks)
+        self.task_list.show_tasks(snapshot.available_tasks)
+    
+    def flush_edits(self):
+        """Запись отложенных перемещений задач в базу данных."""
+        if self.edit_buffer.flush(self.db):
+            self.schedule_changed.emit()
+    
+    def is_week_mode(self) -> bool:
+        """Показан ли распорядок недели."""
+        return self.timeline_stack.currentWidget() is self.week_scroll
+    
+    def set_week_mode(self, enabled: bool):
+        """
+        Переключение между распорядком дня и недели. Показываемый распорядок
+        перечитывается, так как изменения в другом режиме в нем не отражены.
+        """
+        if enabled == self.is_week_mode():
+            return
+        self.timeline_stack.setCurrentWidget(self.week_scroll if enabled else self.timeline_scroll)
+        self.week_view_button.setChecked(enabled)
+        self.day_view_button.setChecked(not enabled)
+        self.timeline_group.setTitle("Распорядок недели" if enabled else "Распорядок дня")
+        if enabled:
+            # Шкала недели, как и шкала дня, охватывает сутки
+            self.week_scroll.verticalScrollBar().setValue(
+                self.week_view.time_to_y(time(TimelineWidget.DAY_START_HOUR)) - WeekViewWidget.HEADER_HEIGHT)
+        if self.db is not None:
+            self._on_date_selected()
+    
+    def _on_week_day_selected(self, date: datetime):
+        """Переход от распорядка недели к распорядку выбранного дня."""
+        self.set_week_mode(False)
+        self.calendar.setSelectedDate(date.date())
+    
+    def reconcile_timeline(self):
+        """Сверка показанного по снимку распорядка с базой данных."""
+        self.flush_edits()
+        if self.is_week_mode():
+            self.week_view.reload()
+            return
+        self.set_scheduled_tasks(self.timeline.current_date,
+                                 self.db.get_scheduled_tasks_for_date(self.timeline.current_date))
+    
+    def set_scheduled_tasks(self, date: datetime, scheduled_tasks: list[ScheduledTask]):
+        """
+        Замена распорядка на шкале загруженным заранее (из снимка или фонового потока).
+        Шкала перерисовывается, только если распорядок на показанную дату отличается.
+        """
+        if date == self.timeline.current_date and scheduled_tasks != self.timeline.scheduled_tasks:
+            self.timeline.scheduled_tasks = scheduled_tasks
+            self.timeline.update()
+    
+    def reconcile_available_tasks(self):
+        """Сверка показанного по снимку списка доступных задач с базой данных."""
+        if self.task_filter.query():
+            self.update_available_tasks()
+        else:
+            self.set_available_tasks(self.db.get_unscheduled_tasks())
+    
+    def set_available_tasks(self, tasks: list[SingleTask | DailyTask]):
+        """
+        Замена списка доступных задач загруженным заранее.
+        Виджеты перестраиваются, только если список отличается; при заданном
+        фильтре список обновляет сам фильтр.
+        """
+        if not self.task_filter.query() and tasks != self.task_list.tasks:
+            self.task_list.show_tasks(tasks)
+    
+    def create_snapshot(self) -> Snapshot:
+        """
+        Снимок распорядка на сегодня и списка доступных задач.
+        Уже загруженные данные берутся из виджетов, остальные - из базы данных.
+        """
+        self.flush_edits()
+        today = datetime.combine(datetime.now().date(), time())
+        if self.timeline.current_date == today and not self.is_week_mode():
+            scheduled_tasks = self.timeline.scheduled_tasks
+        else:
+            scheduled_tasks = self.db.get_scheduled_tasks_for_date(today)
+        
+        if self.task_filter.query():
+            available_tasks = self.db.get_unscheduled_tasks()
+        else:
+            available_tasks = self.task_list.tasks
+        return Snapshot(self.db.get_data_version(), today, scheduled_tasks,
+                        available_tasks, len(available_tasks))
+    
     def _update_calendar_format(self):
         """Обновление форматирования календаря для отображения прошедших дней."""
         current_date = datetime.now().date()
@@ -802,26 +1180,48 @@ class CalendarTab(QWidget):
     def showEvent(self, event):
         """Обработчик события показа виджета."""
         super().showEvent(event)
-        self._update_calendar_format()  # Обновляем форматирование при показе
+        self._update_calendar_format()  # Настройка отображения прошедших дней при показе
     
     def _on_date_selected(self):
         """Обработка выбора даты в календаре."""
+        self.flush_edits()
         selected_date = self.calendar.selectedDate().toPyDate()
         self.timeline.current_date = datetime.combine(selected_date, time())
         
+        # В режиме недели загружается вся неделя одним запросом
+        if self.is_week_mode():
+            self.week_view.load_week(self.timeline.current_date)
+            return
+        
         # Загрузка задач для выбранной даты
         scheduled_tasks = self.db.get_scheduled_tasks_for_date(self.timeline.current_date)
         self.timeline.scheduled_tasks = scheduled_tasks
         self.timeline.update()
+        self.timeline.update_now_line()
+        self.scroll_to_now()
+    
+    def scroll_to_now(self):
+        """
+        Прокрутка шкалы дня к линии текущего времени (на треть высоты от
+        верха), на другие дни - к началу дня (DAY_START_HOUR).
+        """
+        if self.timeline.now_line_y is not None:
+            viewport_height = self.timeline_scroll.viewport().height()
+            y = max(0, self.timeline.now_line_y - viewport_height // 3)
+        else:
+            y = self.timeline.day_start_y()
+        self.timeline_scroll.verticalScrollBar().setValue(y)
     
     def update_available_tasks(self):
         """Обновление списка доступных задач."""
-        tasks = self.db.get_all_tasks()
-        self.task_list.update_tasks(tasks)
+        query = self.task_filter.query()
+        if query:
+            self.task_list.show_tasks(self.db.search_tasks(query, unscheduled_only=True))
+        else:
+            self.task_list.show_tasks(self.db.get_unscheduled_tasks())
     
     def _on_task_scheduled(self, scheduled_task: ScheduledTask):
-        """Обработка добавления задачи в расписание."""
-        self.db.add_scheduled_task(scheduled_task)
+        """Обработка добавления задачи в расписание (запись в базу уже сделала шкала)."""
         self.task_scheduled.emit(scheduled_task)
     
     def _on_task_removed(self, task_id: int):
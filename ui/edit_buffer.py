@@ -0,0 +1,70 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from datetime import datetime, time
+from typing import Dict, Optional, Tuple
+from database import Database
+from models import EditScope
+
+class EditBuffer(QObject):
+    """
+    Буфер перемещений задач в распорядке.
+    
+    Шкала показывает новое время сразу, а запись в базу откладывается:
+    повторные перемещения одной задачи заменяют друг друга, и в базу
+    попадает только последнее. Накопленные изменения записываются одной
+    транзакцией, когда пользователь перестает перемещать задачи
+    (через FLUSH_DELAY_MS), а также по требованию (flush).
+    """
+    
+    flush_requested = pyqtSignal()
+    
+    # Пауза после последнего перемещения, после которой изменения записываются
+    FLUSH_DELAY_MS = 1500
+    
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        # (ID задачи, дата экземпляра, охват изменения) -> новое время;
+        # порядок словаря - порядок последних перемещений
+        self.moves: Dict[Tuple[int, Optional[datetime], Optional[EditScope]], time] = {}
+        
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.FLUSH_DELAY_MS)
+        self.timer.timeout.connect(self.flush_requested)
+    
+    def move(self, task_id: int, new_time: time, date: datetime = None,
+             scope: EditScope = None):
+        """
+        Перемещение задачи (см. Database.update_scheduled_task_time).
+        
+        Args:
+            task_id: ID задачи
+            new_time: Новое время
+            date: Дата экземпляра
+            scope: Какие экземпляры изменить
+        """
+        # Перемещение переставляется в конец, чтобы при записи оно применялось
+        # после более ранних перемещений той же задачи с другим охватом
+        key = (task_id, date, scope)
+        self.moves.pop(key, None)
+        self.moves[key] = new_time
+        self.timer.start()
+    
+    def discard(self, task_id: int):
+        """Отмена отложенных перемещений задачи (например, при ее удалении)."""
+        self.moves = {key: value for key, value in self.moves.items() if key[0] != task_id}
+    
+    def flush(self, db: Database) -> int:
+        """
+        Запись накопленных перемещений в базу одной транзакцией.
+        
+        Returns:
+            Количество записанных перемещений
+        """
+        self.timer.stop()
+        if not self.moves:
+            return 0
+        moves, self.moves = self.moves, {}
+        with db.batch():
+            for (task_id, date, scope), new_time in moves.items():
+                db.update_scheduled_task_time(task_id, new_time, date, scope)
+        return len(moves)
\ No newline at end of file
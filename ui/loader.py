@@ -0,0 +1,68 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+from datetime import datetime
+from typing import Optional
+from database import Database
+
+class DataLoader(QObject):
+    """
+    Начальная загрузка данных в отдельном потоке.
+    
+    Открывает собственное подключение к базе (при этом применяются миграции),
+    продлевает распорядок ежедневных задач до горизонта, затем читает распорядок на дату и список доступных задач и передает их
+    в главный поток сигналами по мере готовности. Если известна версия данных
+    из снимка и она не изменилась, соответствующие выборки пропускаются.
+    """
+    
+    progress = pyqtSignal(str, int)  # Сообщение, процент выполнения
+    database_ready = pyqtSignal()
+    data_version_loaded = pyqtSignal(int)
+    scheduled_tasks_loaded = pyqtSignal(object, list)  # Дата, задачи
+    available_tasks_loaded = pyqtSignal(list)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+    
+    def __init__(self, db_path: str, date: datetime, known_version: Optional[int] = None,
+                 need_available: bool = True):
+        """
+        Args:
+            db_path: Путь к файлу базы данных
+            date: Дата распорядка
+            known_version: Версия данных, уже показанных по снимку
+            need_available: Загружать ли список доступных задач при неизменной версии
+        """
+        super().__init__()
+        self.db_path = db_path
+        self.date = date
+        self.known_version = known_version
+        self.need_available = need_available
+    
+    def run(self):
+        """Загрузка данных; выполняется в рабочем потоке."""
+        db = None
+        try:
+            self.progress.emit("Открытие базы данных", 10)
+            db = Database(self.db_path)
+            self.database_ready.emit()
+            
+            self.progress.emit("Планирование ежедневных задач", 25)
+            db.materialize_daily_tasks()
+            
+            version = db.get_data_version()
+            self.data_version_loaded.emit(version)
+            is_current = version == self.known_version
+            
+            if not is_current:
+                self.progress.emit("Загрузка распорядка", 40)
+                self.scheduled_tasks_loaded.emit(self.date, db.get_scheduled_tasks_for_date(self.date))
+            
+            if not is_current or self.need_available:
+                self.progress.emit("Загрузка задач", 70)
+                self.available_tasks_loaded.emit(db.get_unscheduled_tasks())
+            
+            self.progress.emit("Готово", 100)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            if db:
+                db.conn.close()
+            self.finished.emit()
\ No newline at end of file
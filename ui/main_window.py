@@ -1,45 +1,429 @@
-from PyQt6.QtWidgets import QMainWindow, QTabWidget, QMenuBar, QMenu
-from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QMenuBar, QMenu, QWidget, QVBoxLayout,
+                               QMessageBox, QSystemTrayIcon, QStyle)
+from PyQt6.QtCore import Qt, QEvent, QRect, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QScreen, QAction
 from PyQt6.QtWidgets import QApplication
+from datetime import datetime, timedelta
 from .calendar_tab import CalendarTab
 from .tasks_tab import TasksTab
+from .agenda_tab import AgendaTab
+from .stats_tab import StatsTab
+from .performance_panel import PerformancePanel
+from .loader import DataLoader
+from .backup_worker import BackupWorker
+from .reminders import ReminderScheduler
 from database import Database
+from instrumentation import QueryProfiler, StartupTimer
+from snapshot import load_snapshot, save_snapshot
+from backup import backup_directory, last_backup_time
 
 class MainWindow(QMainWindow):
     """
     Главное окно приложения.
-    Содержит две вкладки: календарь с распорядком и управление задачами.
+    Содержит вкладки календаря с распорядком, управления задачами, повестки
+    и статистики.
+    
+    Вкладки, кроме календаря, создаются при первом показе, а данные
+    загружаются после первой отрисовки окна. Если база данных не передана,
+    она открывается и начальные данные читаются в отдельном потоке
+    (DataLoader), а окно заполняется по мере поступления данных. Если задан
+    снимок состояния (snapshot.py), календарь сразу отрисовывается по нему
+    и затем сверяется с базой. Резервные копии базы (backup.py) создаются
+    в фоновом потоке раз в BACKUP_INTERVAL и по команде меню. О начале задач
+    распорядка напоминает ReminderScheduler (строка состояния и уведомление
+    в системном трее).
     """
     
-    def __init__(self):
+    loading_progress = pyqtSignal(str, int)  # Этап загрузки, процент выполнения
+    loading_finished = pyqtSignal()
+    
+    # Как часто распорядок ежедневных задач продлевается во время работы
+    MATERIALIZE_INTERVAL_MS = 60 * 60 * 1000
+    
+    # Как часто создается резервная копия; давность последней копии
+    # проверяется после запуска (с задержкой) и затем каждый час
+    BACKUP_INTERVAL = timedelta(days=1)
+    BACKUP_CHECK_INTERVAL_MS = 60 * 60 * 1000
+    BACKUP_STARTUP_DELAY_MS = 60 * 1000
+    
+    # Сколько показывается напоминание в строке состояния
+    REMINDER_MESSAGE_MS = 5 * 60 * 1000
+    
+    def __init__(self, db: Database = None, profiler: QueryProfiler = None,
+                 startup: StartupTimer = None, snapshot_path: str = None,
+                 db_path: str = "planner.db"):
         super().__init__()
+        self.startup = startup
+        self.snapshot_path = snapshot_path
+        self.db_path = db_path
         self.setWindowTitle("Simple Planner")
         self.setMinimumSize(1000, 600)
         
         # Установка размера окна (80% от размера экрана) и центрирование
         self.setup_window_size()
+        self._mark_startup("Размер окна")
         
-        # Инициализация базы данных
-        self.db = Database()
+        # Снимок состояния с прошлого запуска
+        self.snapshot = load_snapshot(snapshot_path) if snapshot_path else None
+        if snapshot_path:
+            self._mark_startup("Чтение снимка")
         
-        # Создание и настройка вкладок
+        # Профилирование запросов (включается параметром запуска --profile).
+        # Неявное действие пользователя закрывается при возврате в цикл событий.
+        self.profiler = profiler
+        self.performance_panel = None
+        
+        # База данных: переданная открытая или открываемая в фоновом потоке
+        self.db = None
+        self.loader = None
+        self.loader_thread = None
+        self.loaded_version = None
+        if db:
+            self._set_database(db)
+        
+        # Создание и настройка вкладок; вместо вкладок, кроме календаря,
+        # до первого показа стоят пустые страницы
         self.tabs = QTabWidget()
         self.calendar_tab = CalendarTab(self.db)
-        self.tasks_tab = TasksTab(self.db)
+        if self.snapshot:
+            self.calendar_tab.apply_snapshot(self.snapshot)
+        self.tasks_tab = None
+        self.tasks_page = QWidget()
+        tasks_page_layout = QVBoxLayout(self.tasks_page)
+        tasks_page_layout.setContentsMargins(0, 0, 0, 0)
+        self.agenda_tab = None
+        self.agenda_page = QWidget()
+        agenda_page_layout = QVBoxLayout(self.agenda_page)
+        agenda_page_layout.setContentsMargins(0, 0, 0, 0)
+        self.stats_tab = None
+        self.stats_page = QWidget()
+        stats_page_layout = QVBoxLayout(self.stats_page)
+        stats_page_layout.setContentsMargins(0, 0, 0, 0)
         
         self.tabs.addTab(self.calendar_tab, "Календарь и распорядок")
-        self.tabs.addTab(self.tasks_tab, "Управление задачами")
+        self.tabs.addTab(self.tasks_page, "Управление задачами")
+        self.tabs.addTab(self.agenda_page, "Повестка")
+        self.tabs.addTab(self.stats_page, "Статистика")
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self._mark_startup("Вкладка календаря")
+        
+        # Пока база не открыта, вкладки недоступны для изменений
+        self.tabs.setEnabled(self.db is not None)
         
         # Установка вкладок как центрального виджета
         self.setCentralWidget(self.tabs)
         
         # Создание меню
         self.create_menu()
+        self._mark_startup("Меню")
+        
+        self._initial_load_scheduled = False
+        self._initial_data_loaded = False
+        
+        # Продление распорядка ежедневных задач, если приложение не закрывают
+        # несколько дней (при запуске продлевается при загрузке данных)
+        self.materialize_timer = QTimer(self)
+        self.materialize_timer.setInterval(self.MATERIALIZE_INTERVAL_MS)
+        self.materialize_timer.timeout.connect(self._materialize_daily_tasks)
+        
+        # Резервное копирование по расписанию
+        self.backup_worker = None
+        self.backup_thread = None
+        self.backup_timer = QTimer(self)
+        self.backup_timer.setInterval(self.BACKUP_CHECK_INTERVAL_MS)
+        self.backup_timer.timeout.connect(self._backup_if_due)
+        
+        # Напоминания о начале задач; запускаются после загрузки данных
+        self.reminders = None
+        self.tray_icon = None
+    
+    def _set_database(self, db: Database):
+        """Подключение открытой базы данных к окну и вкладкам."""
+        self.db = db
+        if self.profiler:
+            self.profiler.attach(db)
+            self.profiler.action_closer = lambda: QTimer.singleShot(0, self.profiler.end_action)
+    
+    def _mark_startup(self, phase: str):
+        """Отметка этапа запуска (при включенном --startup-profile)."""
+        if self.startup:
+            self.startup.mark(phase)
+    
+    def showEvent(self, event):
+        """
+        При первом показе окна откладывает загрузку данных до возврата
+        в цикл событий, чтобы окно успело отрисоваться.
+        """
+        super().showEvent(event)
+        if not self._initial_load_scheduled:
+            self._initial_load_scheduled = True
+            self._mark_startup("Показ окна")
+            QTimer.singleShot(0, self._load_initial_data)
+    
+    def _load_initial_data(self):
+        """
+        Загрузка данных видимой вкладки после первой отрисовки.
+        Если окно отрисовано по снимку, данные перечитываются только при
+        изменении счетчика версий данных.
+        """
+        self._mark_startup("Первая отрисовка")
+        if self.db is None:
+            self._start_loader()
+            return
+        
+        # База передана открытой: загрузка в главном потоке
+        self.db.materialize_daily_tasks()
+        if self.snapshot is None:
+            self.calendar_tab.load_data()
+        else:
+            is_current = (self.snapshot.data_version == self.db.get_data_version()
+                          and self.snapshot.date == self.calendar_tab.timeline.current_date)
+            if not is_current:
+                self.calendar_tab.reconcile_timeline()
+            if not is_current or self.snapshot.is_partial:
+                self.calendar_tab.reconcile_available_tasks()
+        self._mark_startup("Загрузка данных календаря")
+        self._finish_loading()
+    
+    def _start_loader(self):
+        """Запуск фоновой загрузки данных."""
+        date = self.calendar_tab.timeline.current_date
+        known_version = None
+        if self.snapshot and self.snapshot.date == date:
+            known_version = self.snapshot.data_version
+        need_available = self.snapshot is None or self.snapshot.is_partial
+        
+        self.loader_thread = QThread(self)
+        self.loader = DataLoader(self.db_path, date, known_version, need_available)
+        self.loader.moveToThread(self.loader_thread)
+        self.loader_thread.started.connect(self.loader.run)
+        self.loader.progress.connect(self.loading_progress)
+        self.loader.database_ready.connect(self._on_database_ready)
+        self.loader.data_version_loaded.connect(self._on_data_version_loaded)
+        self.loader.scheduled_tasks_loaded.connect(self._on_scheduled_tasks_loaded)
+        self.loader.available_tasks_loaded.connect(self._on_available_tasks_loaded)
+        self.loader.failed.connect(self._on_loading_failed)
+        self.loader.finished.connect(self.loader_thread.quit)
+        self.loader.finished.connect(self._finish_loading)
+        self.loader_thread.finished.connect(self.loader.deleteLater)
+        self.loader_thread.start()
+    
+    def _on_database_ready(self):
+        """
+        Миграции выполнены в фоновом потоке: открываем подключение главного
+        потока и разрешаем изменения, не дожидаясь загрузки данных.
+        """
+        self._set_database(Database(self.db_path))
+        self.calendar_tab.db = self.db
+        self.tabs.setEnabled(True)
+        self._mark_startup("Открытие базы данных")
+    
+    def _on_data_version_loaded(self, version: int):
+        self.loaded_version = version
+    
+    def _is_loaded_data_current(self) -> bool:
+        """Не изменились ли данные в главном потоке, пока шла фоновая загрузка."""
+        return self.db is not None and self.db.get_data_version() == self.loaded_version
+    
+    def _on_scheduled_tasks_loaded(self, date: datetime, scheduled_tasks: list):
+        if self._is_loaded_data_current():
+            self.calendar_tab.set_scheduled_tasks(date, scheduled_tasks)
+        else:
+            self.calendar_tab.reconcile_timeline()
+        self._mark_startup("Загрузка распорядка")
+    
+    def _on_available_tasks_loaded(self, tasks: list):
+        if self._is_loaded_data_current():
+            self.calendar_tab.set_available_tasks(tasks)
+        else:
+            self.calendar_tab.reconcile_available_tasks()
+        self._mark_startup("Загрузка доступных задач")
+    
+    def _on_loading_failed(self, message: str):
+        QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить данные:\n{message}")
+    
+    def _finish_loading(self):
+        """Завершение начальной загрузки."""
+        self.snapshot = None
+        self._initial_data_loaded = self.db is not None
+        if self._initial_data_loaded:
+            self.materialize_timer.start()
+            self.backup_timer.start()
+            QTimer.singleShot(self.BACKUP_STARTUP_DELAY_MS, self._backup_if_due)
+            self._start_reminders()
+        self.loading_finished.emit()
+        if self.startup:
+            print(self.startup.report())
+    
+    def _materialize_daily_tasks(self):
+        """Продление распорядка ежедневных задач до горизонта."""
+        if self.db.materialize_daily_tasks():
+            self.calendar_tab.reconcile_timeline()
+            self._refresh_reminders()
+    
+    def _start_reminders(self):
+        """Создание планировщика напоминаний и подписка на изменения распорядка."""
+        self.reminders = ReminderScheduler(self.db, self)
+        self.reminders.reminders_due.connect(self._on_reminders_due)
+        self.calendar_tab.task_scheduled.connect(self.reminders.schedule)
+        self.calendar_tab.schedule_changed.connect(self.reminders.refresh)
+        self.reminders.load()
+    
+    def _refresh_reminders(self):
+        if self.reminders:
+            self.reminders.refresh()
+    
+    def _on_reminders_due(self, tasks: list):
+        """Напоминание о задачах, которые начинаются."""
+        lines = [f"{task.start_time.strftime('%H:%M')} {task.title}" for task in tasks]
+        self.statusBar().showMessage(f"Начинается: {'; '.join(lines)}", self.REMINDER_MESSAGE_MS)
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            if self.tray_icon is None:
+                icon = self.windowIcon()
+                if icon.isNull():
+                    icon = self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation)
+                self.tray_icon = QSystemTrayIcon(icon, self)
+                self.tray_icon.setToolTip(self.windowTitle())
+                self.tray_icon.messageClicked.connect(self._show_from_tray)
+                self.tray_icon.show()
+            self.tray_icon.showMessage("Начало задачи", '\n'.join(lines))
+        QApplication.alert(self)
+    
+    def _show_from_tray(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+    
+    def changeEvent(self, event):
+        """
+        При активации окна напоминания сверяются с базой: распорядок могли
+        изменить из командной строки или через API.
+        """
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.ActivationChange and self.isActiveWindow():
+            self._refresh_reminders()
+    
+    def _backup_if_due(self):
+        """Резервная копия, если последняя старше BACKUP_INTERVAL."""
+        if self.db is None or self.db.db_name == ':memory:':
+            return
+        last_backup = last_backup_time(backup_directory(self.db.db_name))
+        if last_backup is None or datetime.now() - last_backup >= self.BACKUP_INTERVAL:
+            self.start_backup()
+    
+    def start_backup(self, manual: bool = False):
+        """
+        Запуск резервного копирования в фоновом потоке, если оно еще не идет.
         
-        # Соединение сигналов между вкладками
-        self.tasks_tab.task_added.connect(self.calendar_tab.update_available_tasks)
-        self.calendar_tab.task_scheduled.connect(self.tasks_tab.update_task_list)
+        Args:
+            manual: Копия запрошена пользователем (об ошибке сообщается окном)
+        """
+        if self.db is None or self.db.db_name == ':memory:':
+            return
+        if self.backup_thread and self.backup_thread.isRunning():
+            return
+        self.backup_thread = QThread(self)
+        self.backup_worker = BackupWorker(self.db.db_name)
+        self.backup_worker.moveToThread(self.backup_thread)
+        self.backup_thread.started.connect(self.backup_worker.run)
+        self.backup_worker.progress.connect(
+            lambda percent: self.statusBar().showMessage(f"Резервная копия: {percent}%"))
+        self.backup_worker.backup_created.connect(
+            lambda path: self.statusBar().showMessage(f"Резервная копия сохранена: {path}", 10000))
+        self.backup_worker.failed.connect(lambda message: self._on_backup_failed(message, manual))
+        self.backup_worker.finished.connect(self.backup_thread.quit)
+        self.backup_thread.finished.connect(self.backup_worker.deleteLater)
+        self.backup_thread.start()
+    
+    def _on_backup_failed(self, message: str, manual: bool):
+        self.statusBar().showMessage(f"Не удалось создать резервную копию: {message}", 10000)
+        if manual:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось создать резервную копию:\n{message}")
+    
+    def _on_tab_changed(self, index: int):
+        """
+        Запись отложенных перемещений задач, создание вкладок при первом
+        переключении на них и обновление при повторных.
+        """
+        if self.db is not None:
+            self.calendar_tab.flush_edits()
+        if self.tabs.widget(index) is self.tasks_page:
+            self.get_tasks_tab()
+        elif self.tabs.widget(index) is self.agenda_page:
+            if self.agenda_tab is None:
+                self.get_agenda_tab()
+            else:
+                self.agenda_tab.refresh()
+        elif self.tabs.widget(index) is self.stats_page:
+            if self.stats_tab is None:
+                self.get_stats_tab()
+            else:
+                self.stats_tab.refresh()
+    
+    def get_tasks_tab(self) -> TasksTab:
+        """
+        Возвращает вкладку управления задачами, создавая ее при первом обращении.
+        Задачи загружаются после отрисовки вкладки.
+        """
+        if self.tasks_tab is None:
+            self.tasks_tab = TasksTab(self.db)
+            self.tasks_page.layout().addWidget(self.tasks_tab)
+            
+            # Соединение сигналов между вкладками
+            self.tasks_tab.task_added.connect(self.calendar_tab.update_available_tasks)
+            self.tasks_tab.task_added.connect(self._refresh_reminders)
+            self.calendar_tab.task_scheduled.connect(self.tasks_tab.update_task_list)
+            
+            QTimer.singleShot(0, self.tasks_tab.load_data)
+        return self.tasks_tab
+    
+    def get_agenda_tab(self) -> AgendaTab:
+        """
+        Возвращает вкладку повестки, создавая ее при первом обращении.
+        Список дней загружается после отрисовки вкладки.
+        """
+        if self.agenda_tab is None:
+            self.agenda_tab = AgendaTab(self.db)
+            self.agenda_page.layout().addWidget(self.agenda_tab)
+            self.agenda_tab.day_activated.connect(self._show_day)
+            QTimer.singleShot(0, self.agenda_tab.load_data)
+        return self.agenda_tab
+    
+    def get_stats_tab(self) -> StatsTab:
+        """
+        Возвращает вкладку статистики, создавая ее при первом обращении.
+        Итоги загружаются после отрисовки вкладки.
+        """
+        if self.stats_tab is None:
+            self.stats_tab = StatsTab(self.db)
+            self.stats_page.layout().addWidget(self.stats_tab)
+            QTimer.singleShot(0, self.stats_tab.load_data)
+        return self.stats_tab
+    
+    def _show_day(self, date: datetime):
+        """Переход к распорядку дня на вкладке календаря."""
+        self.calendar_tab.calendar.setSelectedDate(date.date())
+        self.tabs.setCurrentWidget(self.calendar_tab)
+    
+    def closeEvent(self, event):
+        """
+        Запись отложенных изменений и сохранение снимка состояния календаря при закрытии окна.
+        Незавершенное резервное копирование прерывается.
+        """
+        if self.loader_thread and self.loader_thread.isRunning():
+            self.loader_thread.wait()
+        if self.backup_thread and self.backup_thread.isRunning():
+            # Недописанная копия удаляется; следующая будет создана при запуске
+            self.backup_worker.cancel()
+            self.backup_thread.wait()
+        if self.db is not None:
+            self.calendar_tab.flush_edits()
+        if self.snapshot_path and self._initial_data_loaded:
+            try:
+                save_snapshot(self.snapshot_path, self.calendar_tab.create_snapshot())
+            except OSError:
+                pass  # Без снимка следующий запуск просто загрузит данные из базы
+        super().closeEvent(event)
     
     def setup_window_size(self):
         """
@@ -69,6 +453,15 @@ class MainWindow(QMainWindow):
         menubar = QMenuBar(self)
         self.setMenuBar(menubar)
         
+        # Создание меню "Файл"
+        file_menu = QMenu("Файл", self)
+        menubar.addMenu(file_menu)
+        
+        backup_action = QAction("Создать резервную копию", self)
+        backup_action.setShortcut("Ctrl+Shift+B")
+        backup_action.triggered.connect(lambda: self.start_backup(manual=True))
+        file_menu.addAction(backup_action)
+        
         # Создание меню "Вид"
         view_menu = QMenu("Вид", self)
         menubar.addMenu(view_menu)
@@ -84,6 +477,24 @@ class MainWindow(QMainWindow):
         reset_size_action = QAction("Сбросить размер (80% экрана)", self)
         reset_size_action.triggered.connect(self.setup_window_size)
         view_menu.addAction(reset_size_action)
+        
+        # Панель производительности доступна только при включенном профилировании
+        self.performance_action = QAction("Производительность", self)
+        self.performance_action.setShortcut("Ctrl+Shift+P")
+        self.performance_action.triggered.connect(self.show_performance_panel)
+        self.performance_action.setVisible(self.profiler is not None)
+        view_menu.addAction(self.performance_action)
+    
+    def show_performance_panel(self):
+        """
+        Показывает окно статистики запросов к базе данных.
+        """
+        if self.profiler is None:
+            return
+        if self.performance_panel is None:
+            self.performance_panel = PerformancePanel(self.profiler, self)
+        self.performance_panel.show()
+        self.performance_panel.raise_()
     
     def toggle_fullscreen(self, checked):
         """
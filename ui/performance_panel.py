@@ -0,0 +1,115 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                               QTabWidget, QTableWidget, QTableWidgetItem, QHeaderView)
+from PyQt6.QtCore import Qt, QTimer
+from instrumentation import QueryProfiler
+
+class PerformancePanel(QDialog):
+    """
+    Немодальное окно со статистикой запросов к базе данных.
+    Обновляется раз в секунду, пока открыто.
+    """
+    
+    REFRESH_MS = 1000
+    
+    def __init__(self, profiler: QueryProfiler, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.setWindowTitle("Производительность")
+        self.resize(900, 500)
+        
+        layout = QVBoxLayout(self)
+        
+        # Сводка и кнопка сброса
+        header_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        reset_button = QPushButton("Сбросить")
+        reset_button.clicked.connect(self.reset)
+        header_layout.addWidget(self.summary_label)
+        header_layout.addStretch()
+        header_layout.addWidget(reset_button)
+        layout.addLayout(header_layout)
+        
+        # Таблицы статистики
+        self.tables = QTabWidget()
+        self.methods_table = self._create_table(["Метод", "Вызовов", "Всего, мс", "Среднее, мс", "Запросов"])
+        self.statements_table = self._create_table(["Запрос", "Выполнений", "Всего, мс", "Среднее, мс"])
+        self.actions_table = self._create_table(["Действие", "Запросов", "Всего, мс", "Повторы"])
+        self.n_plus_one_table = self._create_table(["Запрос", "Повторов за действие"])
+        self.slow_table = self._create_table(["Запрос", "Параметры", "Время, мс", "Метод"])
+        self.tables.addTab(self.methods_table, "Методы")
+        self.tables.addTab(self.statements_table, "Запросы")
+        self.tables.addTab(self.actions_table, "Действия")
+        self.tables.addTab(self.n_plus_one_table, "N+1")
+        self.tables.addTab(self.slow_table, "Медленные")
+        layout.addWidget(self.tables)
+        
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+    
+    def _create_table(self, headers) -> QTableWidget:
+        """Таблица только для чтения; первый столбец растягивается."""
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, len(headers)):
+            table.horizontalHeader().setSectionResizeMode(
+                column, QHeaderView.ResizeMode.ResizeToContents)
+        return table
+    
+    def _fill_table(self, table: QTableWidget, rows):
+        """Заполнение таблицы строками значений."""
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                if isinstance(value, float):
+                    value = f"{value:.2f}"
+                item = QTableWidgetItem(str(value))
+                if column == 0:
+                    item.setToolTip(str(values[0]))
+                else:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                table.setItem(row, column, item)
+    
+    def refresh(self):
+        """Перечитывание статистики профилировщика."""
+        profiler = self.profiler
+        self.summary_label.setText(
+            f"Запросов: {profiler.total_statements()}, "
+            f"медленных (от {profiler.slow_query_ms:g} мс): {len(profiler.slow_queries)}, "
+            f"N+1: {len(profiler.n_plus_one)}")
+        
+        self._fill_table(self.methods_table, [
+            (m.name, m.calls, m.total_ms, m.total_ms / m.calls if m.calls else 0.0, m.statements)
+            for m in profiler.method_stats()
+        ])
+        self._fill_table(self.statements_table, [
+            (s.sql, s.count, s.total_ms, s.total_ms / s.count)
+            for s in profiler.top_statements(50)
+        ])
+        self._fill_table(self.actions_table, [
+            (a.name, a.statements, a.total_ms, sum(a.repeated.values()))
+            for a in reversed(profiler.actions)
+        ])
+        self._fill_table(self.n_plus_one_table, sorted(
+            profiler.n_plus_one.items(), key=lambda item: item[1], reverse=True))
+        self._fill_table(self.slow_table, [
+            (q.sql, repr(q.params), q.duration_ms, q.method or "")
+            for q in reversed(profiler.slow_queries)
+        ])
+    
+    def reset(self):
+        """Сброс статистики."""
+        self.profiler.reset()
+        self.refresh()
+    
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+    
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
\ No newline at end of file
@@ -0,0 +1,152 @@
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from datetime import date, datetime, time, timedelta
+from heapq import heapify, heappop, heappush
+from itertools import count
+from typing import Dict, List, Set, Tuple
+from database import Database
+from models import ScheduledTask
+
+class ReminderScheduler(QObject):
+    """
+    Напоминания о начале задач распорядка.
+
+    Ближайшие начала задач (на HORIZON_DAYS дней вперед) читаются одним
+    запросом за период и хранятся в куче по времени начала. Один таймер
+    взводится на ближайшее начало, после срабатывания - на следующее, поэтому
+    в простое нет ни опроса, ни таймера на каждую задачу.
+
+    Изменения распорядка добавляются в кучу по одной записи (schedule) или
+    сверкой периода с базой, если данные изменились (refresh); старые записи
+    из кучи не удаляются, а отбрасываются при срабатывании: перед
+    напоминанием распорядок дня перечитывается, и напоминания об удаленных,
+    перенесенных и выполненных задачах не показываются.
+    """
+
+    reminders_due = pyqtSignal(list)  # Задачи (ScheduledTask), которые начинаются
+
+    # На сколько дней вперед читается распорядок; за RELOAD_MARGIN до конца
+    # периода куча строится заново
+    HORIZON_DAYS = 7
+    RELOAD_MARGIN = timedelta(days=1)
+    # Напоминания, опоздавшие больше чем на это время (например, после сна
+    # компьютера), не показываются
+    MISSED_TOLERANCE = timedelta(minutes=10)
+    # Максимальный интервал QTimer (мс)
+    MAX_INTERVAL_MS = 2 ** 31 - 1
+
+    def __init__(self, db: Database, parent: QObject = None):
+        super().__init__(parent)
+        self.db = db
+        # Куча (время начала, порядковый номер, задача); номер упорядочивает
+        # задачи с одинаковым временем
+        self.heap: List[Tuple[datetime, int, ScheduledTask]] = []
+        self.sequence = count()
+        # Ключи (ID задачи, дата, время) записей, которые есть в куче
+        self.keys: Set[Tuple[int, date, time]] = set()
+        self.loaded_until = None
+        self.reload_at = None
+        self.data_version = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        # Интервалы бывают в часы; грубый таймер мог бы опоздать на минуты
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_timeout)
+
+    @staticmethod
+    def _key(task: ScheduledTask) -> Tuple[int, date, time]:
+        return task.task_id, task.date.date(), task.start_time
+
+    @staticmethod
+    def _start(task: ScheduledTask) -> datetime:
+        return datetime.combine(task.date.date(), task.start_time)
+
+    def _upcoming(self, now: datetime) -> List[ScheduledTask]:
+        """Невыполненные задачи распорядка, начинающиеся после now, до конца периода."""
+        today = datetime.combine(now.date(), time())
+        return [task for task in self.db.iter_scheduled_tasks(today, self.loaded_until - timedelta(days=1))
+                if not task.is_completed and self._start(task) > now]
+
+    def load(self):
+        """Построение кучи по распорядку на HORIZON_DAYS дней и запуск таймера."""
+        now = datetime.now()
+        self.loaded_until = datetime.combine(now.date(), time()) + timedelta(days=self.HORIZON_DAYS + 1)
+        self.reload_at = self.loaded_until - self.RELOAD_MARGIN
+        self.data_version = self.db.get_data_version()
+        tasks = self._upcoming(now)
+        self.heap = [(self._start(task), next(self.sequence), task) for task in tasks]
+        heapify(self.heap)
+        self.keys = {self._key(task) for task in tasks}
+        self._arm()
+
+    def schedule(self, task: ScheduledTask):
+        """Добавление задачи, размещенной в распорядке, без обращения к базе."""
+        if self.loaded_until is None:
+            return
+        start = self._start(task)
+        key = self._key(task)
+        if task.is_completed or key in self.keys or not datetime.now() < start < self.loaded_until:
+            return
+        heappush(self.heap, (start, next(self.sequence), task))
+        self.keys.add(key)
+        if self.heap[0][2] is task:
+            self._arm()
+
+    def refresh(self):
+        """
+        Сверка с базой, если данные изменились: задачи, которых нет в куче,
+        добавляются в нее. Вызывается после изменений распорядка, которые
+        затрагивают несколько дней.
+        """
+        if self.loaded_until is None:
+            return
+        version = self.db.get_data_version()
+        if version == self.data_version:
+            return
+        self.data_version = version
+        tasks = self._upcoming(datetime.now())
+        for task in tasks:
+            if self._key(task) not in self.keys:
+                heappush(self.heap, (self._start(task), next(self.sequence), task))
+        self.keys = {self._key(task) for task in tasks}
+        self._arm()
+
+    def stop(self):
+        self.timer.stop()
+
+    def _arm(self):
+        """Взвод таймера на ближайшее начало задачи или на перестроение кучи."""
+        due = min(self.heap[0][0], self.reload_at) if self.heap else self.reload_at
+        delay_ms = int((due - datetime.now()).total_seconds() * 1000)
+        self.timer.start(max(0, min(delay_ms, self.MAX_INTERVAL_MS)))
+
+    def _on_timeout(self):
+        """Напоминание о наступивших началах задач и взвод таймера на следующее."""
+        now = datetime.now()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            start, _, task = heappop(self.heap)
+            self.keys.discard(self._key(task))
+            if now - start <= self.MISSED_TOLERANCE:
+                due.append(task)
+
+        current = self._still_scheduled(due) if due else []
+        if now >= self.reload_at:
+            self.load()
+        else:
+            self._arm()
+        if current:
+            self.reminders_due.emit(current)
+
+    def _still_scheduled(self, tasks: List[ScheduledTask]) -> List[ScheduledTask]:
+        """Задачи, которые по-прежнему в распорядке и не выполнены (в актуальном виде)."""
+        result: Dict[Tuple[int, date, time], ScheduledTask] = {}
+        for day in sorted({task.date.date() for task in tasks}):
+            current = {self._key(task): task
+                       for task in self.db.get_scheduled_tasks_for_date(datetime.combine(day, time()))
+                       if not task.is_completed}
+            for task in tasks:
+                key = self._key(task)
+                if key in current:
+                    result[key] = current[key]
+        return sorted(result.values(), key=lambda task: (task.start_time, task.title))
\ No newline at end of file
@@ -0,0 +1,59 @@
+from PyQt6.QtWidgets import QSplashScreen
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont
+
+class SplashScreen(QSplashScreen):
+    """
+    Заставка на время запуска приложения.
+    Изображение рисуется программно; внизу показываются этап загрузки и прогресс.
+    """
+    
+    WIDTH = 420
+    HEIGHT = 220
+    
+    def __init__(self):
+        super().__init__(self._create_pixmap())
+        self.message = ""
+        self.percent = 0
+    
+    def _create_pixmap(self) -> QPixmap:
+        """Фон заставки с названием приложения."""
+        pixmap = QPixmap(self.WIDTH, self.HEIGHT)
+        pixmap.fill(QColor("#f8f9fa"))
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QColor("#dee2e6"))
+        painter.drawRect(0, 0, self.WIDTH - 1, self.HEIGHT - 1)
+        
+        font = QFont()
+        font.setPointSize(24)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#007bff"))
+        painter.drawText(QRect(0, 50, self.WIDTH, 60), Qt.AlignmentFlag.AlignCenter, "Simple Planner")
+        painter.end()
+        return pixmap
+    
+    def set_progress(self, message: str, percent: int):
+        """
+        Обновление этапа загрузки.
+        
+        Args:
+            message: Текущий этап
+            percent: Процент выполнения (0-100)
+        """
+        self.message = message
+        self.percent = max(0, min(100, percent))
+        self.repaint()
+    
+    def drawContents(self, painter: QPainter):
+        """Отрисовка текущего этапа и полосы прогресса."""
+        painter.setPen(QColor("#495057"))
+        painter.drawText(QRect(20, self.HEIGHT - 70, self.WIDTH - 40, 24),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, self.message)
+        
+        bar = QRect(20, self.HEIGHT - 40, self.WIDTH - 40, 8)
+        painter.fillRect(bar, QColor("#e9ecef"))
+        painter.fillRect(QRect(bar.x(), bar.y(), bar.width() * self.percent // 100, bar.height()),
+                         QColor("#007bff"))
\ No newline at end of file
@@ -0,0 +1,187 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox,
+                             QGroupBox)
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QPainter, QColor, QPen
+from datetime import datetime, time, timedelta
+from typing import List, Tuple
+from database import Database
+from models import DaySummary
+
+# Периоды отчета: подпись и количество дней до сегодняшнего включительно
+PERIODS = (("4 недели", 28), ("3 месяца", 91), ("Год", 365))
+
+def completion_streaks(summaries: List[DaySummary], today: datetime) -> Tuple[int, int]:
+    """
+    Текущая и лучшая серии дней, в которые выполнены все ежедневные задачи.
+    Дни без ежедневных задач серию не прерывают; сегодняшний день прерывает
+    ее, только если уже закончился, поэтому невыполненные задачи на сегодня
+    не обнуляют текущую серию.
+
+    Args:
+        summaries: Итоги дней в порядке дат
+        today: Сегодняшняя дата
+
+    Returns:
+        Пара (текущая серия, лучшая серия) в днях
+    """
+    current = best = 0
+    for summary in summaries:
+        if summary.date.date() > today.date() or not summary.daily_planned_count:
+            continue
+        if summary.daily_completed_count == summary.daily_planned_count:
+            current += 1
+            best = max(best, current)
+        elif summary.date.date() < today.date():
+            current = 0
+    return current, best
+
+def weekly_totals(summaries: List[DaySummary], start: datetime, end: datetime) -> List[DaySummary]:
+    """
+    Итоги по неделям периода (дата - понедельник недели) в порядке дат,
+    включая недели без задач.
+    """
+    weeks = {}
+    week_start = start - timedelta(days=start.weekday())
+    while week_start <= end:
+        weeks[week_start] = DaySummary(week_start)
+        week_start += timedelta(days=7)
+    for summary in summaries:
+        week = weeks[summary.date - timedelta(days=summary.date.weekday())]
+        week.planned_count += summary.planned_count
+        week.completed_count += summary.completed_count
+        week.planned_minutes += summary.planned_minutes
+        week.completed_minutes += summary.completed_minutes
+        week.daily_planned_count += summary.daily_planned_count
+        week.daily_completed_count += summary.daily_completed_count
+    return list(weeks.values())
+
+def format_hours(minutes: int) -> str:
+    return f"{minutes / 60:.1f} ч"
+
+class WeeklyChart(QWidget):
+    """
+    Столбцы по неделям: запланированное время и время выполненных задач.
+    """
+
+    MARGIN_LEFT = 50
+    MARGIN_BOTTOM = 22
+    MARGIN_TOP = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.weeks: List[DaySummary] = []
+        self.setMinimumHeight(220)
+
+    def set_weeks(self, weeks: List[DaySummary]):
+        self.weeks = weeks
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(255, 255, 255))
+        chart = QRect(self.MARGIN_LEFT, self.MARGIN_TOP, self.width() - self.MARGIN_LEFT - 10,
+                      self.height() - self.MARGIN_TOP - self.MARGIN_BOTTOM)
+
+        # Ось и подпись максимума
+        max_minutes = max((week.planned_minutes for week in self.weeks), default=0)
+        painter.setPen(QPen(QColor(189, 189, 189)))
+        painter.drawLine(chart.bottomLeft(), chart.bottomRight())
+        painter.setPen(QColor(117, 117, 117))
+        painter.drawText(QRect(0, chart.top() - 6, self.MARGIN_LEFT - 6, 14),
+                         Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         f"{round(max_minutes / 60)} ч")
+        if not self.weeks or not max_minutes:
+            painter.drawText(chart, Qt.AlignmentFlag.AlignCenter, "Нет данных за период")
+            return
+
+        # Столбцы недель; подписи дат не чаще, чем помещаются
+        slot = chart.width() / len(self.weeks)
+        bar_width = max(1, int(slot * 0.7))
+        label_every = max(1, int(50 // slot) + 1)
+        for number, week in enumerate(self.weeks):
+            left = chart.left() + int(number * slot + (slot - bar_width) / 2)
+            planned_height = int(chart.height() * week.planned_minutes / max_minutes)
+            completed_height = int(chart.height() * week.completed_minutes / max_minutes)
+            painter.fillRect(QRect(left, chart.bottom() - planned_height, bar_width, planned_height),
+                             QColor(187, 222, 251))
+            painter.fillRect(QRect(left, chart.bottom() - completed_height, bar_width, completed_height),
+                             QColor(33, 150, 243))
+            if number % label_every == 0:
+                painter.drawText(QRect(left - 20, chart.bottom() + 4, bar_width + 40, 14),
+                                 Qt.AlignmentFlag.AlignCenter, week.date.strftime('%d.%m'))
+
+class StatsTab(QWidget):
+    """
+    Вкладка статистики: доля выполненных задач, запланированное время
+    по неделям и серии выполнения ежедневных задач.
+
+    Данные читаются из итогов по дням (Database.get_daily_summary), которые
+    поддерживаются триггерами, поэтому отчет за год читает не больше 365 строк.
+    """
+
+    def __init__(self, db: Database):
+        super().__init__()
+        self.db = db
+        self.data_version = None
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Период:"))
+        self.period_combo = QComboBox()
+        for title, days in PERIODS:
+            self.period_combo.addItem(title, days)
+        self.period_combo.currentIndexChanged.connect(self.load_data)
+        controls.addWidget(self.period_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        # Итоги за период
+        totals_group = QGroupBox("Итоги за период")
+        totals_layout = QGridLayout(totals_group)
+        self.total_labels = {}
+        rows = (
+            ('completed', "Выполнено задач:"),
+            ('planned_time', "Запланировано времени:"),
+            ('completed_time', "Выполнено времени:"),
+            ('current_streak', "Текущая серия ежедневных задач:"),
+            ('best_streak', "Лучшая серия ежедневных задач:"),
+        )
+        for row, (key, title) in enumerate(rows):
+            totals_layout.addWidget(QLabel(title), row, 0)
+            label = QLabel("-")
+            totals_layout.addWidget(label, row, 1)
+            self.total_labels[key] = label
+        totals_layout.setColumnStretch(2, 1)
+        layout.addWidget(totals_group)
+
+        # Время по неделям
+        chart_group = QGroupBox("Время по неделям (светлое - запланировано, темное - выполнено)")
+        chart_layout = QVBoxLayout(chart_group)
+        self.chart = WeeklyChart()
+        chart_layout.addWidget(self.chart)
+        layout.addWidget(chart_group, 1)
+
+    def load_data(self):
+        """Загрузка итогов за выбранный период."""
+        self.data_version = self.db.get_data_version()
+        today = datetime.combine(datetime.now().date(), time())
+        start = today - timedelta(days=self.period_combo.currentData() - 1)
+        summaries = self.db.get_daily_summary(start, today)
+
+        planned = sum(summary.planned_count for summary in summaries)
+        completed = sum(summary.completed_count for summary in summaries)
+        rate = f" ({completed / planned:.0%})" if planned else ""
+        self.total_labels['completed'].setText(f"{completed} из {planned}{rate}")
+        self.total_labels['planned_time'].setText(
+            format_hours(sum(summary.planned_minutes for summary in summaries)))
+        self.total_labels['completed_time'].setText(
+            format_hours(sum(summary.completed_minutes for summary in summaries)))
+        current, best = completion_streaks(summaries, today)
+        self.total_labels['current_streak'].setText(f"{current} дн.")
+        self.total_labels['best_streak'].setText(f"{best} дн.")
+        self.chart.set_weeks(weekly_totals(summaries, start, today))
+
+    def refresh(self):
+        """Перечитывание итогов, если данные изменились."""
+        if self.db.get_data_version() != self.data_version:
+            self.load_data()
\ No newline at end of file
@@ -2,15 +2,16 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QFormLayout,
                                QLineEdit, QSpinBox, QComboBox, QPushButton,
                                QCheckBox, QGroupBox, QScrollArea, QLabel,
                                QMessageBox, QTextEdit, QTimeEdit, QDialog,
-                               QDialogButtonBox, QFrame, QSplitter, QTabWidget)
-from PyQt6.QtCore import Qt, pyqtSignal, QTime, QSize
-from PyQt6.QtGui import QColor, QFont
-from datetime import datetime, time, timedelta
-from typing import Union, Optional
+                               QDialogButtonBox, QFrame, QSplitter, QTabWidget,
+                               QListView, QStyledItemDelegate, QStyle, QAbstractItemView)
+from PyQt6.QtCore import Qt, pyqtSignal, QTime, QSize, QAbstractListModel, QModelIndex, QRect, QEvent
+from PyQt6.QtGui import QColor, QFont, QPainter, QCursor
+from datetime import datetime, time
+from typing import List, Tuple, Union, Optional
 from models import SingleTask, DailyTask, TaskType, ScheduledTask
 from database import Database
 from .edit_task_dialog import EditTaskDialog
-from .widgets import TimeInputWidget, DateTimeInputWidget
+from .widgets import TimeInputWidget, DateTimeInputWidget, SearchLineEdit
 
 class TaskForm(QWidget):
     """Базовый класс для форм создания задач."""
@@ -233,28 +234,14 @@ class DailyTaskForm(TaskForm):
         self.layout.addRow(self.create_button)
     
     def _schedule_daily_task(self, task: DailyTask, task_id: int):
-        """Автоматическое планирование ежедневной задачи на 30 дней вперед."""
+        """
+        Автоматическое планирование ежедневной задачи. Распорядок создается
+        на Database.DAILY_HORIZON_DAYS дней вперед и затем продлевается
+        (Database.materialize_daily_tasks).
+        """
         if not task.scheduled_time:
             return
-            
-        # Планируем на 30 дней вперед
-        current_date = datetime.now().date()
-        end_date = current_date + timedelta(days=30)
-        
-        while current_date <= end_date:
-            # Проверяем, является ли текущий день недели выбранным
-            if current_date.weekday() in task.weekdays:
-                scheduled_task = ScheduledTask(
-                    task_id=task_id,
-                    date=datetime.combine(current_date, time()),
-                    start_time=task.scheduled_time,
-                    title=task.title,
-                    duration_minutes=task.duration_minutes if not task.is_unlimited else 1440,  # 24 часа для неограниченных
-                    description=task.description,
-                    is_completed=False
-                )
-                self.db.add_scheduled_task(scheduled_task)
-            current_date += timedelta(days=1)
+        self.db.schedule_daily_task(task_id, task.scheduled_time)
 
     def _create_task(self):
         """Создание ежедневной задачи."""
@@ -302,8 +289,181 @@ class DailyTaskForm(TaskForm):
         except ValueError as e:
             self.show_error(str(e))
 
+# Колонки списка задач (заголовок и строки): название и доля ширины
+TASK_COLUMNS = [("№", 1), ("Название", 3), ("Создана", 2),
+                ("Время", 2), ("Длительность", 2), ("", 2)]
+
+# Роль модели с задачей строки
+TaskRole = Qt.ItemDataRole.UserRole + 1
+
+class TaskListModel(QAbstractListModel):
+    """
+    Модель списка задач: все задачи или результаты поиска в порядке ранга.
+    Список заменяется целиком (set_tasks), а представлению отдается по
+    FETCH_ROWS строк по мере прокрутки (fetchMore); строки рисует
+    TaskListDelegate только для видимой части. Поэтому смена списка не
+    зависит от общего количества задач.
+    """
+    
+    FETCH_ROWS = 200
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tasks: List[Union[SingleTask, DailyTask]] = []
+        self.loaded = 0
+    
+    def set_tasks(self, tasks: List[Union[SingleTask, DailyTask]]):
+        self.beginResetModel()
+        self.tasks = tasks
+        self.loaded = min(len(tasks), self.FETCH_ROWS)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.loaded
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self.loaded < len(self.tasks)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        """Продление списка следующими строками."""
+        if parent.isValid():
+            return
+        count = min(self.FETCH_ROWS, len(self.tasks) - self.loaded)
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+    
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self.tasks[index.row()]
+        if role == TaskRole:
+            return task
+        if role == Qt.ItemDataRole.DisplayRole:
+            return task.title
+        return None
+
+def task_cells(task: Union[SingleTask, DailyTask], number: int) -> List[str]:
+    """Тексты колонок строки задачи (без колонки кнопок)."""
+    unlimited = isinstance(task, DailyTask) and task.is_unlimited
+    return [
+        f"{number}",
+        task.title,
+        task.created_at.strftime("%d.%m.%Y %H:%M"),
+        task.scheduled_time.strftime("%H:%M") if task.scheduled_time else "-",
+        "∞" if unlimited else f"{task.duration_minutes} мин",
+    ]
+
+class TaskListDelegate(QStyledItemDelegate):
+    """
+    Отрисовка строки задачи по колонкам TASK_COLUMNS с кнопками изменения и
+    удаления в последней колонке. Нажатие кнопки передается сигналами.
+    Высота строки постоянная (для uniformItemSizes).
+    """
+    
+    edit_requested = pyqtSignal(object)
+    delete_requested = pyqtSignal(object)
+    
+    ROW_HEIGHT = 54
+    MARGIN = 15
+    SPACING = 15
+    BUTTON_SIZE = 32
+    BUTTON_SPACING = 5
+    BUTTONS = ("✎", "✖")
+    
+    def __init__(self, view: QListView):
+        super().__init__(view)
+        self.view = view
+        self.text_font = QFont()
+        self.text_font.setPixelSize(14)
+        self.button_font = QFont()
+        self.button_font.setPixelSize(16)
+    
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+    
+    def _cells(self, rect: QRect) -> List[QRect]:
+        """Прямоугольники колонок строки (как у раскладки заголовка)."""
+        left = rect.left() + self.MARGIN
+        available = rect.width() - 2 * self.MARGIN - self.SPACING * (len(TASK_COLUMNS) - 1)
+        total = sum(stretch for _, stretch in TASK_COLUMNS)
+        cells = []
+        for _, stretch in TASK_COLUMNS:
+            width = available * stretch // total
+            cells.append(QRect(left, rect.top(), width, rect.height()))
+            left += width + self.SPACING
+        return cells
+    
+    def _buttons(self, rect: QRect) -> List[QRect]:
+        """Прямоугольники кнопок изменения и удаления."""
+        left = self._cells(rect)[-1].left()
+        top = rect.top() + (rect.height() - self.BUTTON_SIZE) // 2
+        return [QRect(left + number * (self.BUTTON_SIZE + self.BUTTON_SPACING), top,
+                      self.BUTTON_SIZE, self.BUTTON_SIZE)
+                for number in range(len(self.BUTTONS))]
+    
+    @staticmethod
+    def _row_rect(option) -> QRect:
+        """Строка без промежутка между строками."""
+        return option.rect.adjusted(0, 1, 0, -1)
+    
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = self._row_rect(option)
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#f8f9fa") if hovered else QColor("white"))
+        painter.drawRoundedRect(rect, 6, 6)
+        
+        painter.setFont(self.text_font)
+        painter.setPen(QColor("#212529"))
+        metrics = painter.fontMetrics()
+        for cell, text in zip(self._cells(rect), task_cells(index.data(TaskRole), index.row() + 1)):
+            painter.drawText(cell, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                             metrics.elidedText(text, Qt.TextElideMode.ElideRight, cell.width()))
+        
+        mouse = self.view.viewport().mapFromGlobal(QCursor.pos()) if hovered else None
+        painter.setFont(self.button_font)
+        for button, text in zip(self._buttons(rect), self.BUTTONS):
+            if mouse is not None and button.contains(mouse):
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(QColor("#e9ecef"))
+                painter.drawRoundedRect(button, 4, 4)
+                painter.setPen(QColor("#007bff"))
+            else:
+                painter.setPen(QColor("#6c757d"))
+            painter.drawText(button, Qt.AlignmentFlag.AlignCenter, text)
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index) -> bool:
+        """Подсветка кнопок под курсором и их нажатие."""
+        if event.type() not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonRelease):
+            return False
+        position = event.position().toPoint()
+        pressed = [button.contains(position) for button in self._buttons(self._row_rect(option))]
+        viewport = self.view.viewport()
+        viewport.setCursor(Qt.CursorShape.PointingHandCursor if any(pressed)
+                           else Qt.CursorShape.ArrowCursor)
+        if event.type() == QEvent.Type.MouseMove:
+            viewport.update(option.rect)
+            return False
+        if event.button() != Qt.MouseButton.LeftButton or not any(pressed):
+            return False
+        task = index.data(TaskRole)
+        if pressed[0]:
+            self.edit_requested.emit(task)
+        else:
+            self.delete_requested.emit(task)
+        return True
+
 class TasksTab(QWidget):
-    """Вкладка управления задачами."""
+    """
+    Вкладка управления задачами.
+    Список задач виртуализирован (QListView с постоянной высотой строк):
+    поиск заменяет строки модели первыми совпадениями по рангу FTS5.
+    """
     
     task_added = pyqtSignal()
     
@@ -402,6 +562,12 @@ class TasksTab(QWidget):
         task_list_layout.setContentsMargins(20, 25, 20, 20)
         task_list_layout.setSpacing(0)
         
+        # Поиск по названию и описанию
+        self.search_edit = SearchLineEdit("Поиск по названию и описанию")
+        self.search_edit.search_changed.connect(lambda _: self._apply_search())
+        task_list_layout.addWidget(self.search_edit)
+        task_list_layout.addSpacing(10)
+        
         # Заголовки колонок
         header = QWidget()
         header.setStyleSheet("""
@@ -420,34 +586,43 @@ class TasksTab(QWidget):
         header_layout.setSpacing(15)
         
         # Создаем заголовки
-        headers = [("№", 1), ("Название", 3), ("Создана", 2),
-                  ("Время", 2), ("Длительность", 2), ("", 2)]
-        
-        for title, stretch in headers:
+        for title, stretch in TASK_COLUMNS:
             label = QLabel(title)
             label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
             header_layout.addWidget(label, stretch)
         
         task_list_layout.addWidget(header)
         
-        # Контейнер для списка задач
-        self.task_list = QScrollArea()
-        self.task_list.setWidgetResizable(True)
-        self.task_list.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.task_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        # Надпись для пустого списка и поиска без совпадений
+        self.empty_label = QLabel("Нет задач")
+        self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.empty_label.setStyleSheet("color: #6c757d; font-size: 16px; padding: 20px;")
+        self.empty_label.hide()
+        task_list_layout.addWidget(self.empty_label)
+        
+        # Список задач: строки рисуются только для видимой части
+        self.all_tasks = []
+        self.task_model = TaskListModel(self)
+        self.task_list = QListView()
+        self.task_list.setModel(self.task_model)
+        delegate = TaskListDelegate(self.task_list)
+        delegate.edit_requested.connect(self._edit_task)
+        delegate.delete_requested.connect(self._delete_task)
+        self.task_list.setItemDelegate(delegate)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
         self.task_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        self.task_list_container = QWidget()
-        self.task_list_container.setStyleSheet("""
-            QWidget {
-                background-color: transparent;
+        self.task_list.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.task_list.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.task_list.setMouseTracking(True)
+        self.task_list.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.task_list.setStyleSheet("""
+            QListView {
+                background-color: white;
+                border: none;
+                padding: 10px 0;
             }
         """)
-        self.task_list_layout = QVBoxLayout(self.task_list_container)
-        self.task_list_layout.setContentsMargins(0, 10, 0, 10)
-        self.task_list_layout.setSpacing(2)
-        self.task_list_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.task_list.setWidget(self.task_list_container)
         
         task_list_layout.addWidget(self.task_list)
         task_list_group.setLayout(task_list_layout)
@@ -472,8 +647,12 @@ class TasksTab(QWidget):
         
         # Показ формы по умолчанию
         self._show_form(self.single_form)
-        
-        # Загрузка существующих задач
+    
+    def load_data(self):
+        """
+        Загрузка существующих задач.
+        Вызывается главным окном после первого показа вкладки.
+        """
         self.update_task_list()
     
     def _show_form(self, form: QWidget):
@@ -503,94 +682,21 @@ class TasksTab(QWidget):
     
     def update_task_list(self, scheduled_task: ScheduledTask = None):
         """Обновление списка существующих задач."""
-        # Очистка списка
-        for i in reversed(range(self.task_list_layout.count())):
-            item = self.task_list_layout.itemAt(i)
-            if item and item.widget():
-                item.widget().deleteLater()
-        
-        # Загрузка задач из БД
-        tasks = self.db.get_all_tasks()
-        
-        # Добавление задач в список
-        for i, task in enumerate(tasks, 1):
-            task_widget = QWidget()
-            task_widget.setStyleSheet("""
-                QWidget {
-                    background-color: white;
-                    border-radius: 6px;
-                }
-                QWidget:hover {
-                    background-color: #f8f9fa;
-                }
-                QLabel {
-                    color: #212529;
-                    font-size: 14px;
-                }
-                QPushButton {
-                    background-color: transparent;
-                    border: none;
-                    border-radius: 4px;
-                    padding: 4px;
-                    font-size: 16px;
-                    color: #6c757d;
-                }
-                QPushButton:hover {
-                    background-color: #e9ecef;
-                    color: #007bff;
-                }
-            """)
-            
-            task_layout = QHBoxLayout(task_widget)
-            task_layout.setContentsMargins(15, 10, 15, 10)
-            task_layout.setSpacing(15)
-            
-            # Создаем ячейки с данными
-            cells = [
-                (f"{i}", 1),
-                (task.title, 3),
-                (task.created_at.strftime("%d.%m.%Y %H:%M"), 2),
-                (task.scheduled_time.strftime("%H:%M") if task.scheduled_time else "-", 2),
-                (f"{task.duration_minutes} мин" if not (isinstance(task, DailyTask) and task.is_unlimited) else "∞", 2)
-            ]
-            
-            for text, stretch in cells:
-                label = QLabel(text)
-                label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
-                task_layout.addWidget(label, stretch)
-            
-            # Кнопки управления
-            buttons_container = QWidget()
-            buttons_container.setStyleSheet("background: transparent;")
-            buttons_layout = QHBoxLayout(buttons_container)
-            buttons_layout.setContentsMargins(0, 0, 0, 0)
-            buttons_layout.setSpacing(5)
-            
-            edit_button = QPushButton("✎")
-            edit_button.setFixedSize(32, 32)
-            edit_button.setCursor(Qt.CursorShape.PointingHandCursor)
-            edit_button.clicked.connect(lambda checked, t=task: self._edit_task(t))
-            
-            delete_button = QPushButton("✖")
-            delete_button.setFixedSize(32, 32)
-            delete_button.setCursor(Qt.CursorShape.PointingHandCursor)
-            delete_button.clicked.connect(lambda checked, t=task: self._delete_task(t))
-            
-            buttons_layout.addWidget(edit_button)
-            buttons_layout.addWidget(delete_button)
-            buttons_layout.addStretch()
-            
-            task_layout.addWidget(buttons_container, 2)
-            
-            # Добавляем задачу в список
-            self.task_list_layout.addWidget(task_widget)
-        
-        # Вместо растягивающегося пространства добавляем пустой виджет с фиксированной высотой
-        if not tasks:
-            empty_label = QLabel("Нет задач")
-            empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            empty_label.setStyleSheet("color: #6c757d; font-size: 16px; padding: 20px;")
-            self.task_list_layout.addWidget(empty_label)
+        self.all_tasks = self.db.get_all_tasks()
+        self._apply_search()
+    
+    def _apply_search(self):
+        """
+        Фильтрация списка по строке поиска: модель получает первые совпадения
+        в порядке ранга (Database.search_tasks), без строки поиска - все задачи.
+        Виджеты строк не создаются, поэтому стоимость не зависит от общего
+        количества задач.
+        """
+        query = self.search_edit.query()
+        tasks = self.db.search_tasks(query) if query else self.all_tasks
+        self.task_model.set_tasks(tasks)
+        self.empty_label.setText("Ничего не найдено" if query else "Нет задач")
+        self.empty_label.setVisible(not tasks)
     
     def _edit_task(self, task):
         """Редактирование задачи."""
@@ -0,0 +1,367 @@
+from PyQt6.QtWidgets import QFrame, QMessageBox
+from PyQt6.QtCore import Qt, QMimeData, QRect, pyqtSignal
+from PyQt6.QtGui import (QPainter, QPen, QColor, QPixmap, QDrag, QDragEnterEvent, QDropEvent,
+                         QFont, QFontMetrics)
+from bisect import bisect_right
+from dataclasses import replace
+from datetime import datetime, time, timedelta
+from typing import List, Optional, Tuple
+from models import ScheduledTask, EditScope
+from .widgets import ask_edit_scope
+
+# Формат данных перетаскивания экземпляра со шкалы недели: "ID задачи|дата"
+INSTANCE_MIME_TYPE = 'application/x-planner-scheduled-task'
+
+WEEKDAY_NAMES = ("Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс")
+
+class WeekViewWidget(QFrame):
+    """
+    Распорядок на неделю: семь колонок дней на общей временной шкале.
+    
+    Распорядок недели загружается одним запросом за период
+    (Database.iter_scheduled_tasks). Сетка с часовыми линиями и подписями
+    рисуется один раз в QPixmap и перерисовывается только при изменении
+    размера или недели. Прямоугольники задач вычисляются при загрузке и
+    изменении размера, поэтому отрисовка и поиск задачи под курсором не
+    зависят от заполненности недели: колонка находится по координате x,
+    задача в колонке - двоичным поиском по началу.
+    """
+    
+    day_selected = pyqtSignal(object)  # Дата дня, выбранного двойным щелчком
+    
+    HEADER_HEIGHT = 30
+    TIME_COLUMN_WIDTH = 45
+    
+    def __init__(self, calendar_tab, parent=None):
+        super().__init__(parent)
+        self.calendar_tab = calendar_tab
+        self.setFrameStyle(QFrame.Shape.NoFrame)
+        self.setStyleSheet("WeekViewWidget { background-color: white; border-radius: 6px; }")
+        self.setAcceptDrops(True)
+        
+        # Настройка временной шкалы: сутки, как у шкалы дня
+        self.start_hour = 0
+        self.end_hour = 24
+        self.hour_height = 60
+        self.setMinimumWidth(490)
+        self.setMinimumHeight(self.HEADER_HEIGHT + (self.end_hour - self.start_hour) * self.hour_height)
+        
+        # Понедельник показанной недели и распорядок по дням
+        self.week_start = None
+        self.days: List[List[ScheduledTask]] = [[] for _ in range(7)]
+        # Прямоугольники задач по дням (с сокращенным под ширину названием),
+        # упорядоченные по верхней границе
+        self.task_rects: List[List[Tuple[QRect, ScheduledTask, str]]] = [[] for _ in range(7)]
+        self.task_tops: List[List[int]] = [[] for _ in range(7)]
+        
+        # Кэш сетки и шрифт задач
+        self.grid = None
+        self.task_font = QFont(self.font())
+        self.task_font.setPointSize(9)
+        
+        # Перетаскивание: скрытый экземпляр и предпросмотр (день, время, длительность)
+        self.dragged = None
+        self.preview = None
+    
+    def load_week(self, date: datetime):
+        """
+        Загрузка распорядка недели, содержащей дату.
+        
+        Args:
+            date: Любая дата недели
+        """
+        week_start = datetime.combine(date.date() - timedelta(days=date.weekday()), time())
+        if week_start != self.week_start:
+            self.week_start = week_start
+            self.grid = None
+        self.reload()
+    
+    def reload(self):
+        """Перечитывание распорядка показанной недели одним запросом."""
+        if self.week_start is None:
+            return
+        self.days = [[] for _ in range(7)]
+        week_end = self.week_start + timedelta(days=6)
+        for task in self.calendar_tab.db.iter_scheduled_tasks(self.week_start, week_end):
+            self.days[(task.date - self.week_start).days].append(task)
+        self._layout_tasks()
+        self.update()
+    
+    def day_date(self, column: int) -> datetime:
+        return self.week_start + timedelta(days=column)
+    
+    def _column_width(self) -> float:
+        return (self.width() - self.TIME_COLUMN_WIDTH - 10) / 7
+    
+    def _column_at(self, x: float) -> Optional[int]:
+        """Колонка дня по координате x."""
+        column = int((x - self.TIME_COLUMN_WIDTH) // self._column_width())
+        return column if 0 <= column < 7 else None
+    
+    def time_to_y(self, t: time) -> int:
+        """Координата y времени t."""
+        return self.HEADER_HEIGHT + int((t.hour - self.start_hour + t.minute / 60) * self.hour_height)
+    
+    def _y_to_time(self, y: float) -> time:
+        """Время по координате y с привязкой к 15-минутной сетке."""
+        minutes = (y - self.HEADER_HEIGHT) / self.hour_height * 60 + self.start_hour * 60
+        minutes = int(((minutes + 7) // 15) * 15)
+        minutes = min(max(minutes, self.start_hour * 60), 23 * 60 + 45)
+        return time(minutes // 60, minutes % 60)
+    
+    def _layout_tasks(self):
+        """
+        Вычисление прямоугольников и подписей задач для отрисовки и поиска
+        под курсором. Из задач с одинаковыми прямоугольниками остается
+        последняя: остальные она полностью закрывает, поэтому количество
+        рисуемых блоков ограничено числом мест в колонке, а не задач.
+        """
+        column_width = self._column_width()
+        width = int(column_width) - 4
+        metrics = QFontMetrics(self.task_font)
+        for column, tasks in enumerate(self.days):
+            x = int(self.TIME_COLUMN_WIDTH + column * column_width) + 2
+            visible = {}
+            for task in tasks:
+                top = self.time_to_y(task.start_time)
+                height = max(int(task.duration_minutes / 60 * self.hour_height), 12)
+                visible.pop((top, height), None)
+                visible[(top, height)] = task
+            rects = sorted(
+                ((QRect(x, top, width, height), task,
+                  metrics.elidedText(task.title, Qt.TextElideMode.ElideRight, width - 6))
+                 for (top, height), task in visible.items()),
+                key=lambda item: item[0].top()
+            )
+            self.task_rects[column] = rects
+            self.task_tops[column] = [rect.top() for rect, _, _ in rects]
+    
+    def task_at(self, x: float, y: float) -> Optional[Tuple[int, ScheduledTask]]:
+        """
+        Задача под точкой.
+        
+        Returns:
+            Колонка дня и задача или None
+        """
+        column = self._column_at(x)
+        if column is None:
+            return None
+        rects = self.task_rects[column]
+        # Кандидаты - задачи, начинающиеся выше точки, от ближайшей к ней
+        for index in range(bisect_right(self.task_tops[column], y) - 1, -1, -1):
+            rect, task, _ = rects[index]
+            if rect.bottom() >= y:
+                return column, task
+        return None
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.grid = None
+        self._layout_tasks()
+    
+    def _render_grid(self) -> QPixmap:
+        """Отрисовка сетки недели: часовые линии, подписи времени и дней."""
+        pixmap = QPixmap(self.size())
+        pixmap.fill(QColor("white"))
+        painter = QPainter(pixmap)
+        column_width = self._column_width()
+        right = int(self.TIME_COLUMN_WIDTH + 7 * column_width)
+        
+        quarter_pen = QPen(QColor("#e9ecef"))
+        quarter_pen.setStyle(Qt.PenStyle.DotLine)
+        for hour in range(self.start_hour, self.end_hour + 1):
+            y = self.HEADER_HEIGHT + (hour - self.start_hour) * self.hour_height
+            painter.setPen(QColor("#dee2e6"))
+            painter.drawLine(self.TIME_COLUMN_WIDTH - 5, y, right, y)
+            painter.setPen(QColor("#495057"))
+            painter.drawText(5, y + 12, f"{hour:02d}:00")
+            if hour < self.end_hour:
+                painter.setPen(quarter_pen)
+                for i in range(1, 4):
+                    y_quarter = y + (self.hour_height * i) // 4
+                    painter.drawLine(self.TIME_COLUMN_WIDTH, y_quarter, right, y_quarter)
+        
+        today = datetime.now().date()
+        for column in range(8):
+            x = int(self.TIME_COLUMN_WIDTH + column * column_width)
+            painter.setPen(QColor("#dee2e6"))
+            painter.drawLine(x, 0, x, self.height())
+            if column < 7 and self.week_start:
+                date = self.day_date(column).date()
+                painter.setPen(QColor("#007bff") if date == today else QColor("#495057"))
+                painter.drawText(QRect(x, 0, int(column_width), self.HEADER_HEIGHT),
+                                 Qt.AlignmentFlag.AlignCenter,
+                                 f"{WEEKDAY_NAMES[column]} {date.strftime('%d.%m')}")
+        painter.end()
+        return pixmap
+    
+    def paintEvent(self, event):
+        """Отрисовка сетки из кэша и задач, попадающих в перерисовываемую область."""
+        super().paintEvent(event)
+        if self.grid is None or self.grid.size() != self.size():
+            self.grid = self._render_grid()
+        
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.grid)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.task_font)
+        
+        clip = event.rect()
+        active_color = QColor("#007bff")
+        completed_color = QColor("#6c757d")
+        text_color = QColor("white")
+        for column, rects in enumerate(self.task_rects):
+            for rect, task, title in rects:
+                if not rect.intersects(clip) or self.dragged == (column, task):
+                    continue
+                painter.setPen(Qt.PenStyle.NoPen)
+                painter.setBrush(completed_color if task.is_completed else active_color)
+                painter.drawRoundedRect(rect, 4, 4)
+                painter.setPen(text_color)
+                painter.drawText(rect.adjusted(3, 0, -3, 0),
+                                 Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
+        
+        if self.preview:
+            column, start_time, duration = self.preview
+            column_width = self._column_width()
+            rect = QRect(int(self.TIME_COLUMN_WIDTH + column * column_width) + 2, self.time_to_y(start_time),
+                         int(column_width) - 4, int(duration / 60 * self.hour_height))
+            preview_color = QColor("#007bff")
+            preview_color.setAlpha(128)
+            painter.fillRect(rect, preview_color)
+            painter.setPen(QPen(preview_color.darker(120)))
+            painter.drawRect(rect)
+        
+        # Заголовок с днями закреплен у верхнего края видимой части шкалы
+        # (при прокрутке виджет перерисовывается целиком)
+        top = self.visibleRegion().boundingRect().top()
+        if top > 0:
+            painter.drawPixmap(0, top, self.grid, 0, 0, self.width(), self.HEADER_HEIGHT)
+    
+    def mousePressEvent(self, event):
+        """Начало перетаскивания экземпляра задачи (в том числе на другой день)."""
+        if event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+        hit = self.task_at(event.position().x(), event.position().y())
+        if hit is None:
+            return
+        column, task = hit
+        
+        mime_data = QMimeData()
+        mime_data.setText(f"{task.task_id}|{task.duration_minutes}|{task.title}|{task.description or ''}")
+        mime_data.setData(INSTANCE_MIME_TYPE, f"{task.task_id}|{task.date.date().isoformat()}".encode())
+        drag = QDrag(self)
+        drag.setMimeData(mime_data)
+        
+        self.dragged = (column, task)
+        self.update()
+        drag.exec()
+        self.dragged = None
+        self.update()
+    
+    def mouseDoubleClickEvent(self, event):
+        """Переход к распорядку дня по двойному щелчку."""
+        column = self._column_at(event.position().x())
+        if column is not None and self.week_start:
+            self.day_selected.emit(self.day_date(column))
+    
+    def dragEnterEvent(self, event: QDragEnterEvent):
+        if event.mimeData().hasText():
+            event.acceptProposedAction()
+    
+    def dragMoveEvent(self, event):
+        """Предпросмотр положения задачи с привязкой к 15-минутной сетке."""
+        column = self._column_at(event.position().x())
+        if column is None or not event.mimeData().hasText():
+            event.ignore()
+            return
+        duration = int(event.mimeData().text().split('|')[1])
+        preview = (column, self._y_to_time(event.position().y()), duration)
+        if preview != self.preview:
+            self.preview = preview
+            self.update()
+        event.acceptProposedAction()
+    
+    def dragLeaveEvent(self, event):
+        self.preview = None
+        self.update()
+    
+    def dropEvent(self, event: QDropEvent):
+        """
+        Размещение задачи из списка доступных или перемещение экземпляра.
+        Перемещение в пределах дня откладывается и объединяется с последующими
+        (EditBuffer), перенос на другой день записывается сразу.
+        """
+        self.preview = None
+        column = self._column_at(event.position().x())
+        if column is None or self.week_start is None:
+            self.update()
+            event.ignore()
+            return
+        date = self.day_date(column)
+        drop_time = self._y_to_time(event.position().y())
+        db = self.calendar_tab.db
+        mime_data = event.mimeData()
+        task_data = mime_data.text().split('|')
+        task_id = int(task_data[0])
+        
+        if mime_data.hasFormat(INSTANCE_MIME_TYPE):
+            source_date = datetime.fromisoformat(
+                bytes(mime_data.data(INSTANCE_MIME_TYPE)).decode().split('|')[1])
+            if source_date == date:
+                scope = ask_edit_scope(self) if db.is_daily_task(task_id) else EditScope.OCCURRENCE
+                if scope is None:
+                    self.update()
+                    event.ignore()
+                    return
+                self.calendar_tab.edit_buffer.move(task_id, drop_time, date, scope)
+                self._apply_move(task_id, date, drop_time, scope)
+            else:
+                # Перенос на другой день меняет только этот экземпляр
+                self.calendar_tab.flush_edits()
+                try:
+                    db.move_scheduled_task(task_id, source_date, date, drop_time)
+                except ValueError as e:
+                    # Дни в файлах прошлых лет не переносятся
+                    QMessageBox.warning(self, "Перенос задачи", str(e))
+                    self.update()
+                    event.ignore()
+                    return
+                self.calendar_tab.schedule_changed.emit()
+                self.reload()
+        elif not db.is_task_scheduled(task_id):
+            new_task = ScheduledTask(
+                task_id=task_id,
+                date=date,
+                start_time=drop_time,
+                title=task_data[2],
+                duration_minutes=int(task_data[1]),
+                description=task_data[3] if len(task_data) > 3 and task_data[3] else None,
+                is_completed=False
+            )
+            if db.is_daily_task(task_id):
+                # Ежедневная задача размещается на все выбранные дни
+                db.schedule_daily_task(task_id, drop_time)
+                self.calendar_tab.schedule_changed.emit()
+            else:
+                db.add_scheduled_task(new_task)
+            self.calendar_tab.task_scheduled.emit(new_task)
+            self.calendar_tab.update_available_tasks()
+            self.reload()
+        else:
+            self.update()
+            event.ignore()
+            return
+        event.acceptProposedAction()
+    
+    def _apply_move(self, task_id: int, date: datetime, new_time: time, scope: EditScope):
+        """Изменение времени показанных экземпляров без обращения к базе."""
+        for column, tasks in enumerate(self.days):
+            day = self.day_date(column)
+            if (scope == EditScope.ALL or day == date
+                    or (scope == EditScope.FOLLOWING and day > date)):
+                self.days[column] = [replace(t, start_time=new_time) if t.task_id == task_id else t
+                                     for t in tasks]
+        self._layout_tasks()
+        self.update()
\ No newline at end of file
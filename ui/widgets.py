@@ -1,7 +1,9 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QSpinBox,
-                               QLabel)
-from PyQt6.QtCore import Qt
+                               QLabel, QLineEdit, QMessageBox)
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from datetime import datetime, time, timedelta
+from typing import Optional
+from models import EditScope
 
 class TimeInputWidget(QWidget):
     """Виджет для ввода времени с отдельными полями для часов и минут."""
@@ -286,4 +288,67 @@ class DateTimeInputWidget(QWidget):
             elif current.hour == 23 and current.minute > 45:
                 current = current + timedelta(days=1)
                 current = current.replace(hour=6, minute=0)
-            self.set_datetime(current) 
\ No newline at end of file
+            self.set_datetime(current) 
+
+class SearchLineEdit(QLineEdit):
+    """
+    Поле поиска с задержкой: сигнал search_changed отправляется только после
+    паузы в наборе, чтобы не выполнять запрос на каждое нажатие клавиши.
+    """
+    
+    search_changed = pyqtSignal(str)
+    
+    DEBOUNCE_MS = 150
+    
+    def __init__(self, placeholder: str = "Поиск...", parent=None):
+        super().__init__(parent)
+        self.setPlaceholderText(placeholder)
+        self.setClearButtonEnabled(True)
+        self.setStyleSheet("""
+            QLineEdit {
+                padding: 6px 8px;
+                border: 2px solid #e0e0e0;
+                border-radius: 6px;
+                background-color: white;
+                color: #212529;
+                font-size: 14px;
+                font-weight: normal;
+            }
+            QLineEdit:focus {
+                border-color: #80bdff;
+            }
+        """)
+        
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(self.DEBOUNCE_MS)
+        self._debounce_timer.timeout.connect(self._emit_search)
+        self.textChanged.connect(lambda _: self._debounce_timer.start())
+    
+    def _emit_search(self):
+        """Отправка сигнала с текущей строкой поиска."""
+        self.search_changed.emit(self.text().strip())
+    
+    def query(self) -> str:
+        """Текущая строка поиска."""
+        return self.text().strip()
+
+def ask_edit_scope(parent: QWidget) -> Optional[EditScope]:
+    """
+    Выбор экземпляров ежедневной задачи, время которых меняется.
+    
+    Returns:
+        Охват изменения или None, если изменение отменено
+    """
+    box = QMessageBox(parent)
+    box.setWindowTitle("Изменение ежедневной задачи")
+    box.setText("Изменить время задачи:")
+    buttons = {
+        box.addButton("Только в этот день", QMessageBox.ButtonRole.AcceptRole): EditScope.OCCURRENCE,
+        box.addButton("В этот и следующие дни", QMessageBox.ButtonRole.AcceptRole): EditScope.FOLLOWING,
+        box.addButton("Во все дни", QMessageBox.ButtonRole.AcceptRole): EditScope.ALL,
+    }
+    box.setDefaultButton(list(buttons)[1])
+    box.addButton(QMessageBox.StandardButton.Cancel)
+    box.exec()
+    return buttons.get(box.clickedButton())
\ No newline at end of file